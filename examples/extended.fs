@@ -16,4 +16,8 @@ smallest_dword 2load print print
 
 -2147483648 2 2* print print                        \ (-2^31) * 2
 
--2147483648 -2 2* print print                       \ (-2^31) * (-2)
\ No newline at end of file
+-2147483648 -2 2* print print                       \ (-2^31) * (-2)
+
+5. 2abs 7 print print print                         \ |5|, then 7
+0. 2abs print print                                 \ |0|
+-10000000000. 2abs print print                      \ |-10^10|
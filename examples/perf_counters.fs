@@ -0,0 +1,33 @@
+#include "stdlib/io.fs"
+
+\ Замер производительности участков программы по счётчикам производительности:
+\ для каждого участка выводится число затраченных тактов и инструкций, а в конце -- число прерываний
+
+str message " Hello, counters!"
+
+var start_tick
+var start_instructions
+
+: start_measure
+    start_tick tick_count store
+    start_instructions instruction_count store
+;
+
+: stop_measure
+    tick_count start_tick load - print
+    instruction_count start_instructions load - print
+;
+
+: count_down
+    do 1 drop loop
+;
+
+start_measure
+10 count_down
+stop_measure
+
+start_measure
+message print_buffer
+stop_measure
+
+interrupt_count print
@@ -0,0 +1,7 @@
+#include "stdlib/io.fs"
+
+str first " hello"                                  \ Одинаковые строковые литералы
+str second " hello"
+
+first print_buffer                                  \ Вывод через DMA не меняет строки, литералы
+second print_buffer                                 \ размещаются в памяти в одном экземпляре
@@ -56,3 +56,16 @@
 ;
 
 \ ============================================================================================================================
+
+\ Копирование буфера вместе c длиной
+\ Копирование выполняется одной блочной операцией
+\ !!! Переполнение буфера назначения не контролируется !!
+\ --------------------------------------------------------------------
+\   ... src_addr dst_addr        --->        ...
+\ --------------------------------------------------------------------
+: copy_buffer
+    over load 1 +                   \ Размер копируемой области: длина и сами элементы
+    move                            \ Скопировали буфер
+;
+
+\ ============================================================================================================================
@@ -10,78 +10,89 @@
 \ ============================================================================================================================
 
 \ Конфигурация
-: eof_symbol 10 ;                       \ Символ окончания ввода при чтении строки
+: eof_symbol 10 ;                       \ Символ окончания ввода при чтении строки (совпадает с DMA_INPUT_TERMINATOR)
 
 \ ============================================================================================================================
 
-\ Вспомогательные переменные для чтения
-var is_data_ready                       \ Флаг чтения очередного символа
-var buffer                              \ Буфер для хранения считанного значения
+\ Регистры контроллера DMA
+: dma_buffer 3 ;                        \ Регистр адреса буфера (DMA_BUFFER_ADDRESS)
+: dma_control 4 ;                       \ Управляющий регистр (DMA_CONTROL_ADDRESS)
+: dma_output 1 ;                        \ Команда вывода паскаль строки (DMA_OUTPUT_COMMAND)
+: dma_input 2 ;                         \ Команда чтения строки до eof_symbol (DMA_INPUT_COMMAND)
+
+\ ============================================================================================================================
+
+\ Ожидание завершения передачи DMA
+\ Пока передача не завершена, процессор ожидает прерывания (wait_int), которое контроллер DMA вызывает по её завершении
+\ Если прерывание произошло между проверкой регистра и wait_int, то прерывания уже запрещены обработчиком
+\ и wait_int не выполняет ожидания, поэтому регистр будет проверен ещё раз
+\ --------------------------------------------------------------------
+\   ...        --->        ...
+\ --------------------------------------------------------------------
+: dma_wait
+    begin
+        dma_control load                \ Загружаем признак незавершённой передачи
+        if
+            en_int                      \ Разрешение прерываний
+            wait_int                    \ Ожидание прерывания
+            1                           \ Продолжение цикла ожидания
+        else
+            0                           \ Передача завершена, останавливаем цикл
+        then
+    until
+;
 
 \ ============================================================================================================================
 
 \ Печать значений из буфера
+\ Буфер целиком выводится контроллером DMA
 \ --------------------------------------------------------------------
 \   ... addr        --->        ...
 \ --------------------------------------------------------------------
 : print_buffer
-    count                               \ Разделяем данные и размер
-    begin
-        swap                            \ Вынесли адрес наверх
-        dup load print                  \ Напечатали значение
-        1 +                             \ Увеличили адрес на 1
-        swap                            \ Вынесли длину наверх
-        1 -                             \ Уменьшили длину на 1
-        dup                             \ Продублировали длину, так как until заберёт значение со стека
-    until
-    drop drop                           \ Удаляем вспомогательные значения со стека
+    dma_buffer swap store               \ Передаём адрес буфера контроллеру DMA
+    dma_control dma_output store        \ Запускаем вывод
+    dma_wait                            \ Ожидаем его завершения
 ;
 
 \ ============================================================================================================================
 
 \ Чтение значения
 \ Выполняет чтение одного значения из потока ввода
+\ Если в буфере ввода (FIFO) уже есть значения, то очередное читается сразу, без прерывания
+\ Иначе процессор ожидает прерывания (wait_int), которое запрашивается по непустому буферу ввода
+\ Если прерывание произошло между проверкой буфера и wait_int, то прерывания уже запрещены обработчиком
+\ и wait_int не выполняет ожидания, поэтому буфер будет проверен ещё раз
 \ --------------------------------------------------------------------
 \   ...        --->        ... value
 \ --------------------------------------------------------------------
 : read_value
-    is_data_ready 0 store               \ Снятие флага готовности ввода
-    en_int                              \ Разрешение прерываний
-    begin                               \ Запускаем цикл чтения
-        is_data_ready load              \ Загружаем флаг ввода
+    begin
+        input_count                     \ Проверяем, есть ли значения в буфере ввода
         if
-            buffer load                 \ Если данные готовы загружаем считанный символ
-            0                           \ Останавливаем цикл
+            0                           \ Значение есть, останавливаем цикл
         else
-            1                           \ Продолжение цикла чтения
+            en_int                      \ Разрешение прерываний
+            wait_int                    \ Ожидание прерывания
+            1                           \ Продолжение цикла ожидания
         then
     until
+    read                                \ Читаем очередное значение
 ;
 
 \ ============================================================================================================================
 
 \ Чтение строки
-\ Чтение выполняется до символа окончания ввода (настраивается в шапке данного файла)
+\ Чтение выполняется контроллером DMA до символа окончания ввода (настраивается в шапке данного файла)
 \ Строка сохраняется в буфер
 \ !!! Переполнение буфера не контролируется !!
 \ --------------------------------------------------------------------
 \   ... buffer_addr        --->        ...
 \ --------------------------------------------------------------------
 : read_string
-    dup 0 store                         \ Инициализация буфера как пустой паскаль строки
-    begin                               \ Запускаем сам цикл чтения строки
-        dup                             \ Дублируем адрес буфера, чтобы не потерять его
-        read_value                      \ Читаем очередной символ
-
-        dup eof_symbol =                \ Проверяем на равенство символу окончания ввода
-        if
-            0                           \ Если равны, останавливаем цикл чтения
-        else
-            swap push_back              \ Иначе добавляем считанные символ в буфер
-            1                           \ и продолжаем цикл чтения
-        then
-    until
-    drop                                \ Удаляем адрес строки со стека
+    dma_buffer swap store               \ Передаём адрес буфера контроллеру DMA
+    dma_control dma_input store         \ Запускаем чтение
+    dma_wait                            \ Ожидаем его завершения
 ;
 
 \ ============================================================================================================================
@@ -95,36 +106,25 @@ var buffer                              \ Буфер для хранения с
 \ --------------------------------------------------------------------
 : read_array
     dup read_value store                \ Читаем длину массива и сразу сохраняем её
-    dup load                            \ Кладём длину на стек (это будет счётчик)
-    swap                                \ Возвращаем адрес на вершину стека
-    1 +                                 \ Увеличиваем адрес буфера, чтобы пропустить длину
-    begin                               \ Запускаем цикл чтения массива
-        swap                            \ Выставляем счётчик длинны наверх
-        dup 0 = if                      \ Если оставшаяся длинна массива равна нулю
-            0                           \ Выходим из цикла
-        else
-            1 -                         \ Уменьшаем длину на 1
-            swap                        \ Выставляем адрес буфера наверх
-            dup read_value store        \ Читаем и сохраняем очередной элемент
-            1 +                         \ Увеличиваем адрес
-            1                           \ Продолжаем цикл
-        then
-    until
-    drop drop                           \ Удаляем счётчик и адрес буфера из стека
+    count                               \ Разделяем адрес содержимого и длину (это будет счётчик)
+    do                                  \ Повторяем по количеству элементов
+        dup read_value store            \ Читаем и сохраняем очередной элемент
+        1 +                             \ Увеличиваем адрес
+    loop
+    drop                                \ Удаляем адрес буфера из стека
 ;
 
 \ ============================================================================================================================
 
 \ Блок обработки прерываний
-\ Выполняется загрузка одного входного символа в буфер
-\ после чего выставляется флаг готовности ввода и запрещаются прерывания
+\ Прерывание запрашивается, пока буфер ввода (FIFO) не пуст, а также по завершении передачи DMA
+\ Обработчик только пробуждает ожидающий код (read_value, dma_wait) и запрещает прерывания,
+\ а сами данные читаются уже после выхода из него
 \ --------------------------------------------------------------------
 \   ...        --->        ...
 \ --------------------------------------------------------------------
 begin_int
-    buffer read store               \ Сохраняем введённый символ в буфер
-    is_data_ready 1 store           \ Устанавливаем флаг готовности
-    di_int                          \ Отключается прерывания
+    di_int                          \ Отключаются прерывания
 end_int
 
 \ ============================================================================================================================
@@ -0,0 +1,6 @@
+str first " xy"                                     \ Одинаковые строковые литералы
+str second " xy"
+
+first 1 + 65 store                                  \ Запись в первую строку
+second 1 + load print                               \ Вторая строка не изменилась
+first 1 + load print
@@ -20,3 +20,24 @@ INSTRUCTION_MEMORY_SIZE = 1000
 
 INTERRUPTS_HANDLER_ADDRESS = 900
 "Адрес начала блока обработки прерываний."
+
+DMA_OUTPUT_COMMAND = 1
+"Команда контроллера DMA: вывод Pascal-строки из буфера"
+
+DMA_INPUT_COMMAND = 2
+"Команда контроллера DMA: чтение значений из потока ввода в буфер (Pascal-строку) до `DMA_INPUT_TERMINATOR`"
+
+DMA_INPUT_TERMINATOR = 10
+"Значение, завершающее чтение через DMA. B буфер не записывается"
+
+INPUT_FIFO_DEPTH = 16
+"""Глубина буфера ввода (FIFO) по умолчанию
+
+При переполнении буфера самое старое значение вытесняется. Глубина `1` соответствует одиночному регистру ввода
+"""
+
+NATIVE_EXTENDED_ARITHMETIC = True
+"""Использовать инструкции двойной точности над парами регистров (`dadd`, `dsub`, `dneg`, `dcmp`)
+
+Если `False`, операции двойной точности транслируются в последовательности инструкций над машинными словами
+"""
@@ -1,7 +1,7 @@
 from typing_extensions import override
 
 from src.isa.instructions.instruction import Instruction
-from src.isa.opcode_ import Opcode, binary_to_opcode, opcode_to_binary
+from src.isa.opcode_ import Opcode, decode_opcode, opcode_to_binary
 from src.isa.register import Register, binary_to_register, register_to_binary
 from src.isa.util.binary import binary_to_signed_int, extract_bits, is_correct_bin_size_signed
 
@@ -51,8 +51,7 @@ class IInstruction(Instruction):
     @staticmethod
     @override
     def from_binary(binary: int) -> "IInstruction":
-        opcode_bin = extract_bits(binary, 5)
-        opcode = binary_to_opcode[opcode_bin]
+        opcode = decode_opcode(binary)
 
         rd_bin = extract_bits(binary >> 5, 3)
         rd = binary_to_register[rd_bin]
@@ -1,5 +1,6 @@
-from src.isa.opcode_ import Opcode, binary_to_opcode, opcode_to_binary
-from src.isa.util.binary import extract_bits
+import copy
+
+from src.isa.opcode_ import Opcode, decode_opcode, opcode_to_binary
 
 
 class Instruction:
@@ -30,6 +31,18 @@ class Instruction:
         self.opcode = opcode
         self.address = address
 
+    def instantiate(self) -> "Instruction":
+        """Создание новой инструкции по шаблону.
+
+        Все поля инструкций -- неизменяемые значения (`Opcode`, `Register`, `int`),
+        поэтому достаточно поверхностного копирования без `copy.deepcopy`.
+        Адрес новой инструкции сбрасывается в ноль и проставляется при линковке
+        """
+
+        instr = copy.copy(self)
+        instr.address = 0
+        return instr
+
     def to_binary(self) -> int:
         """Преобразование инструкции в бинарное представление"""
 
@@ -39,8 +52,7 @@ class Instruction:
     def from_binary(binary: int) -> "Instruction":
         """Получение объекта инструкции из бинарного представления"""
 
-        opcode_bin = extract_bits(binary, 5)
-        opcode = binary_to_opcode[opcode_bin]
+        opcode = decode_opcode(binary)
 
         return Instruction(opcode)
 
@@ -1,8 +1,8 @@
 from typing_extensions import override
 
 from src.isa.instructions.instruction import Instruction
-from src.isa.opcode_ import Opcode, binary_to_opcode, opcode_to_binary
-from src.isa.util.binary import binary_to_signed_int, extract_bits, is_correct_bin_size_signed
+from src.isa.opcode_ import Opcode, decode_opcode, opcode_to_binary
+from src.isa.util.binary import binary_to_signed_int, is_correct_bin_size_signed
 
 
 class JInstruction(Instruction):
@@ -37,8 +37,7 @@ class JInstruction(Instruction):
     @staticmethod
     @override
     def from_binary(binary: int) -> "JInstruction":
-        opcode_bin = extract_bits(binary, 5)
-        opcode = binary_to_opcode[opcode_bin]
+        opcode = decode_opcode(binary)
 
         imm = binary_to_signed_int(binary >> 5, 27)
 
@@ -1,7 +1,7 @@
 from typing import override
 
 from src.isa.instructions.instruction import Instruction
-from src.isa.opcode_ import Opcode, binary_to_opcode, opcode_to_binary
+from src.isa.opcode_ import Opcode, decode_opcode, opcode_to_binary
 from src.isa.register import Register, binary_to_register, register_to_binary
 from src.isa.util.binary import extract_bits
 
@@ -49,8 +49,7 @@ class RInstruction(Instruction):
     @staticmethod
     @override
     def from_binary(binary: int) -> "RInstruction":
-        opcode_bin = extract_bits(binary, 5)
-        opcode = binary_to_opcode[opcode_bin]
+        opcode = decode_opcode(binary)
 
         rd_bin = extract_bits(binary >> 5, 3)
         rd = binary_to_register[rd_bin]
@@ -7,5 +7,26 @@ INPUT_ADDRESS = 0
 OUTPUT_ADDRESS = 1
 "Адрес устройства вывода"
 
-DATA_AREA_START_ADDR = 2
+INPUT_STATUS_ADDRESS = 2
+"Адрес регистра состояния устройства ввода (только чтение): количество значений в буфере ввода"
+
+DMA_BUFFER_ADDRESS = 3
+"Адрес регистра контроллера DMA, хранящего адрес буфера (Pascal-строки) для передачи"
+
+DMA_CONTROL_ADDRESS = 4
+"""Адрес управляющего регистра контроллера DMA
+
+Запись команды запускает передачу, чтение возвращает `1`, пока передача не завершена, иначе `0`
+"""
+
+TICK_COUNTER_ADDRESS = 5
+"Адрес счётчика тактов (только чтение): такт начала выполнения читающей инструкции"
+
+INSTRUCTION_COUNTER_ADDRESS = 6
+"Адрес счётчика выполненных инструкций (только чтение): количество инструкций, завершённых до читающей инструкции"
+
+INTERRUPT_COUNTER_ADDRESS = 7
+"Адрес счётчика прерываний (только чтение): количество входов в обработчик прерываний"
+
+DATA_AREA_START_ADDR = 8
 "Адрес начала секции данных"
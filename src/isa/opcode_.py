@@ -1,5 +1,7 @@
 from enum import Enum
 
+from src.isa.util.binary import extract_bits
+
 
 class Opcode(Enum):
     """Opcode инструкций"""
@@ -36,12 +38,59 @@ class Opcode(Enum):
     EINT = "eint"
     DINT = "dint"
 
+    SEQ = "seq"
+    SLT = "slt"
+
+    DBNZ = "dbnz"
+
+    LWPI = "lwpi"
+    SWPD = "swpd"
+
+    LWX = "lwx"
+    SWX = "swx"
+
+    DADD = "dadd"
+    DSUB = "dsub"
+    DNEG = "dneg"
+    DCMP = "dcmp"
+
+    MOVE = "move"
+    FILL = "fill"
+
+    WFI = "wfi"
+
     def __str__(self) -> str:
         return self.value
 
 
-opcode_to_binary = {op: i for i, op in enumerate(Opcode)}
+OPCODE_SIZE = 5
+"Размер поля кода операции в битах"
+
+EXTENDED_OPCODE = (1 << OPCODE_SIZE) - 1
+"""Код-префикс расширенных операций
+
+Расширенные операции кодируются префиксом в поле кода операции и собственным кодом в битах 31...14,
+поэтому ими могут быть только инструкции, не использующие эти биты (R-инструкции и инструкции без аргументов)
+"""
+
+EXTENDED_OPCODE_SHIFT = 14
+"Сдвиг кода расширенной операции в бинарном представлении"
+
+_opcodes = list(Opcode)
+
+opcode_to_binary = {op: i for i, op in enumerate(_opcodes[:EXTENDED_OPCODE])} | {
+    op: i << EXTENDED_OPCODE_SHIFT | EXTENDED_OPCODE for i, op in enumerate(_opcodes[EXTENDED_OPCODE:])
+}
 "Вспомогательный словарь, для преобразования opcode в бинарное представление"
 
-binary_to_opcode = {i: op for i, op in enumerate(Opcode)}
+binary_to_opcode = {binary: op for op, binary in opcode_to_binary.items()}
 "Вспомогательный словарь, для преобразования бинарного представления opcode в объект"
+
+
+def decode_opcode(binary: int) -> Opcode:
+    """Получение кода операции из бинарного представления инструкции c учётом расширенных операций"""
+
+    opcode_bin = extract_bits(binary, OPCODE_SIZE)
+    if opcode_bin == EXTENDED_OPCODE:
+        opcode_bin = extract_bits(binary, 32) >> EXTENDED_OPCODE_SHIFT << EXTENDED_OPCODE_SHIFT | EXTENDED_OPCODE
+    return binary_to_opcode[opcode_bin]
@@ -21,6 +21,7 @@ opcode_to_instruction_type = {
     Opcode.SLL: RInstruction,
     Opcode.SRL: RInstruction,
     Opcode.AND: RInstruction,
+    Opcode.OR: RInstruction,
     Opcode.XOR: RInstruction,
     Opcode.SW: BInstruction,
     Opcode.BEQ: BInstruction,
@@ -33,6 +34,20 @@ opcode_to_instruction_type = {
     Opcode.RINT: Instruction,
     Opcode.EINT: Instruction,
     Opcode.DINT: Instruction,
+    Opcode.SEQ: RInstruction,
+    Opcode.SLT: RInstruction,
+    Opcode.DBNZ: BInstruction,
+    Opcode.LWPI: IInstruction,
+    Opcode.SWPD: BInstruction,
+    Opcode.LWX: RInstruction,
+    Opcode.SWX: RInstruction,
+    Opcode.DADD: RInstruction,
+    Opcode.DSUB: RInstruction,
+    Opcode.DNEG: RInstruction,
+    Opcode.DCMP: RInstruction,
+    Opcode.MOVE: RInstruction,
+    Opcode.FILL: RInstruction,
+    Opcode.WFI: Instruction,
 }
 """Вспомогательный словарь для мапинга opcode инструкций на их типы
 
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from enum import Enum
 
 
@@ -10,6 +12,8 @@ class Register(Enum):
     T2 = "t2"
     T3 = "t3"
     SP = "sp"
+    S0 = "s0"
+    S1 = "s1"
 
     def __str__(self) -> str:
         return self.value
@@ -20,3 +24,17 @@ register_to_binary = {rg: i for i, rg in enumerate(Register)}
 
 binary_to_register = {i: rg for i, rg in enumerate(Register)}
 "Вспомогательный словарь, для преобразования бинарное представление регистров в объекты"
+
+
+register_pairs = {Register.T0: Register.T1, Register.T2: Register.T3}
+"Пары регистров для значений двойной точности: регистр старшей части -> регистр младшей части"
+
+
+def register_pair(high: Register) -> tuple[Register, Register]:
+    """Пара регистров для значений двойной точности: старшая часть в `high`, младшая -- в следующем по номеру регистре
+
+    Допустимы только пары `T0:T1` и `T2:T3`, чтобы запись в пару не затирала `SP` или регистры переменных
+    """
+
+    assert high in register_pairs, "wrong register pair"
+    return high, register_pairs[high]
@@ -4,9 +4,9 @@ import json
 
 from src.isa.data import Data
 from src.isa.instructions.instruction import Instruction
-from src.isa.opcode_ import binary_to_opcode
+from src.isa.opcode_ import decode_opcode
 from src.isa.opcode_to_instruction_map import opcode_to_instruction_type
-from src.isa.util.binary import bytes_to_int_array, extract_bits, int_to_bin_word
+from src.isa.util.binary import bytes_to_int_array, int_to_bin_word
 
 """Функции, выполняющие преобразование между различными формами представления инструкций и данных"""
 
@@ -70,8 +70,7 @@ def to_hex_instructions(binary_instructions: bytes) -> str:
         address = word_list[i]
         word = word_list[i + 1]
 
-        opcode_bin = extract_bits(word, 5)
-        opcode = binary_to_opcode[opcode_bin]
+        opcode = decode_opcode(word)
 
         instruction_type = opcode_to_instruction_type[opcode]
         instruction = instruction_type.from_binary(word)
@@ -110,8 +109,7 @@ def from_bytes_instructions(binary_instructions: bytes) -> list[Instruction]:
         address = word_list[i]
         word = word_list[i + 1]
 
-        opcode_bin = extract_bits(word, 5)
-        opcode = binary_to_opcode[opcode_bin]
+        opcode = decode_opcode(word)
 
         instruction_type = opcode_to_instruction_type[opcode]
         instruction = instruction_type.from_binary(word)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left
+from collections import deque
 from enum import Enum
 
+from src.constants import DMA_INPUT_COMMAND
 from src.isa.instructions.b_instruction import BInstruction
 from src.isa.instructions.i_instruction import IInstruction
 from src.isa.instructions.instruction import Instruction
@@ -10,11 +13,48 @@ from src.isa.instructions.j_instruction import JInstruction
 from src.isa.instructions.jr_instruction import JRInstruction
 from src.isa.instructions.r_instruction import RInstruction
 from src.isa.instructions.u_instruction import UInstruction
+from src.isa.memory_config import INSTRUCTION_COUNTER_ADDRESS, TICK_COUNTER_ADDRESS
 from src.isa.opcode_ import Opcode
 from src.isa.register import Register
 from src.machine.data_path import DataPath
+from src.machine.exceptions.exceptions import NoInputEventsError
+from src.machine.histogram import Histogram
 from src.machine.util import int_to_char
 
+BLOCK_OPERATION_TICKS_PER_WORD = {Opcode.MOVE: 2, Opcode.FILL: 1}
+"""Стоимость блочных операций над памятью в тактах на одно слово (сверх одного такта на саму инструкцию)
+
+`move` читает и записывает каждое слово, `fill` -- только записывает
+"""
+
+
+INSTRUCTION_TICKS = {
+    Opcode.LW: 2,
+    Opcode.LWPI: 2,
+    Opcode.LWX: 2,
+    Opcode.SW: 2,
+    Opcode.SWPD: 2,
+    Opcode.SWX: 2,
+    Opcode.BEQ: 2,
+    Opcode.BNE: 2,
+    Opcode.BGT: 2,
+    Opcode.BLT: 2,
+    Opcode.DBNZ: 2,
+}
+"""Число тактов многотактовых инструкций (см. таблицу инструкций)
+
+Блочные инструкции считаются по `BLOCK_OPERATION_TICKS_PER_WORD`, остальные выполняются за один такт
+"""
+
+BRANCH_CONDITIONS = {
+    Opcode.BEQ: lambda data_path: data_path.zero_flag,
+    Opcode.BNE: lambda data_path: not data_path.zero_flag,
+    Opcode.BGT: lambda data_path: not data_path.zero_flag and data_path.negative_flag == data_path.overflow_flag,
+    Opcode.BLT: lambda data_path: data_path.negative_flag != data_path.overflow_flag,
+    Opcode.DBNZ: lambda data_path: not data_path.zero_flag,
+}
+"Условия переходов по флагам АЛУ. Используются при выполнении инструкции целиком (см. `process_next_instruction`)"
+
 
 class ProcessorState(str, Enum):
     """Вспомогательный класс для хранения состояния процессора"""
@@ -71,6 +111,48 @@ class ControlUnit:
     is_interrupts_enabled = None
     "Флаг разрешение прерываний. Инициализируется значением `False`"
 
+    input_ticks = None
+    "Упорядоченные такты событий ввода из `input_timetable`. Нужны для быстрого режима и ожидания прерываний"
+
+    is_waiting_for_interrupt = None
+    "Флаг ожидания прерывания (после инструкции `wfi`). Инициализируется значением `False`"
+
+    idle_ticks = None
+    "Количество тактов, проведённых в ожидании прерывания. Инициализируется нулём"
+
+    input_stream = None
+    """Ещё не поданные значения потока ввода в режиме обратного давления. Пуст, если используется `input_timetable`
+
+    Очередное значение подаётся, как только программа готова к приёму (см. `signal_feed_input`)
+    """
+
+    instructions_retired = None
+    "Количество выполненных инструкций. Инициализируется нулём. Доступно программе как счётчик производительности"
+
+    interrupts_taken = None
+    "Количество входов в обработчик прерываний. Инициализируется нулём. Доступно программе как счётчик производительности"
+
+    pending_input_ticks = None
+    "Такты событий ввода, после которых ещё не было входа в обработчик прерываний"
+
+    handler_entry_tick = None
+    "Такт начала выполнения обработчика (перехода в `INT_BODY`) при текущем или последнем прерывании"
+
+    interrupt_latency = None
+    "Гистограмма задержек в тактах от события ввода до начала выполнения обработчика прерываний"
+
+    handler_occupancy = None
+    "Гистограмма длительностей обработчика прерываний в тактах: от перехода в `INT_BODY` до выполнения `rint`"
+
+    deferred_input_events = None
+    """Количество событий ввода, не вызвавших собственного прерывания: прерывания были запрещены или уже обрабатывались
+
+    Значения таких событий не теряются, a остаются в буфере ввода до следующего входа в обработчик
+    """
+
+    overwritten_inputs = None
+    "Вытесненные из переполненного буфера ввода до чтения значения: список пар (такт, значение)"
+
     def __init__(
         self,
         instructions: list[Instruction],
@@ -78,6 +160,7 @@ class ControlUnit:
         data_path: DataPath,
         input_timetable: dict[int, int],
         interrupt_handler_address: int,
+        input_stream: list[int] | None = None,
     ):
         self.instruction_memory_size = instruction_memory_size
         self.instruction_memory: list[Instruction] = [
@@ -86,7 +169,9 @@ class ControlUnit:
         self.init_instruction_memory(instructions)
         self.data_path = data_path
         self.input_timetable = input_timetable
+        self.input_ticks = sorted(input_timetable)
         self.interrupt_handler_address = interrupt_handler_address
+        self.input_stream = deque(input_stream or [])
 
         self.program_counter = 0
         self._tick = 0
@@ -94,7 +179,18 @@ class ControlUnit:
         self.state = 0
         self.is_interrupts_enabled = False
         self.is_interrupt_request = False
+        self.is_waiting_for_interrupt = False
+        self.idle_ticks = 0
         self.pc_interrupt_buffer = 0
+        self.instructions_retired = 0
+        self.interrupts_taken = 0
+        self.data_path.performance_counters = self.read_performance_counter
+        self.pending_input_ticks = []
+        self.handler_entry_tick = 0
+        self.interrupt_latency = Histogram()
+        self.handler_occupancy = Histogram()
+        self.deferred_input_events = 0
+        self.overwritten_inputs = []
         self.states = [ProcessorState.NORMAL, ProcessorState.INT_ENTER, ProcessorState.INT_BODY]
 
     def init_instruction_memory(self, program: list[Instruction]):
@@ -108,14 +204,28 @@ class ControlUnit:
         """Продвинуть модельное время процессора вперёд на один такт."""
         self._tick += 1
 
+    def skip_ticks(self, ticks: int, instructions: int = 0):
+        """Продвинуть модельное время вперёд на `ticks` тактов без выполнения инструкций
+
+        Используется, когда состояние процессора за это время заведомо не меняется (см. `SpinWaitDetector`).
+        Счётчик выполненных инструкций увеличивается на `instructions` -- столько инструкций выполнилось бы за это время
+        """
+        self._tick += ticks
+        self.instructions_retired += instructions
+
     def get_tick(self):
         """Получить текущее модельное время процессора (в тактах)."""
         return self._tick
 
-    def _signal_latch_pc(self, next_pc: int):
-        """Защёлкнуть новое значение счётчика команд"""
+    def _signal_latch_pc(self, next_pc: int, is_retiring: bool = True):
+        """Защёлкнуть новое значение счётчика команд
+
+        Защёлкивание счётчика команд завершает инструкцию (`is_retiring`), кроме перехода на обработчик прерываний
+        """
 
         self.program_counter = next_pc
+        if is_retiring:
+            self.instructions_retired += 1
 
         assert self.program_counter < len(self.instruction_memory), "out of instruction memory: {}".format(
             self.program_counter
@@ -150,13 +260,63 @@ class ControlUnit:
         """Защёлкнуть значение счётчика команд адресом прерывания"""
 
         next_pc = self.interrupt_handler_address
-        self._signal_latch_pc(next_pc)
+        self._signal_latch_pc(next_pc, is_retiring=False)
 
     def signal_latch_pc_interrupt_buffer(self):
         """Защёлкнуть буфер счётчика команд текущим значением счётчика"""
 
         self.pc_interrupt_buffer = self.program_counter
 
+    def signal_latch_int_rq(self):
+        """Установка флага запроса прерывания по непустому буферу ввода
+
+        Запрос выставляется на границе инструкций, пока в буфере ввода есть значения (если их не забирает
+        контроллер DMA) или не обработано завершение передачи DMA, прерывания разрешены и процессор находится
+        в состоянии `NORMAL`
+        """
+
+        data_path = self.data_path
+        is_input_ready = len(data_path.input_buffer) > 0 and data_path.dma_command != DMA_INPUT_COMMAND
+        if (
+            self.step == 0
+            and (is_input_ready or data_path.is_dma_completed)
+            and self.is_interrupts_enabled
+            and self.states[self.state] is ProcessorState.NORMAL
+        ):
+            self.is_interrupt_request = True
+
+    def signal_input(self, value: int):
+        """Событие ввода: запись значения в буфер ввода и учёт события для статистики прерываний
+
+        Событие, пришедшее при запрещённых прерываниях или во время обработки прерывания, считается отложенным.
+        Значение, вытесненное из переполненного буфера ввода, запоминается в `overwritten_inputs`
+        """
+
+        logging.debug('Input on tick %s with value "%s" | %s', self._tick, int_to_char(value), value)
+        if not self.is_interrupts_enabled or self.states[self.state] is not ProcessorState.NORMAL:
+            self.deferred_input_events += 1
+        lost = self.data_path.signal_input(value)
+        if lost is not None:
+            logging.warning('Input on tick %s overwrote unread value "%s" | %s', self._tick, int_to_char(lost), lost)
+            self.overwritten_inputs.append((self._tick, lost))
+        self.pending_input_ticks.append(self._tick)
+
+    def signal_feed_input(self):
+        """Подача очередного значения потока ввода в режиме обратного давления
+
+        Значение подаётся на границе инструкций, если предыдущее уже прочитано (буфер ввода пуст), прерывания разрешены
+        и процессор находится в состоянии `NORMAL`
+        """
+
+        if (
+            self.input_stream
+            and self.step == 0
+            and len(self.data_path.input_buffer) == 0
+            and self.is_interrupts_enabled
+            and self.states[self.state] is ProcessorState.NORMAL
+        ):
+            self.signal_input(self.input_stream.popleft())
+
     def signal_rem_int_rq(self):
         """Сброс флага запроса прерывания"""
 
@@ -172,29 +332,63 @@ class ControlUnit:
 
         self.is_interrupts_enabled = False
 
+    def signal_set_wait(self):
+        """Установка флага ожидания прерывания"""
+
+        self.is_waiting_for_interrupt = True
+
+    def signal_rem_wait(self):
+        """Сброс флага ожидания прерывания"""
+
+        self.is_waiting_for_interrupt = False
+
+    def idle_until_input_event(self, tick_limit: int | None = None):
+        """Ожидание прерывания: модельное время сразу продвигается до ближайшего события ввода (не дальше `tick_limit`)
+
+        Пропущенные такты учитываются как такты простоя
+        """
+
+        target = self.next_input_tick(self._tick + 1)
+        if tick_limit is not None:
+            target = tick_limit if target is None else min(target, tick_limit)
+        if target is None:
+            raise NoInputEventsError()
+        self.idle_ticks += target - self._tick
+        self._tick = target
+
+    def record_handler_entry(self):
+        """Учёт начала выполнения обработчика прерываний: задержки всех событий ввода, случившихся после прошлого входа"""
+
+        self.handler_entry_tick = self._tick
+        self.interrupts_taken += 1
+        for tick in self.pending_input_ticks:
+            self.interrupt_latency.add(self._tick - tick)
+        self.pending_input_ticks.clear()
+
     def signal_shift_state(self):
         """Переключение состояния процессора"""
 
         self.state = (self.state + 1) % len(self.states)
 
-    def process_next_tick(self):  # noqa: C901 # код хорошо структурирован, по этому не проблема.
-        """Основной цикл процессора. Декодирует и выполняет инструкцию."""
+    def process_next_tick(self, tick_limit: int | None = None):  # noqa: C901 # код хорошо структурирован, по этому не проблема.
+        """Основной цикл процессора. Декодирует и выполняет инструкцию.
+
+        B ожидании прерывания (`wfi`) модельное время за один вызов продвигается до ближайшего события ввода,
+        но не дальше лимита тактов `tick_limit`
+        """
 
         if self._tick in self.input_timetable:
-            value = self.input_timetable[self._tick]
-            self.data_path.input_buffer.clear()
-            self.data_path.input_buffer.append(value)
-            logging.debug('Interrupt request on tick %s with value "%s" | %s', self._tick, int_to_char(value), value)
-            if not self.is_interrupts_enabled:
-                logging.debug("Interrupts are disabled")
-            elif self.states[self.state] in [ProcessorState.INT_ENTER, ProcessorState.INT_BODY]:
-                logging.debug("Interrupts inside of interrupts are not supported")
-            else:
-                self.is_interrupt_request = True
+            self.signal_input(self.input_timetable[self._tick])
+
+        self.signal_feed_input()
+        self.data_path.signal_dma_step()
+        self.signal_latch_int_rq()
 
         if self.is_interrupt_request and self.step == 0 and self.states[self.state] == ProcessorState.NORMAL:
             self.signal_shift_state()
             self.signal_rem_int_rq()
+            self.signal_rem_wait()
+            self.data_path.signal_dma_ack()
             self.step = 0
             self.tick()
             return
@@ -212,19 +406,37 @@ class ControlUnit:
                 self.signal_shift_state()
                 self.step = 0
                 self.tick()
+                self.record_handler_entry()
                 return
 
+        if self.is_waiting_for_interrupt:
+            if self.data_path.is_dma_progressing():
+                self.idle_ticks += 1
+                self.tick()
+            else:
+                self.idle_until_input_event(tick_limit)
+            return
+
         instr = self.instruction_memory[self.program_counter]
 
         if instr.opcode is Opcode.HALT:
             raise StopIteration()
 
+        if instr.opcode is Opcode.WFI:
+            if self.is_interrupts_enabled and self.states[self.state] is ProcessorState.NORMAL:
+                self.signal_set_wait()
+            self.signal_latch_pc_seq()
+            self.step = 0
+            self.tick()
+            return
+
         if instr.opcode is Opcode.RINT:
             self.data_path.signal_restore_registers()
             self.signal_latch_pc_buf()
             self.signal_shift_state()
             self.step = 0
             self.tick()
+            self.handler_occupancy.add(self._tick - self.handler_entry_tick)
             return
 
         if instr.opcode is Opcode.EINT:
@@ -258,6 +470,23 @@ class ControlUnit:
                 self.step = 0
                 self.tick()
                 return
+            if instr.opcode is Opcode.LWPI:
+                if self.step == 0:
+                    self.data_path.signal_latch_data_address_reg(instr.rs1)
+                    alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
+                    self.data_path.signal_write_to_reg(instr.rs1, alu_out)
+                    self.step = 1
+                    self.tick()
+                    return
+
+                if self.step == 1:
+                    data_out = self.data_path.signal_data_memory_load()
+                    self.data_path.signal_write_to_reg(instr.rd, data_out)
+                    self.signal_latch_pc_seq()
+                    self.step = 0
+                    self.tick()
+                    return
+
             if instr.opcode is Opcode.LW:
                 if self.step == 0:
                     alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
@@ -274,6 +503,63 @@ class ControlUnit:
                     self.tick()
                     return
 
+        if isinstance(instr, RInstruction) and instr.opcode in (Opcode.LWX, Opcode.SWX):
+            if self.step == 0:
+                alu_out = self.data_path.signal_perform_alu_operation_reg_reg(instr.rs1, instr.rs2, Opcode.ADD)
+                self.data_path.signal_latch_data_address(alu_out)
+                self.step = 1
+                self.tick()
+                return
+
+            if self.step == 1:
+                if instr.opcode is Opcode.LWX:
+                    data_out = self.data_path.signal_data_memory_load()
+                    self.data_path.signal_write_to_reg(instr.rd, data_out)
+                else:
+                    alu_out = self.data_path.signal_perform_alu_operation_reg_reg(Register.ZERO, instr.rd, Opcode.ADD)
+                    self.data_path.signal_data_memory_store(alu_out)
+                self.signal_latch_pc_seq()
+                self.step = 0
+                self.tick()
+                return
+
+        if isinstance(instr, RInstruction) and instr.opcode in BLOCK_OPERATION_TICKS_PER_WORD:
+            if self.step == 0:
+                if instr.opcode is Opcode.MOVE:
+                    self.data_path.signal_block_move(instr.rs1, instr.rs2, instr.rd)
+                else:
+                    self.data_path.signal_block_fill(instr.rs1, instr.rs2, instr.rd)
+
+            length = max(self.data_path.registers_file[instr.rd], 0)
+            if self.step < length * BLOCK_OPERATION_TICKS_PER_WORD[instr.opcode]:
+                self.step += 1
+                self.tick()
+                return
+
+            self.signal_latch_pc_seq()
+            self.step = 0
+            self.tick()
+            return
+
+        if isinstance(instr, RInstruction) and instr.opcode in (Opcode.DADD, Opcode.DSUB, Opcode.DNEG):
+            if instr.opcode is Opcode.DNEG:
+                alu_out = self.data_path.signal_perform_alu_operation_pair(Register.ZERO, instr.rs1, Opcode.DSUB)
+            else:
+                alu_out = self.data_path.signal_perform_alu_operation_pair(instr.rs1, instr.rs2, instr.opcode)
+            self.data_path.signal_write_to_pair(instr.rd, alu_out)
+            self.signal_latch_pc_seq()
+            self.step = 0
+            self.tick()
+            return
+
+        if isinstance(instr, RInstruction) and instr.opcode is Opcode.DCMP:
+            alu_out = self.data_path.signal_perform_alu_operation_pair(instr.rs1, instr.rs2, Opcode.DCMP)
+            self.data_path.signal_write_to_reg(instr.rd, alu_out)
+            self.signal_latch_pc_seq()
+            self.step = 0
+            self.tick()
+            return
+
         if isinstance(instr, RInstruction):
             alu_out = self.data_path.signal_perform_alu_operation_reg_reg(instr.rs1, instr.rs2, instr.opcode)
             self.data_path.signal_write_to_reg(instr.rd, alu_out)
@@ -347,6 +633,40 @@ class ControlUnit:
                     self.tick()
                     return
 
+            if instr.opcode is Opcode.DBNZ:
+                if self.step == 0:
+                    alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, -1, Opcode.ADD)
+                    self.data_path.signal_write_to_reg(instr.rs1, alu_out)
+                    self.step = 1
+                    self.tick()
+                    return
+
+                if self.step == 1:
+                    if not self.data_path.zero_flag:
+                        self.signal_latch_pc_imm(instr.imm)
+                    else:
+                        self.signal_latch_pc_seq()
+                    self.step = 0
+                    self.tick()
+                    return
+
+            if instr.opcode is Opcode.SWPD:
+                if self.step == 0:
+                    alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
+                    self.data_path.signal_latch_data_address(alu_out)
+                    self.data_path.signal_write_to_reg(instr.rs1, alu_out)
+                    self.step = 1
+                    self.tick()
+                    return
+
+                if self.step == 1:
+                    alu_out = self.data_path.signal_perform_alu_operation_reg_reg(Register.ZERO, instr.rs2, Opcode.ADD)
+                    self.data_path.signal_data_memory_store(alu_out)
+                    self.signal_latch_pc_seq()
+                    self.step = 0
+                    self.tick()
+                    return
+
             if instr.opcode is Opcode.SW:
                 if self.step == 0:
                     alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
@@ -379,8 +699,154 @@ class ControlUnit:
                     self.tick()
                     return
 
+    def instruction_ticks(self, instr: Instruction) -> int:
+        """Число тактов, которое занимает выполнение инструкции `instr` в текущем состоянии регистров"""
+
+        if instr.opcode in BLOCK_OPERATION_TICKS_PER_WORD:
+            length = max(self.data_path.registers_file[instr.rd], 0)
+            return 1 + length * BLOCK_OPERATION_TICKS_PER_WORD[instr.opcode]
+        return INSTRUCTION_TICKS.get(instr.opcode, 1)
+
+    def read_performance_counter(self, address: int) -> int:
+        """Значение счётчика производительности по адресу `address` для читающей его инструкции
+
+        Счётчик тактов возвращает такт начала инструкции (текущий такт за вычетом уже выполненных шагов), поэтому
+        значение одинаково в потактовом и быстром режимах
+        """
+
+        if address == TICK_COUNTER_ADDRESS:
+            return self._tick - self.step
+        if address == INSTRUCTION_COUNTER_ADDRESS:
+            return self.instructions_retired
+        return self.interrupts_taken
+
+    def has_input_event(self, start: int, end: int) -> bool:
+        """Есть ли событие ввода на тактах из полуинтервала `[start, end)`"""
+
+        i = bisect_left(self.input_ticks, start)
+        return i < len(self.input_ticks) and self.input_ticks[i] < end
+
+    def next_input_tick(self, tick: int) -> int | None:
+        """Такт ближайшего события ввода, начиная c такта `tick`"""
+
+        i = bisect_left(self.input_ticks, tick)
+        return self.input_ticks[i] if i < len(self.input_ticks) else None
+
+    def machine_state(self) -> tuple:
+        """Состояние процессора, от которого зависит его дальнейшая работа (кроме памяти данных и модельного времени)
+
+        Используется для обнаружения повторяющихся состояний (см. `SpinWaitDetector` и `LoopDetector`)
+        """
+
+        data_path = self.data_path
+        return (
+            self.state,
+            self.is_interrupt_request,
+            self.is_interrupts_enabled,
+            self.is_waiting_for_interrupt,
+            self.pc_interrupt_buffer,
+            tuple(data_path.registers_file.values()),
+            tuple(data_path.shadow_register_file.values()),
+            tuple(data_path.input_buffer),
+            len(data_path.output_buffer),
+            data_path.data_address,
+            data_path.zero_flag,
+            data_path.negative_flag,
+            data_path.overflow_flag,
+            data_path.dma_command,
+            data_path.dma_buffer_address,
+            data_path.dma_position,
+            data_path.is_dma_completed,
+            len(self.input_stream),
+        )
+
+    def process_next_instruction(self, tick_limit: int | None = None):
+        """Быстрый режим: выполняет очередную инструкцию целиком за один вызов
+
+        Модельное время увеличивается на число тактов инструкции. Потактовое выполнение (`process_next_tick`)
+        используется для однотактовых инструкций, входа в прерывание и инструкций, во время которых происходит
+        событие ввода или истекает лимит тактов `tick_limit`, поэтому результат и число тактов совпадают
+        c потактовым режимом
+        """
+
+        self.signal_feed_input()
+        self.signal_latch_int_rq()
+        instr = self.instruction_memory[self.program_counter]
+        ticks = self.instruction_ticks(instr)
+
+        if (
+            ticks == 1
+            or self.step != 0
+            or self.is_waiting_for_interrupt
+            or self.data_path.dma_command is not None
+            or self.states[self.state] is ProcessorState.INT_ENTER
+            or (self.is_interrupt_request and self.states[self.state] is ProcessorState.NORMAL)
+            or self.has_input_event(self._tick, self._tick + ticks)
+            or (tick_limit is not None and self._tick + ticks > tick_limit)
+        ):
+            self.process_next_tick(tick_limit)
+            return
+
+        self.execute_instruction(instr)
+        self._tick += ticks
+
+    def execute_instruction(self, instr: Instruction):  # noqa: C901 # повторяет разбор из `process_next_tick`
+        """Выполняет все шаги многотактовой инструкции подряд теми же сигналами, что и `process_next_tick`"""
+
+        opcode = instr.opcode
+
+        if opcode in (Opcode.LW, Opcode.LWPI, Opcode.LWX):
+            if opcode is Opcode.LW:
+                alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
+                self.data_path.signal_latch_data_address(alu_out)
+            elif opcode is Opcode.LWPI:
+                self.data_path.signal_latch_data_address_reg(instr.rs1)
+                alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
+                self.data_path.signal_write_to_reg(instr.rs1, alu_out)
+            else:
+                alu_out = self.data_path.signal_perform_alu_operation_reg_reg(instr.rs1, instr.rs2, Opcode.ADD)
+                self.data_path.signal_latch_data_address(alu_out)
+            data_out = self.data_path.signal_data_memory_load()
+            self.data_path.signal_write_to_reg(instr.rd, data_out)
+            self.signal_latch_pc_seq()
+            return
+
+        if opcode in (Opcode.SW, Opcode.SWPD, Opcode.SWX):
+            if opcode is Opcode.SWX:
+                alu_out = self.data_path.signal_perform_alu_operation_reg_reg(instr.rs1, instr.rs2, Opcode.ADD)
+                self.data_path.signal_latch_data_address(alu_out)
+                value = instr.rd
+            else:
+                alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, instr.imm, Opcode.ADD)
+                self.data_path.signal_latch_data_address(alu_out)
+                if opcode is Opcode.SWPD:
+                    self.data_path.signal_write_to_reg(instr.rs1, alu_out)
+                value = instr.rs2
+            alu_out = self.data_path.signal_perform_alu_operation_reg_reg(Register.ZERO, value, Opcode.ADD)
+            self.data_path.signal_data_memory_store(alu_out)
+            self.signal_latch_pc_seq()
+            return
+
+        if opcode in BRANCH_CONDITIONS:
+            if opcode is Opcode.DBNZ:
+                alu_out = self.data_path.signal_perform_alu_operation_reg_imm(instr.rs1, -1, Opcode.ADD)
+                self.data_path.signal_write_to_reg(instr.rs1, alu_out)
+            else:
+                self.data_path.signal_perform_alu_operation_reg_reg(instr.rs1, instr.rs2, Opcode.SUB)
+            if BRANCH_CONDITIONS[opcode](self.data_path):
+                self.signal_latch_pc_imm(instr.imm)
+            else:
+                self.signal_latch_pc_seq()
+            return
+
+        if opcode is Opcode.MOVE:
+            self.data_path.signal_block_move(instr.rs1, instr.rs2, instr.rd)
+        else:
+            self.data_path.signal_block_fill(instr.rs1, instr.rs2, instr.rd)
+        self.signal_latch_pc_seq()
+
     def __repr__(self):
-        state_repr = "STATE: {}\tTICK: {:3} PC: {:3}/{} ADDR: {:3} MEM_OUT: {:3} T0: {:3} T1: {:3} T2: {:3} T3: {:3} SP: {:3}".format(
+        state_repr = "STATE: {}\tTICK: {:3} PC: {:3}/{} ADDR: {:3} MEM_OUT: {:3} T0: {:3} T1: {:3} T2: {:3} T3: {:3} SP: {:3} S0: {:3} S1: {:3}".format(
             self.states[self.state],
             self._tick,
             self.program_counter,
@@ -392,6 +858,8 @@ class ControlUnit:
             self.data_path.registers_file[Register.T2],
             self.data_path.registers_file[Register.T3],
             self.data_path.registers_file[Register.SP],
+            self.data_path.registers_file[Register.S0],
+            self.data_path.registers_file[Register.S1],
         )
 
         instr = self.instruction_memory[self.program_counter]
@@ -1,20 +1,59 @@
 from __future__ import annotations
 
 import logging
-
-from src.constants import MAX_NUMBER, MIN_NUMBER, WORD_SIZE
+from collections import deque
+from functools import reduce
+from operator import xor
+
+from src.constants import (
+    DMA_INPUT_COMMAND,
+    DMA_INPUT_TERMINATOR,
+    DMA_OUTPUT_COMMAND,
+    INPUT_FIFO_DEPTH,
+    MAX_EXTENDED_NUMBER,
+    MAX_NUMBER,
+    MIN_EXTENDED_NUMBER,
+    MIN_NUMBER,
+    WORD_SIZE,
+)
 from src.isa.data import Data
-from src.isa.memory_config import INPUT_ADDRESS, OUTPUT_ADDRESS
+from src.isa.memory_config import (
+    DMA_BUFFER_ADDRESS,
+    DMA_CONTROL_ADDRESS,
+    INPUT_ADDRESS,
+    INPUT_STATUS_ADDRESS,
+    INSTRUCTION_COUNTER_ADDRESS,
+    INTERRUPT_COUNTER_ADDRESS,
+    OUTPUT_ADDRESS,
+    TICK_COUNTER_ADDRESS,
+)
 from src.isa.opcode_ import Opcode
-from src.isa.register import Register
+from src.isa.register import Register, register_pair
 from src.isa.util.binary import binary_to_signed_int
 from src.machine.exceptions.exceptions import (
+    BlockAccessToIoAddressError,
+    DmaBusyError,
     EmptyInputBufferError,
     ReadingFromOutputAddressError,
+    UnknownDmaCommandError,
     WritingToInputAddressError,
+    WritingToPerformanceCounterError,
 )
 from src.machine.util import int_list_to_str, int_to_char
 
+PERFORMANCE_COUNTER_ADDRESSES = (TICK_COUNTER_ADDRESS, INSTRUCTION_COUNTER_ADDRESS, INTERRUPT_COUNTER_ADDRESS)
+"Адреса счётчиков производительности, значения которых предоставляет блок управления"
+
+IO_ADDRESSES = (
+    INPUT_ADDRESS,
+    OUTPUT_ADDRESS,
+    INPUT_STATUS_ADDRESS,
+    DMA_BUFFER_ADDRESS,
+    DMA_CONTROL_ADDRESS,
+    *PERFORMANCE_COUNTER_ADDRESSES,
+)
+"Адреса устройств ввода-вывода в памяти данных"
+
 ALU_OPCODE_OPERATORS = {
     Opcode.ADD: lambda left, right: left + right,
     Opcode.ADC: lambda left, right: (((left & ((1 << WORD_SIZE) - 1)) + (right & ((1 << WORD_SIZE) - 1))) >> WORD_SIZE)
@@ -29,9 +68,27 @@ ALU_OPCODE_OPERATORS = {
     Opcode.AND: lambda left, right: left & right,
     Opcode.OR: lambda left, right: left | right,
     Opcode.XOR: lambda left, right: left ^ right,
+    Opcode.SEQ: lambda left, right: int(left == right),
+    Opcode.SLT: lambda left, right: int(left < right),
 }
 "Вспомогательный словарь для хранения lambda-выражение операций alu"
 
+PAIR_ALU_OPCODE_OPERATORS = {
+    Opcode.DADD: lambda left, right: left + right,
+    Opcode.DSUB: lambda left, right: left - right,
+    Opcode.DCMP: lambda left, right: (left > right) - (left < right),
+}
+"Вспомогательный словарь для хранения lambda-выражений операций alu над парами регистров (двойная точность)"
+
+
+def memory_cells_hash(address: int, values: list[int]) -> int:
+    """Хэш содержимого ячеек памяти, начиная c адреса `address`
+
+    Хэши отдельных ячеек объединяются через `XOR`, поэтому хэш всей памяти можно обновлять по изменённым ячейкам
+    """
+
+    return reduce(xor, map(hash, zip(range(address, address + len(values)), values)), 0)
+
 
 class DataPath:
     """Тракт данных (пассивный), включая: ввод/вывод, память и арифметику."""
@@ -46,7 +103,13 @@ class DataPath:
     "Адрес в памяти данных. Инициализируется нулём."
 
     input_buffer = None
-    "Буфер входных данных."
+    "Буфер входных данных (FIFO). Значения читаются в порядке поступления."
+
+    input_fifo_depth = None
+    "Глубина буфера входных данных"
+
+    input_overflows = None
+    "Количество значений, вытесненных из буфера входных данных при переполнении. Инициализируется нулём"
 
     output_buffer = None
     "Буфер выходных данных."
@@ -66,15 +129,51 @@ class DataPath:
     overflow_flag = None
     "Флаг переполнения. Инициализируется значением `False`"
 
-    def __init__(self, data_memory_size: int, data: list[Data]):
+    dma_command = None
+    "Выполняемая контроллером DMA команда (`DMA_OUTPUT_COMMAND`, `DMA_INPUT_COMMAND`) или `None`, если он свободен"
+
+    dma_buffer_address = None
+    "Регистр адреса буфера DMA. Инициализируется нулём"
+
+    dma_position = None
+    "Количество значений, переданных контроллером DMA в текущей передаче"
+
+    is_dma_completed = None
+    "Флаг завершения передачи DMA. Вызывает запрос прерывания и сбрасывается при входе в прерывание"
+
+    performance_counters = None
+    """Функция чтения счётчика производительности по адресу (см. `PERFORMANCE_COUNTER_ADDRESSES`)
+
+    Значения счётчиков хранит блок управления, он же и подключает эту функцию. Без него счётчики равны нулю
+    """
+
+    memory_hash = None
+    """Хэш содержимого памяти данных. Обновляется инкрементально при каждой записи, которая меняет значение ячейки
+
+    Нужен для быстрого сравнения состояний памяти (см. `SpinWaitDetector`, `LoopDetector`), поэтому ведётся, только
+    когда он нужен детектору (см. `enable_memory_hash`). Иначе -- `None`
+    """
+
+    def __init__(self, data_memory_size: int, data: list[Data], input_fifo_depth: int = INPUT_FIFO_DEPTH):
+        assert input_fifo_depth > 0, "input FIFO depth must be positive"
         self.data_memory_size = data_memory_size
         self.data_memory: list[Data] = [Data()] * data_memory_size
         self.init_data_memory(data)
+        self.memory_hash = None
         self.data_address = 0
 
-        self.input_buffer = []
+        self.input_buffer = deque()
+        self.input_fifo_depth = input_fifo_depth
+        self.input_overflows = 0
         self.output_buffer = []
 
+        self.dma_command = None
+        self.dma_buffer_address = 0
+        self.dma_position = 0
+        self.is_dma_completed = False
+
+        self.performance_counters = lambda _address: 0
+
         self.registers_file = {r: 0 for r in Register}
         self.registers_file[Register.SP] = self.data_memory_size
 
@@ -98,6 +197,11 @@ class DataPath:
 
         self.data_address = address
 
+    def signal_latch_data_address_reg(self, rs1: Register):
+        """Защёлкнуть адрес в памяти данных напрямую из регистра `rs1`, минуя АЛУ"""
+
+        self.signal_latch_data_address(self.registers_file[rs1])
+
     def signal_store_registers(self):
         """Защёлкнуть резервный блок регистров"""
 
@@ -107,48 +211,210 @@ class DataPath:
         """Защёлкнуть основной блок регистров"""
         self.registers_file.update(self.shadow_register_file)
 
+    def signal_input(self, value: int) -> int | None:
+        """Запись пришедшего c устройства ввода значения в буфер ввода
+
+        Если буфер заполнен, самое старое значение вытесняется и возвращается, иначе возвращается `None`
+        """
+
+        lost = None
+        if len(self.input_buffer) == self.input_fifo_depth:
+            lost = self.input_buffer.popleft()
+            self.input_overflows += 1
+            logging.debug('Input buffer overflow: "%s" | %s is lost', int_to_char(lost), lost)
+        self.input_buffer.append(value)
+        return lost
+
     def signal_data_memory_store(self, data_in: int):
         """Записать значение `data_in` в память.
 
         Адрес должен быть предварительно задан в `data_address`
 
-        В случае если адрес установлен на устройство вывода, выполняется запись значения в буфер вывода
+        В случае если адрес установлен на устройство вывода, выполняется запись значения в буфер вывода,
+        a в случае регистров контроллера DMA -- запись адреса буфера или запуск передачи
         """
 
-        if self.data_address == INPUT_ADDRESS:
+        if self.data_address in (INPUT_ADDRESS, INPUT_STATUS_ADDRESS):
             raise WritingToInputAddressError()
+        if self.data_address in PERFORMANCE_COUNTER_ADDRESSES:
+            raise WritingToPerformanceCounterError()
         if self.data_address == OUTPUT_ADDRESS:
-            logging.debug(
-                'output: "%s" << "%s" | %s << %s',
-                int_list_to_str(self.output_buffer),
-                int_to_char(data_in),
-                self.output_buffer,
-                data_in,
-            )
-            self.output_buffer.append(data_in)
+            self._write_output(data_in)
+        elif self.data_address == DMA_BUFFER_ADDRESS:
+            self.dma_buffer_address = data_in
+        elif self.data_address == DMA_CONTROL_ADDRESS:
+            self.signal_dma_start(data_in)
+        elif self.data_memory[self.data_address].value != data_in:
+            self._write_cell(self.data_address, data_in)
+
+    def _write_cell(self, address: int, value: int):
+        """Запись значения `value` в ячейку памяти по адресу `address` c обновлением хэша памяти"""
+
+        if self.memory_hash is not None:
+            old_value = self.data_memory[address].value
+            self.memory_hash ^= memory_cells_hash(address, [old_value]) ^ memory_cells_hash(address, [value])
+        self.data_memory[address] = Data(value, address)
+
+    def _write_output(self, value: int):
+        """Запись значения в буфер вывода"""
+
+        logging.debug(
+            'output: "%s" << "%s" | %s << %s',
+            int_list_to_str(self.output_buffer),
+            int_to_char(value),
+            self.output_buffer,
+            value,
+        )
+        self.output_buffer.append(value)
+
+    def signal_dma_start(self, command: int):
+        """Запуск передачи DMA c буфером по адресу из регистра `dma_buffer_address`
+
+        При чтении (`DMA_INPUT_COMMAND`) буфер сразу становится пустой Pascal-строкой
+        """
+
+        if command not in (DMA_OUTPUT_COMMAND, DMA_INPUT_COMMAND):
+            raise UnknownDmaCommandError(command)
+        if self.dma_command is not None:
+            raise DmaBusyError()
+
+        logging.debug("DMA start: command %s, buffer %s", command, self.dma_buffer_address)
+        self._check_block_range(self.dma_buffer_address, 1)
+        self.dma_command = command
+        self.dma_position = 0
+        if command == DMA_INPUT_COMMAND:
+            self._write_block(self.dma_buffer_address, [0])
+
+    def is_dma_progressing(self) -> bool:
+        """Продвинется ли передача DMA на следующем такте (при чтении -- только если в буфере ввода есть значения)"""
+
+        return self.dma_command == DMA_OUTPUT_COMMAND or (
+            self.dma_command == DMA_INPUT_COMMAND and len(self.input_buffer) > 0
+        )
+
+    def signal_dma_step(self):
+        """Такт работы контроллера DMA: передача одного значения
+
+        При выводе очередной символ Pascal-строки записывается в буфер вывода. При чтении очередное значение из буфера
+        ввода дописывается в Pascal-строку, a значение `DMA_INPUT_TERMINATOR` завершает передачу
+        """
+
+        if not self.is_dma_progressing():
+            return
+
+        address = self.dma_buffer_address
+        if self.dma_command == DMA_OUTPUT_COMMAND:
+            if self.dma_position < self.data_memory[address].value:
+                self._check_block_range(address + 1 + self.dma_position, 1)
+                self._write_output(self.data_memory[address + 1 + self.dma_position].value)
+                self.dma_position += 1
+            if self.dma_position < self.data_memory[address].value:
+                return
         else:
-            self.data_memory[self.data_address] = Data(data_in, self.data_address)
+            value = self.input_buffer.popleft()
+            logging.debug('DMA input: "%s" | %s', int_to_char(value), value)
+            if value != DMA_INPUT_TERMINATOR:
+                self.dma_position += 1
+                self._check_block_range(address + self.dma_position, 1)
+                self._write_block(address + self.dma_position, [value])
+                self._write_block(address, [self.dma_position])
+                return
+
+        logging.debug("DMA transfer completed: %s values", self.dma_position)
+        self.dma_command = None
+        self.is_dma_completed = True
+
+    def signal_dma_ack(self):
+        """Сброс флага завершения передачи DMA"""
+
+        self.is_dma_completed = False
+
+    def signal_block_move(self, src: Register, dst: Register, length: Register):
+        """Копирование `length` ячеек памяти c адреса из `src` по адресу из `dst`
+
+        Выполняется одним срезом, поэтому пересекающиеся области копируются корректно (как `memmove`)
+        """
+
+        src_address, dst_address, size = self.registers_file[src], self.registers_file[dst], self.registers_file[length]
+        if size <= 0:
+            return
+        self._check_block_range(src_address, size)
+        self._check_block_range(dst_address, size)
+
+        values = [element.value for element in self.data_memory[src_address : src_address + size]]
+        self._write_block(dst_address, values)
+
+    def signal_block_fill(self, dst: Register, value: Register, length: Register):
+        """Заполнение `length` ячеек памяти начиная c адреса из `dst` значением регистра `value`"""
+
+        dst_address, size = self.registers_file[dst], self.registers_file[length]
+        if size <= 0:
+            return
+        self._check_block_range(dst_address, size)
+
+        self._write_block(dst_address, [self.registers_file[value]] * size)
+
+    def _write_block(self, address: int, values: list[int]):
+        """Запись значений `values` в память начиная c адреса `address` одним срезом c обновлением хэша памяти"""
+
+        end = address + len(values)
+        if self.memory_hash is not None:
+            old_values = [element.value for element in self.data_memory[address:end]]
+            self.memory_hash ^= memory_cells_hash(address, old_values) ^ memory_cells_hash(address, values)
+        self.data_memory[address:end] = [Data(value, address + i) for i, value in enumerate(values)]
+
+    def enable_memory_hash(self):
+        """Включение хэша памяти данных (`memory_hash`): он вычисляется по текущему содержимому памяти и далее
+        обновляется при записях"""
+
+        if self.memory_hash is None:
+            self.memory_hash = memory_cells_hash(0, [element.value for element in self.data_memory])
+
+    def _check_block_range(self, address: int, size: int):
+        """Проверка области памяти блочной операции: она должна помещаться в память и не затрагивать ввод-вывод"""
+
+        assert 0 <= address, "out of memory: {}".format(address)
+        assert address + size <= self.data_memory_size, "out of memory: {}".format(address + size - 1)
+
+        if any(address <= io_address < address + size for io_address in IO_ADDRESSES):
+            raise BlockAccessToIoAddressError()
 
     def signal_data_memory_load(self) -> int:
         """Чтение значение из памяти.
 
         Адрес должен быть предварительно задан в `data_address`
 
-        В случае если адрес установлен на устройство ввода, выполняется чтение значения из буфера ввода
+        В случае если адрес установлен на устройство ввода, выполняется чтение самого старого значения из буфера ввода,
+        a в случае регистра состояния устройства ввода -- чтение количества значений в буфере. Регистры контроллера
+        DMA возвращают адрес буфера и признак незавершённой передачи, a счётчики производительности -- значения,
+        полученные от блока управления через `performance_counters`
         """
 
         if self.data_address == OUTPUT_ADDRESS:
             raise ReadingFromOutputAddressError()
         if self.data_address == INPUT_ADDRESS:
-            if len(self.input_buffer) == 0:
-                raise EmptyInputBufferError()
-            data_out = self.input_buffer.pop()
-            logging.debug('input: "%s" | %s', int_to_char(data_out), data_out)
-
+            data_out = self._read_input()
+        elif self.data_address == INPUT_STATUS_ADDRESS:
+            data_out = len(self.input_buffer)
+        elif self.data_address == DMA_BUFFER_ADDRESS:
+            data_out = self.dma_buffer_address
+        elif self.data_address == DMA_CONTROL_ADDRESS:
+            data_out = int(self.dma_command is not None)
+        elif self.data_address in PERFORMANCE_COUNTER_ADDRESSES:
+            data_out = self.performance_counters(self.data_address)
         else:
             data_out = self.data_memory[self.data_address].value
         return data_out
 
+    def _read_input(self) -> int:
+        """Чтение самого старого значения из буфера ввода"""
+
+        if len(self.input_buffer) == 0:
+            raise EmptyInputBufferError()
+        data_out = self.input_buffer.popleft()
+        logging.debug('input: "%s" | %s', int_to_char(data_out), data_out)
+        return data_out
+
     def signal_perform_alu_operation_reg_reg(self, rs1: Register, rs2: Register, opcode: Opcode):
         """Выполнение операции АЛУ с операндами из регистров"""
 
@@ -169,6 +435,29 @@ class DataPath:
 
         return self._perform_alu_operation(pc, imm, opcode)
 
+    def signal_perform_alu_operation_pair(self, rs1: Register, rs2: Register, opcode: Opcode) -> int:
+        """Выполнение операции АЛУ двойной точности c операндами из пар регистров `rs1` и `rs2`
+
+        Пара `ZERO` читается как ноль
+        """
+
+        return self._perform_pair_alu_operation(self._read_pair(rs1), self._read_pair(rs2), opcode)
+
+    def signal_write_to_pair(self, rd: Register, value: int):
+        """Запись значения двойной точности в пару регистров `rd`"""
+
+        high, low = register_pair(rd)
+        self.signal_write_to_reg(high, binary_to_signed_int(value >> WORD_SIZE, WORD_SIZE))
+        self.signal_write_to_reg(low, binary_to_signed_int(value, WORD_SIZE))
+
+    def _read_pair(self, rs: Register) -> int:
+        """Значение двойной точности из пары регистров `rs`"""
+
+        if rs is Register.ZERO:
+            return 0
+        high, low = register_pair(rs)
+        return (self.registers_file[high] << WORD_SIZE) | (self.registers_file[low] & ((1 << WORD_SIZE) - 1))
+
     def signal_write_to_reg(self, rd: Register, value: int):
         """Метод для записи значения в регистр
 
@@ -200,3 +489,24 @@ class DataPath:
             self.overflow_flag = False
 
         return result_val
+
+    def _perform_pair_alu_operation(self, op1: int, op2: int, opcode: Opcode) -> int:
+        """Вспомогательный внутренний метод для выполнения операции АЛУ двойной точности
+
+        Выполняет установку флагов. При переполнении результат усекается до двойного машинного слова
+        """
+
+        assert opcode in PAIR_ALU_OPCODE_OPERATORS, "unknown pair alu opcode: {}".format(opcode)
+
+        result_val = PAIR_ALU_OPCODE_OPERATORS[opcode](op1, op2)
+
+        self.zero_flag = result_val == 0
+        self.negative_flag = result_val < 0
+
+        if not MIN_EXTENDED_NUMBER <= result_val <= MAX_EXTENDED_NUMBER:
+            self.overflow_flag = True
+            result_val = binary_to_signed_int(result_val, WORD_SIZE * 2)
+        else:
+            self.overflow_flag = False
+
+        return result_val
@@ -21,6 +21,56 @@ class ReadingFromOutputAddressError(SimulationError):
         super().__init__("Reading from output address is forbidden!")
 
 
+class BlockAccessToIoAddressError(SimulationError):
+    """Исключение возникающее при блочной операции над памятью, затрагивающей адреса устройств ввода-вывода"""
+
+    def __init__(self):
+        super().__init__("Block memory operations on I/O addresses are forbidden!")
+
+
+class NonTerminatingProgramError(SimulationError):
+    """Абстрактный класс исключение при обнаружении программы, которая не завершится"""
+
+    pass
+
+
+class NoInputEventsError(NonTerminatingProgramError):
+    """Исключение возникающее при ожидании прерывания (`wfi`), когда событий ввода больше не будет"""
+
+    def __init__(self):
+        super().__init__("Waiting for interrupt, but there are no more input events!")
+
+
+class RepeatedMachineStateError(NonTerminatingProgramError):
+    """Исключение возникающее при точном повторении состояния машины после последнего события ввода"""
+
+    def __init__(self, tick: int, repeated_tick: int):
+        super().__init__(
+            "Non-terminating program: state on tick {} repeats state on tick {}!".format(tick, repeated_tick)
+        )
+
+
+class WritingToPerformanceCounterError(SimulationError):
+    """Исключение возникающее при записи по адресу счётчика производительности"""
+
+    def __init__(self):
+        super().__init__("Writing to performance counter address is forbidden!")
+
+
+class UnknownDmaCommandError(SimulationError):
+    """Исключение возникающее при записи неизвестной команды в управляющий регистр DMA"""
+
+    def __init__(self, command: int):
+        super().__init__("Unknown DMA command: {}!".format(command))
+
+
+class DmaBusyError(SimulationError):
+    """Исключение возникающее при запуске передачи DMA, пока предыдущая передача не завершена"""
+
+    def __init__(self):
+        super().__init__("DMA transfer is already in progress!")
+
+
 class WritingToInputAddressError(SimulationError):
     """Исключение возникающее при записи по адреса входного устройства"""
 
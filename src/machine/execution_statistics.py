@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from src.isa.memory_config import DATA_AREA_START_ADDR
+from src.isa.opcode_ import Opcode
+from src.isa.register import Register
+from src.machine.control_unit import (
+    BLOCK_OPERATION_TICKS_PER_WORD,
+    BRANCH_CONDITIONS,
+    INSTRUCTION_TICKS,
+    ControlUnit,
+    ProcessorState,
+)
+from src.machine.data_path import IO_ADDRESSES
+from src.machine.histogram import Histogram
+
+LOAD_OPCODES = (Opcode.LW, Opcode.LWPI, Opcode.LWX)
+"Инструкции чтения слова из памяти данных"
+
+STORE_OPCODES = (Opcode.SW, Opcode.SWPD, Opcode.SWX)
+"Инструкции записи слова в память данных"
+
+BRANCH_OPCODES = tuple(BRANCH_CONDITIONS)
+"Инструкции условного перехода"
+
+MEMORY_REGIONS = ("io", "data", "stack")
+"Области памяти данных: адреса устройств ввода-вывода, секция данных программы и стек"
+
+
+class ExecutionStatistics:
+    """Статистика выполнения программы
+
+    Учитываются только выполненные (завершённые) инструкции. Такты простоя в ожидании прерывания, такты входа
+    в прерывание и итерации циклов ожидания, пропущенные `SpinWaitDetector`, в статистику инструкций не входят.
+    Статистика прерываний ведётся блоком управления по модельному времени
+    """
+
+    instructions = None
+    "Количество выполненных инструкций по кодам операций"
+
+    instruction_ticks = None
+    "Количество тактов выполнения инструкций по кодам операций"
+
+    loads = None
+    "Количество прочитанных процессором слов памяти данных по областям (см. `MEMORY_REGIONS`)"
+
+    stores = None
+    "Количество записанных процессором слов памяти данных по областям (см. `MEMORY_REGIONS`)"
+
+    branches_taken = None
+    "Количество условных переходов, которые были выполнены"
+
+    branches_not_taken = None
+    "Количество условных переходов, которые не были выполнены"
+
+    interrupts = None
+    "Количество обслуженных прерываний (входов в обработчик, см. `ControlUnit.interrupts_taken`)"
+
+    max_stack_depth = None
+    "Наибольшая глубина стека в словах"
+
+    interrupt_latency = None
+    "Гистограмма задержек от события ввода до начала выполнения обработчика прерываний (см. `ControlUnit`)"
+
+    handler_occupancy = None
+    "Гистограмма длительностей обработчика прерываний от перехода в `INT_BODY` до `rint` (см. `ControlUnit`)"
+
+    deferred_input_events = None
+    "Количество событий ввода, пришедших при запрещённых прерываниях или во время обработки прерывания"
+
+    unserviced_input_events = None
+    "Количество событий ввода, после которых до конца симуляции не было входа в обработчик прерываний"
+
+    overwritten_inputs = None
+    "Вытесненные из переполненного буфера ввода до чтения значения: список пар (такт, значение)"
+
+    def __init__(self):
+        self.instructions = Counter()
+        self.instruction_ticks = Counter()
+        self.loads = Counter(dict.fromkeys(MEMORY_REGIONS, 0))
+        self.stores = Counter(dict.fromkeys(MEMORY_REGIONS, 0))
+        self.branches_taken = 0
+        self.branches_not_taken = 0
+        self.interrupts = 0
+        self.max_stack_depth = 0
+        self.interrupt_latency = Histogram()
+        self.handler_occupancy = Histogram()
+        self.deferred_input_events = 0
+        self.unserviced_input_events = 0
+        self.overwritten_inputs = []
+
+    def total_instructions(self) -> int:
+        """Общее количество выполненных инструкций"""
+
+        return sum(self.instructions.values())
+
+    def cpi(self) -> float:
+        """Среднее число тактов на инструкцию (CPI)"""
+
+        total = self.total_instructions()
+        return sum(self.instruction_ticks.values()) / total if total > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Представление статистики для записи в JSON"""
+
+        return {
+            "instructions": self.total_instructions(),
+            "cpi": self.cpi(),
+            "instructions_by_opcode": {opcode.name.lower(): count for opcode, count in self.instructions.items()},
+            "ticks_by_opcode": {opcode.name.lower(): ticks for opcode, ticks in self.instruction_ticks.items()},
+            "loads": dict(self.loads),
+            "stores": dict(self.stores),
+            "branches_taken": self.branches_taken,
+            "branches_not_taken": self.branches_not_taken,
+            "interrupts": self.interrupts,
+            "max_stack_depth": self.max_stack_depth,
+            "interrupt_latency": self.interrupt_latency.to_dict(),
+            "handler_occupancy": self.handler_occupancy.to_dict(),
+            "deferred_input_events": self.deferred_input_events,
+            "unserviced_input_events": self.unserviced_input_events,
+            "overwritten_inputs": [{"tick": tick, "value": value} for tick, value in self.overwritten_inputs],
+        }
+
+
+class StatisticsCollector:
+    """Сбор статистики выполнения (`ExecutionStatistics`) после каждого шага моделирования
+
+    Инструкция считается выполненной, когда процессор вернулся на границу инструкций в состоянии `NORMAL` или
+    `INT_BODY`. Адрес обращения к памяти берётся из регистра адреса данных, a длина блочных операций -- из регистра
+    длины (они его не меняют), поэтому результат не зависит от режима моделирования (потактовый или быстрый).
+
+    Bo время симуляции выполненные инструкции считаются по адресам, a по кодам операций статистика собирается
+    в конце (см. `statistics`): так на каждом шаге не нужно хэшировать коды операций
+    """
+
+    control_unit = None
+    "Блок управления, за которым ведётся наблюдение"
+
+    data_area_end = None
+    "Адрес, следующий за секцией данных программы. Обращения к адресам от него и выше считаются обращениями к стеку"
+
+    executions = None
+    "Количество выполнений инструкции по каждому адресу памяти инструкций"
+
+    block_words = None
+    "Суммарная длина блочных операций по адресам инструкций"
+
+    loads = None
+    "Количество прочитанных процессором слов памяти данных по областям"
+
+    stores = None
+    "Количество записанных процессором слов памяти данных по областям"
+
+    branches_taken = None
+    "Количество выполненных условных переходов"
+
+    branches_not_taken = None
+    "Количество невыполненных условных переходов"
+
+    min_stack_pointer = None
+    "Наименьшее значение указателя стека на границах инструкций"
+
+    last_pc = None
+    "Счётчик команд после предыдущего шага"
+
+    last_state = None
+    "Состояние процессора после предыдущего шага"
+
+    was_waiting = None
+    "Ожидал ли процессор прерывания после предыдущего шага"
+
+    def __init__(self, control_unit: ControlUnit, data_area_end: int = DATA_AREA_START_ADDR):
+        self.control_unit = control_unit
+        self.data_area_end = data_area_end
+        self.executions = [0] * len(control_unit.instruction_memory)
+        self.block_words = Counter()
+        self.loads = dict.fromkeys(MEMORY_REGIONS, 0)
+        self.stores = dict.fromkeys(MEMORY_REGIONS, 0)
+        self.branches_taken = 0
+        self.branches_not_taken = 0
+        self.min_stack_pointer = control_unit.data_path.registers_file[Register.SP]
+        self.last_pc = control_unit.program_counter
+        self.last_state = control_unit.states[control_unit.state]
+        self.was_waiting = control_unit.is_waiting_for_interrupt
+
+    def observe(self):
+        """Учёт очередного шага моделирования"""
+
+        control_unit = self.control_unit
+        pc, state = control_unit.program_counter, control_unit.states[control_unit.state]
+        last_pc, last_state, was_waiting = self.last_pc, self.last_state, self.was_waiting
+        self.last_pc, self.last_state = pc, state
+        self.was_waiting = control_unit.is_waiting_for_interrupt
+
+        if control_unit.step != 0:
+            return
+        is_interrupt_entry = last_state is ProcessorState.NORMAL and state is ProcessorState.INT_ENTER
+        if not is_interrupt_entry and last_state is not ProcessorState.INT_ENTER and not was_waiting:
+            self.retire(last_pc)
+
+    def retire(self, pc: int):
+        """Учёт выполненной инструкции по адресу `pc`"""
+
+        self.executions[pc] += 1
+        instr = self.control_unit.instruction_memory[pc]
+        opcode = instr.opcode
+        data_path = self.control_unit.data_path
+        registers = data_path.registers_file
+
+        if opcode in LOAD_OPCODES:
+            self.loads[self.region(data_path.data_address)] += 1
+        elif opcode in STORE_OPCODES:
+            self.stores[self.region(data_path.data_address)] += 1
+        elif opcode is Opcode.MOVE:
+            length = max(registers[instr.rd], 0)
+            self.block_words[pc] += length
+            self.loads[self.region(registers[instr.rs1])] += length
+            self.stores[self.region(registers[instr.rs2])] += length
+        elif opcode is Opcode.FILL:
+            length = max(registers[instr.rd], 0)
+            self.block_words[pc] += length
+            self.stores[self.region(registers[instr.rs1])] += length
+        elif opcode in BRANCH_OPCODES:
+            if BRANCH_CONDITIONS[opcode](data_path):
+                self.branches_taken += 1
+            else:
+                self.branches_not_taken += 1
+
+        self.min_stack_pointer = min(self.min_stack_pointer, registers[Register.SP])
+
+    def region(self, address: int) -> str:
+        """Область памяти данных, к которой относится адрес `address`"""
+
+        if address in IO_ADDRESSES:
+            return "io"
+        if address < self.data_area_end:
+            return "data"
+        return "stack"
+
+    def statistics(self) -> ExecutionStatistics:
+        """Статистика выполнения по собранным данным"""
+
+        control_unit = self.control_unit
+        statistics = ExecutionStatistics()
+        for pc, executions in enumerate(self.executions):
+            if executions == 0:
+                continue
+            opcode = control_unit.instruction_memory[pc].opcode
+            statistics.instructions[opcode] += executions
+            if opcode in BLOCK_OPERATION_TICKS_PER_WORD:
+                ticks = executions + self.block_words[pc] * BLOCK_OPERATION_TICKS_PER_WORD[opcode]
+            else:
+                ticks = executions * INSTRUCTION_TICKS.get(opcode, 1)
+            statistics.instruction_ticks[opcode] += ticks
+        statistics.loads.update(self.loads)
+        statistics.stores.update(self.stores)
+        statistics.branches_taken = self.branches_taken
+        statistics.branches_not_taken = self.branches_not_taken
+        statistics.interrupts = control_unit.interrupts_taken
+        statistics.max_stack_depth = control_unit.data_path.data_memory_size - self.min_stack_pointer
+        statistics.interrupt_latency = control_unit.interrupt_latency
+        statistics.handler_occupancy = control_unit.handler_occupancy
+        statistics.deferred_input_events = control_unit.deferred_input_events
+        statistics.unserviced_input_events = len(control_unit.pending_input_ticks)
+        statistics.overwritten_inputs = list(control_unit.overwritten_inputs)
+        return statistics
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections import Counter
+
+
+class Histogram:
+    """Гистограмма целочисленных величин (например, задержек в тактах) c вычислением процентилей"""
+
+    counts = None
+    "Количество наблюдений каждого значения"
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def add(self, value: int):
+        """Добавление наблюдения `value`"""
+
+        self.counts[value] += 1
+
+    def total(self) -> int:
+        """Общее количество наблюдений"""
+
+        return sum(self.counts.values())
+
+    def percentile(self, percent: float) -> int | None:
+        """Процентиль по методу ближайшего ранга: наименьшее значение, которое не меньше `percent`% наблюдений
+
+        Для пустой гистограммы возвращает `None`
+        """
+
+        total = self.total()
+        if total == 0:
+            return None
+        rank = max(-(-total * percent // 100), 1)
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return value
+        return None
+
+    def maximum(self) -> int | None:
+        """Наибольшее значение или `None` для пустой гистограммы"""
+
+        return max(self.counts, default=None)
+
+    def summary(self) -> str:
+        """Краткое описание для журнала"""
+
+        return "count {}, p50 {}, p99 {}, max {}".format(
+            self.total(), self.percentile(50), self.percentile(99), self.maximum()
+        )
+
+    def to_dict(self) -> dict:
+        """Представление гистограммы для записи в JSON"""
+
+        return {
+            "count": self.total(),
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.maximum(),
+            "histogram": {str(value): self.counts[value] for value in sorted(self.counts)},
+        }
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from src.machine.control_unit import ControlUnit
+from src.machine.exceptions.exceptions import NoInputEventsError, RepeatedMachineStateError
+
+
+class LoopDetector:
+    """Обнаружение бесконечных циклов по повторению состояния машины
+
+    Пока впереди есть события ввода, программа может завершиться в ответ на них, поэтому проверка начинается только
+    после последнего события. B режиме обратного давления события ввода -- это ещё не поданные значения из
+    `ControlUnit.input_stream`. При каждом переходе назад (счётчик команд на границе инструкций уменьшился)
+    запоминается ключ: адрес перехода, хэш памяти данных (`DataPath.memory_hash`, его ведение включает детектор) и состояние
+    процессора. При повторении ключа запоминается копия памяти, и если на следующем повторении память совпала c ней
+    поэлементно, то состояние машины повторилось в точности. Машина без ввода детерминирована, поэтому дальше она будет
+    проходить этот цикл бесконечно, и симуляция останавливается исключением `RepeatedMachineStateError`.
+
+    Ожидание прерывания (`wfi`) после последнего события ввода также бесконечно (`NoInputEventsError`)
+    """
+
+    control_unit = None
+    "Блок управления, за которым ведётся наблюдение"
+
+    last_pc = None
+    "Счётчик команд на предыдущей границе инструкций"
+
+    states = None
+    "Такт последнего появления ключа состояния: (адрес перехода, хэш памяти, состояние процессора) -> такт"
+
+    candidates = None
+    "Копии памяти данных для повторившихся ключей состояния. Нужны для точной проверки совпадения"
+
+    def __init__(self, control_unit: ControlUnit):
+        self.control_unit = control_unit
+        self.last_pc = None
+        self.states = {}
+        self.candidates = {}
+        control_unit.data_path.enable_memory_hash()
+
+    def observe(self):
+        """Проверка после очередного шага моделирования"""
+
+        control_unit = self.control_unit
+        if control_unit.step != 0:
+            return
+
+        pc, last_pc = control_unit.program_counter, self.last_pc
+        self.last_pc = pc
+        if control_unit.input_stream or control_unit.next_input_tick(control_unit.get_tick()) is not None:
+            return
+
+        if control_unit.is_waiting_for_interrupt and not control_unit.data_path.is_dma_progressing():
+            raise NoInputEventsError()
+        if last_pc is not None and pc < last_pc:
+            self.check_state(pc)
+
+    def check_state(self, pc: int):
+        """Сравнение состояния при переходе назад на адрес `pc` c ранее встречавшимися"""
+
+        control_unit = self.control_unit
+        data_path = control_unit.data_path
+        tick = control_unit.get_tick()
+        key = (pc, data_path.memory_hash, control_unit.machine_state())
+
+        if key not in self.states:
+            self.states[key] = tick
+            return
+
+        memory = [element.value for element in data_path.data_memory]
+        if self.candidates.get(key) != memory:
+            self.candidates[key] = memory
+            self.states[key] = tick
+            return
+
+        raise RepeatedMachineStateError(tick, self.states[key])
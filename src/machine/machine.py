@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+import json
 import logging
 import sys
+from functools import partial
 
-from src.constants import INSTRUCTION_MEMORY_SIZE, INTERRUPTS_HANDLER_ADDRESS
+from src.constants import INPUT_FIFO_DEPTH, INSTRUCTION_MEMORY_SIZE, INTERRUPTS_HANDLER_ADDRESS
 from src.isa.data import Data
 from src.isa.instructions.instruction import Instruction
+from src.isa.memory_config import DATA_AREA_START_ADDR
 from src.isa.util.data_translators import from_bytes_data, from_bytes_instructions
 from src.machine.control_unit import ControlUnit
 from src.machine.data_path import DataPath
-from src.machine.exceptions.exceptions import SimulationError
+from src.machine.exceptions.exceptions import NonTerminatingProgramError, SimulationError
+from src.machine.execution_statistics import ExecutionStatistics, StatisticsCollector
+from src.machine.loop_detector import LoopDetector
+from src.machine.simulation_result import SimulationResult, StopReason
+from src.machine.spin_wait_detector import SpinWaitDetector
 from src.machine.util import int_list_to_str
 
+MACHINE_OPTIONS = {
+    "--fast": "is_fast_mode",
+    "--skip-spin-wait": "is_spin_wait_skipping",
+    "--detect-loops": "is_loop_detecting",
+    "--backpressure": "is_backpressure",
+}
+"Флаги командной строки модели и соответствующие им параметры `main`"
+
+STATISTICS_OPTION = "--stats="
+"Параметр командной строки c именем файла, в который записывается результат симуляции в формате JSON"
+
+DATA_MEMORY_SIZE = 1000
+"Размер памяти данных модели, запускаемой через `main`"
+
+TICK_LIMIT = 20000
+"Лимит тактов симуляции, запускаемой через `main`"
+
 
 def simulation(
     instructions: list[Instruction],
@@ -19,7 +43,13 @@ def simulation(
     input_timetable: dict[int, int],
     data_memory_size: int,
     limit: int,
-) -> str:
+    is_fast_mode: bool = False,
+    is_spin_wait_skipping: bool = False,
+    is_loop_detecting: bool = False,
+    input_fifo_depth: int = INPUT_FIFO_DEPTH,
+    input_stream: list[int] | None = None,
+    is_collecting_statistics: bool = False,
+) -> SimulationResult:
     """Подготовка модели и запуск симуляции процессора.
 
     Выполняет:
@@ -31,46 +61,100 @@ def simulation(
     - контроль количества тактов
 
     - логирование
+
+    B быстром режиме (`is_fast_mode`) модель выполняет инструкцию за шаг, a не такт (см.
+    `ControlUnit.process_next_instruction`). Вывод и число тактов совпадают c потактовым режимом,
+    но журнал состояний ведётся по инструкциям
+
+    C флагом `is_spin_wait_skipping` циклы ожидания без побочных эффектов пропускаются до ближайшего события ввода
+    (см. `SpinWaitDetector`). Вывод и число тактов при этом также не меняются
+
+    C флагом `is_loop_detecting` симуляция останавливается, как только после последнего события ввода состояние
+    машины в точности повторилось (см. `LoopDetector`). Вывод не меняется, a вместо исчерпания лимита тактов
+    в журнал выводится предупреждение `NonTerminatingProgramError`
+
+    Глубина буфера ввода задаётся параметром `input_fifo_depth`
+
+    Если задан `input_stream`, значения из него подаются в режиме обратного давления: очередное -- как только
+    программа готова его принять (см. `ControlUnit.signal_feed_input`). Так измеряется наименьшее число тактов работы
+    программы на данном вводе
+
+    C флагом `is_collecting_statistics` во время симуляции собирается статистика выполнения (см.
+    `StatisticsCollector`), она возвращается вместе c выводом программы в `SimulationResult`. Сбор требует
+    наблюдения за каждым шагом моделирования, поэтому без флага он не ведётся
     """
 
     assert len(data) <= data_memory_size, "data memory overflow"
 
-    data_path = DataPath(data_memory_size, data)
+    data_path = DataPath(data_memory_size, data, input_fifo_depth)
     control_unit = ControlUnit(
-        instructions, INSTRUCTION_MEMORY_SIZE, data_path, input_timetable, INTERRUPTS_HANDLER_ADDRESS
+        instructions, INSTRUCTION_MEMORY_SIZE, data_path, input_timetable, INTERRUPTS_HANDLER_ADDRESS, input_stream
+    )
+    data_area_end = max((element.address + 1 for element in data), default=DATA_AREA_START_ADDR)
+    statistics_collector = StatisticsCollector(control_unit, data_area_end) if is_collecting_statistics else None
+    spin_wait_detector = SpinWaitDetector(control_unit, limit) if is_spin_wait_skipping else None
+    loop_detector = LoopDetector(control_unit) if is_loop_detecting else None
+    observers = [
+        observer for observer in (statistics_collector, spin_wait_detector, loop_detector) if observer is not None
+    ]
+    process_next = partial(
+        control_unit.process_next_instruction if is_fast_mode else control_unit.process_next_tick, limit
     )
 
     logging.debug("%s", control_unit)
+    stop_reason = StopReason.LIMIT
     try:
         while control_unit.get_tick() < limit:
-            control_unit.process_next_tick()
+            process_next()
+            for observer in observers:
+                observer.observe()
             logging.debug("%s", control_unit)
     except SimulationError as e:
         logging.warning(e)
+        stop_reason = StopReason.NON_TERMINATING if isinstance(e, NonTerminatingProgramError) else StopReason.ERROR
     except StopIteration:
-        pass
+        stop_reason = StopReason.HALT
 
-    if control_unit.get_tick() >= limit:
+    statistics = None if statistics_collector is None else statistics_collector.statistics()
+    skipped_ticks = 0 if spin_wait_detector is None else spin_wait_detector.skipped_ticks
+    if stop_reason is StopReason.LIMIT:
         logging.warning("Limit exceeded!")
-    logging.info('output_buffer: "%s" | %s', int_list_to_str(data_path.output_buffer), data_path.output_buffer)
-
-    return "output_buffer_str:\n{}\noutput_buffer_num:\n{}".format(
-        int_list_to_str(data_path.output_buffer, True), data_path.output_buffer
+    log_summary(control_unit, spin_wait_detector, statistics)
+
+    return SimulationResult(
+        data_path.output_buffer,
+        control_unit.get_tick(),
+        control_unit.idle_ticks,
+        skipped_ticks,
+        stop_reason,
+        statistics,
     )
 
 
-def main(instructions_file: str, data_file: str, input_timetable_file: str):
-    """Функция запуска модели процессора. Параметры -- имена файлов с машинным
-    кодом и расписанием прерываний с входными данными для симуляции.
-    """
+def log_summary(
+    control_unit: ControlUnit, spin_wait_detector: SpinWaitDetector | None, statistics: ExecutionStatistics | None
+):
+    """Вывод в журнал итогов симуляции"""
+
+    data_path = control_unit.data_path
+    logging.info("idle ticks: %s", control_unit.idle_ticks)
+    logging.info("input buffer overflows: %s", data_path.input_overflows)
+    if spin_wait_detector is not None:
+        logging.info("spin-wait ticks skipped: %s", spin_wait_detector.skipped_ticks)
+    if statistics is not None:
+        logging.info("instructions: %s, CPI: %.2f", statistics.total_instructions(), statistics.cpi())
+    logging.info("interrupt latency: %s", control_unit.interrupt_latency.summary())
+    logging.info("interrupt handler occupancy: %s", control_unit.handler_occupancy.summary())
+    logging.info(
+        "deferred input events: %s, unserviced input events: %s",
+        control_unit.deferred_input_events,
+        len(control_unit.pending_input_ticks),
+    )
+    logging.info('output_buffer: "%s" | %s', int_list_to_str(data_path.output_buffer), data_path.output_buffer)
 
-    with open(instructions_file, "rb") as file:
-        binary_instructions = file.read()
-    instructions = from_bytes_instructions(binary_instructions)
 
-    with open(data_file, "rb") as file:
-        binary_data = file.read()
-    data = from_bytes_data(binary_data)
+def read_input_timetable(input_timetable_file: str) -> dict[int, int]:
+    """Чтение расписания ввода: в каждой строке такт и значение (число или символ)"""
 
     input_timetable = {}
     with open(input_timetable_file, encoding="utf-8") as f:
@@ -81,20 +165,85 @@ def main(instructions_file: str, data_file: str, input_timetable_file: str):
             except ValueError:
                 value = ord(value)
             input_timetable[int(num)] = value
+    return input_timetable
 
-    output = simulation(
+
+def to_input_stream(input_timetable: dict[int, int]) -> list[int]:
+    """Значения расписания ввода в порядке тактов для режима обратного давления"""
+
+    return [input_timetable[tick] for tick in sorted(input_timetable)]
+
+
+def main(
+    instructions_file: str,
+    data_file: str,
+    input_timetable_file: str,
+    is_fast_mode: bool = False,
+    is_spin_wait_skipping: bool = False,
+    is_loop_detecting: bool = False,
+    is_backpressure: bool = False,
+    statistics_file: str | None = None,
+):
+    """Функция запуска модели процессора. Параметры -- имена файлов с машинным
+    кодом и расписанием прерываний с входными данными для симуляции, а также флаги быстрого режима,
+    пропуска циклов ожидания, обнаружения бесконечных циклов и режима обратного давления.
+
+    Если задан `statistics_file`, в него записывается результат симуляции co статистикой выполнения в формате JSON
+
+    B режиме обратного давления такты из расписания не используются: значения подаются в порядке расписания,
+    как только программа готова их принять
+    """
+
+    with open(instructions_file, "rb") as file:
+        binary_instructions = file.read()
+    instructions = from_bytes_instructions(binary_instructions)
+
+    with open(data_file, "rb") as file:
+        binary_data = file.read()
+    data = from_bytes_data(binary_data)
+
+    input_timetable = read_input_timetable(input_timetable_file)
+
+    input_stream = None
+    if is_backpressure:
+        input_stream = to_input_stream(input_timetable)
+        input_timetable = {}
+
+    result = simulation(
         instructions,
         data,
         input_timetable,
-        data_memory_size=1000,
-        limit=20000,
+        data_memory_size=DATA_MEMORY_SIZE,
+        limit=TICK_LIMIT,
+        is_fast_mode=is_fast_mode,
+        is_spin_wait_skipping=is_spin_wait_skipping,
+        is_loop_detecting=is_loop_detecting,
+        input_stream=input_stream,
+        is_collecting_statistics=statistics_file is not None,
     )
 
-    print("".join(output))
+    print(result.output())
+
+    if statistics_file is not None:
+        with open(statistics_file, "w", encoding="utf-8") as f:
+            f.write(json.dumps(result.to_dict(), indent=4))
 
 
 if __name__ == "__main__":
     logging.getLogger().setLevel(logging.DEBUG)
-    assert len(sys.argv) == 4, "Wrong arguments: machine.py <instructions_bin_file> <data_bin_file> <input_file>"
-    _, instructions_bin_file, data_bin_file, input_file = sys.argv
-    main(instructions_bin_file, data_bin_file, input_file)
+    usage = (
+        "Wrong arguments: machine.py <instructions_bin_file> <data_bin_file> <input_file> "
+        "[--fast] [--skip-spin-wait] [--detect-loops] [--backpressure] [--stats=<json_file>]"
+    )
+    assert len(sys.argv) >= 4, usage
+    _, instructions_bin_file, data_bin_file, input_file, *options = sys.argv
+    statistics_files = [option[len(STATISTICS_OPTION) :] for option in options if option.startswith(STATISTICS_OPTION)]
+    flags = [option for option in options if not option.startswith(STATISTICS_OPTION)]
+    assert set(flags) <= set(MACHINE_OPTIONS), usage
+    main(
+        instructions_bin_file,
+        data_bin_file,
+        input_file,
+        statistics_file=statistics_files[-1] if statistics_files else None,
+        **{MACHINE_OPTIONS[option]: True for option in flags},
+    )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from enum import Enum
+
+from src.machine.execution_statistics import ExecutionStatistics
+from src.machine.util import int_list_to_str
+
+
+class StopReason(Enum):
+    """Причина остановки симуляции"""
+
+    HALT = "halt"
+    "Выполнена инструкция `halt`"
+
+    LIMIT = "limit"
+    "Исчерпан лимит тактов"
+
+    NON_TERMINATING = "non_terminating"
+    "Обнаружено, что программа не завершится (см. `NonTerminatingProgramError`)"
+
+    ERROR = "error"
+    "Ошибка времени выполнения (см. `SimulationError`)"
+
+
+class SimulationResult:
+    """Результат симуляции: вывод программы, модельное время, причина остановки и статистика выполнения"""
+
+    output_buffer = None
+    "Значения, выведенные программой"
+
+    ticks = None
+    "Количество тактов моделирования"
+
+    idle_ticks = None
+    "Количество тактов простоя в ожидании прерывания"
+
+    skipped_ticks = None
+    "Количество тактов, пропущенных при перемотке циклов ожидания"
+
+    stop_reason = None
+    "Причина остановки (`StopReason`)"
+
+    statistics = None
+    "Статистика выполнения (`ExecutionStatistics`). `None`, если статистика не собиралась"
+
+    def __init__(
+        self,
+        output_buffer: list[int],
+        ticks: int,
+        idle_ticks: int,
+        skipped_ticks: int,
+        stop_reason: StopReason,
+        statistics: ExecutionStatistics | None,
+    ):
+        self.output_buffer = output_buffer
+        self.ticks = ticks
+        self.idle_ticks = idle_ticks
+        self.skipped_ticks = skipped_ticks
+        self.stop_reason = stop_reason
+        self.statistics = statistics
+
+    def output(self) -> str:
+        """Вывод программы в текстовом и числовом виде"""
+
+        return "output_buffer_str:\n{}\noutput_buffer_num:\n{}".format(
+            int_list_to_str(self.output_buffer, True), self.output_buffer
+        )
+
+    def to_dict(self) -> dict:
+        """Представление результата для записи в JSON"""
+
+        result = {
+            "stop_reason": self.stop_reason.value,
+            "ticks": self.ticks,
+            "idle_ticks": self.idle_ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "output": self.output_buffer,
+        }
+        if self.statistics is not None:
+            result["statistics"] = self.statistics.to_dict()
+        return result
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+
+from src.machine.control_unit import ControlUnit
+
+
+class SpinWaitDetector:
+    """Обнаружение циклов ожидания (например, опроса флага в `read_value`) и перемотка модельного времени
+
+    При каждом переходе назад (счётчик команд на границе инструкций уменьшился) запоминается снимок состояния
+    процессора для адреса перехода. Если при следующем переходе на тот же адрес состояние и хэш памяти данных
+    совпали со снимком, a событий ввода за это время не было, то снимок дополняется копией памяти. Если и на
+    следующей итерации состояние и память (уже поэлементно) совпали, то процессор находится в цикле без побочных
+    эффектов c периодом, равным числу прошедших тактов.
+
+    Такой цикл до очередного события ввода повторяется без изменений, поэтому целое число его итераций
+    пропускается сразу. Оставшиеся до события такты выполняются как обычно, так что результат и число тактов
+    совпадают c моделированием без перемотки
+    """
+
+    control_unit = None
+    "Блок управления, за которым ведётся наблюдение"
+
+    tick_limit = None
+    "Лимит тактов моделирования. Время не перематывается дальше него"
+
+    last_pc = None
+    "Счётчик команд на предыдущей границе инструкций"
+
+    snapshots = None
+    """Снимки состояния при переходах назад: адрес перехода -> (такт, количество выполненных инструкций, хэш памяти,
+    состояние, копия памяти или `None`)"""
+
+    skipped_ticks = None
+    "Количество пропущенных тактов. Инициализируется нулём"
+
+    def __init__(self, control_unit: ControlUnit, tick_limit: int):
+        self.control_unit = control_unit
+        self.tick_limit = tick_limit
+        self.last_pc = None
+        self.snapshots = {}
+        self.skipped_ticks = 0
+        control_unit.data_path.enable_memory_hash()
+
+    def observe(self):
+        """Проверка после очередного шага моделирования. При обнаружении цикла ожидания время перематывается"""
+
+        control_unit = self.control_unit
+        if control_unit.step != 0:
+            return
+
+        pc, last_pc = control_unit.program_counter, self.last_pc
+        self.last_pc = pc
+        if last_pc is not None and pc < last_pc:
+            self.check_loop(pc)
+
+    def check_loop(self, pc: int):
+        """Сравнение состояния при переходе назад на адрес `pc` co снимком, сделанным при предыдущем переходе туда же"""
+
+        control_unit = self.control_unit
+        data_path = control_unit.data_path
+        tick, instructions = control_unit.get_tick(), control_unit.instructions_retired
+        state = control_unit.machine_state()
+        snapshot = self.snapshots.get(pc)
+        self.snapshots[pc] = (tick, instructions, data_path.memory_hash, state, None)
+
+        if snapshot is None:
+            return
+        snapshot_tick, snapshot_instructions, snapshot_memory_hash, snapshot_state, snapshot_memory = snapshot
+        if snapshot_memory_hash != data_path.memory_hash or snapshot_state != state:
+            return
+        next_input_tick = control_unit.next_input_tick(snapshot_tick)
+        if next_input_tick is not None and next_input_tick < tick:
+            return
+
+        memory = [element.value for element in data_path.data_memory]
+        self.snapshots[pc] = (tick, instructions, data_path.memory_hash, state, memory)
+        if snapshot_memory != memory:
+            return
+
+        period = tick - snapshot_tick
+        end = self.tick_limit if next_input_tick is None else min(next_input_tick, self.tick_limit)
+        iterations = (end - tick) // period
+        skip = iterations * period
+        if skip > 0:
+            logging.debug("Spin-wait loop at %s (period %s): skipping %s ticks", pc, period, skip)
+            control_unit.skip_ticks(skip, iterations * (instructions - snapshot_instructions))
+            self.skipped_ticks += skip
+            self.snapshots[pc] = (
+                tick + skip,
+                control_unit.instructions_retired,
+                data_path.memory_hash,
+                state,
+                memory,
+            )
@@ -145,3 +145,13 @@ class AstWhileStatement(Ast):
 
     def __init__(self, while_block: AstBlock):
         self.while_block = while_block
+
+
+class AstCountedLoopStatement(Ast):
+    """Объявление цикла co счётчиком. Количество повторений снимается co стека перед началом цикла"""
+
+    loop_block = None
+    "Блок тела цикла"
+
+    def __init__(self, loop_block: AstBlock):
+        self.loop_block = loop_block
@@ -1,6 +1,7 @@
 from src.translator.ast_.ast_ import (
     Ast,
     AstBlock,
+    AstCountedLoopStatement,
     AstDVariableDeclaration,
     AstExtendedNumber,
     AstIfStatement,
@@ -43,6 +44,8 @@ class AstNodeVisitor:
             return self.visit_if_statement(node)
         if isinstance(node, AstWhileStatement):
             return self.visit_while_statement(node)
+        if isinstance(node, AstCountedLoopStatement):
+            return self.visit_counted_loop_statement(node)
         if isinstance(node, AstVariableDeclaration):
             return self.visit_variable_declaration(node)
         if isinstance(node, AstDVariableDeclaration):
@@ -80,6 +83,9 @@ class AstNodeVisitor:
     def visit_while_statement(self, node: AstWhileStatement):
         pass
 
+    def visit_counted_loop_statement(self, node: AstCountedLoopStatement):
+        pass
+
     def visit_variable_declaration(self, node: AstVariableDeclaration):
         pass
 
@@ -1,6 +1,7 @@
 from src.translator.ast_.ast_ import (
     Ast,
     AstBlock,
+    AstCountedLoopStatement,
     AstDVariableDeclaration,
     AstExtendedNumber,
     AstIfStatement,
@@ -75,6 +76,13 @@ class AstPrinter(AstNodeVisitor):
         self.tab -= 1
         self._print("END WHILE STATEMENT")
 
+    def visit_counted_loop_statement(self, node: AstCountedLoopStatement):
+        self._print("COUNTED LOOP STATEMENT")
+        self.tab += 1
+        self.visit(node.loop_block)
+        self.tab -= 1
+        self._print("END COUNTED LOOP STATEMENT")
+
     def visit_variable_declaration(self, node: AstVariableDeclaration):
         self._print(f"VARIABLE: {node.name}")
 
@@ -0,0 +1,49 @@
+from collections import Counter
+
+from src.translator.ast_.ast_ import (
+    Ast,
+    AstBlock,
+    AstCountedLoopStatement,
+    AstIfStatement,
+    AstInterrupt,
+    AstSymbol,
+    AstWhileStatement,
+)
+from src.translator.ast_.ast_node_visitor import AstNodeVisitor
+
+
+class SymbolReferenceCounter(AstNodeVisitor):
+    """Подсчитывает количество обращений к каждому символу в AST-дереве
+
+    Учитываются обращения как из основной программы, так и из обработчика прерываний.
+    Объявления символов обращениями не считаются
+    """
+
+    references = None
+    "Количество обращений к каждому символу"
+
+    def count(self, tree: Ast) -> Counter:
+        self.references = Counter()
+        self.visit(tree)
+        return self.references
+
+    def visit_block(self, node: AstBlock):
+        for block in node.children:
+            self.visit(block)
+
+    def visit_interrupt(self, node: AstInterrupt):
+        self.visit_block(node.block)
+
+    def visit_symbol(self, node: AstSymbol):
+        self.references[node.name] += 1
+
+    def visit_if_statement(self, node: AstIfStatement):
+        self.visit(node.if_block)
+        if node.else_block is not None:
+            self.visit(node.else_block)
+
+    def visit_while_statement(self, node: AstWhileStatement):
+        self.visit(node.while_block)
+
+    def visit_counted_loop_statement(self, node: AstCountedLoopStatement):
+        self.visit(node.loop_block)
@@ -0,0 +1,244 @@
+"""Пакетный транслятор: трансляция множества программ в пуле процессов"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.isa.data import Data
+from src.isa.instructions.instruction import Instruction
+from src.translator.cache.compilation_cache import CompilationCache, ParsedHeader
+from src.translator.code_generator.code_generator import CodeGenerator
+from src.translator.lexer.lexer import Lexer
+from src.translator.parser.parser import Parser
+from src.translator.preprocessor.include_preprocessor import IncludePreprocessor
+from src.translator.translator import parse_body, parse_header, write_outputs
+
+SUMMARY_FILE_NAME = "summary.json"
+"Имя файла сводки в выходном каталоге"
+
+CACHE_OPTION = "--cache="
+"Параметр командной строки c каталогом кэша компиляции"
+
+_headers: list[ParsedHeader | None] = []
+"Разобранные заголовки программ. Заполняется при инициализации процесса пула"
+
+_cache: CompilationCache | None = None
+"Кэш компиляции процесса пула. Создаётся при инициализации процесса, если задан каталог кэша"
+
+
+class TranslationJob:
+    """Задание на трансляцию одной программы
+
+    Препроцессинг выполняется заранее в основном процессе, поэтому задание содержит только тело программы
+    и номер разобранного заголовка в `_headers`
+    """
+
+    src_file: str
+    "Исходный файл"
+
+    header_id: int
+    "Номер разобранного заголовка"
+
+    header_text: str
+    "Текст заголовка. Нужен, если заголовок нельзя разобрать отдельно от тела"
+
+    body_text: str
+    "Текст тела программы после препроцессинга"
+
+    dependencies: list[str]
+    "Исходные файлы, вошедшие в программу"
+
+    instructions_file: str
+    "Целевой файл инструкций"
+
+    data_file: str
+    "Целевой файл данных"
+
+    def __init__(
+        self,
+        src_file: str,
+        header_id: int,
+        header_text: str,
+        body_text: str,
+        dependencies: list[str],
+        instructions_file: str,
+        data_file: str,
+    ):
+        self.src_file = src_file
+        self.header_id = header_id
+        self.header_text = header_text
+        self.body_text = body_text
+        self.dependencies = dependencies
+        self.instructions_file = instructions_file
+        self.data_file = data_file
+
+
+def init_worker(headers: list[ParsedHeader | None], cache_dir: str | None):
+    """Инициализация процесса пула: разобранные заголовки передаются в каждый процесс один раз"""
+
+    global _headers, _cache
+    _headers = headers
+    _cache = None if cache_dir is None else CompilationCache(cache_dir)
+
+
+def translate_job(job: TranslationJob) -> tuple[list[Instruction], list[Data]]:
+    """Разбор тела программы c разобранного заголовка и генерация кода"""
+
+    header = _headers[job.header_id]
+    if header is None:
+        tree, symbol_table, literals = Parser(Lexer(job.header_text + job.body_text)).parse()
+    else:
+        tree, symbol_table, literals = parse_body(header, job.body_text)
+    return CodeGenerator(tree, symbol_table, literals).translate()
+
+
+def run_job(job: TranslationJob) -> dict:
+    """Трансляция одной программы в процессе пула. Возвращает запись для сводки"""
+
+    start = time.perf_counter()
+
+    text = job.header_text + job.body_text
+    cached = None if _cache is None else _cache.load_binary(text)
+    if cached is None:
+        instructions, data = translate_job(job)
+        if _cache is not None:
+            _cache.store_binary(text, instructions, data)
+    else:
+        instructions, data = cached
+
+    write_outputs(instructions, data, job.instructions_file, job.data_file, job.dependencies)
+
+    return {
+        "source": job.src_file,
+        "instructions": len(instructions),
+        "data": len(data),
+        "time": time.perf_counter() - start,
+    }
+
+
+def load_header(header_text: str, cache: CompilationCache | None) -> ParsedHeader | None:
+    """Разбор заголовка программы c использованием кэша компиляции, если он передан"""
+
+    header = None if cache is None else cache.load_header(header_text)
+    if header is None:
+        header = parse_header(header_text)
+        if header is not None and cache is not None:
+            cache.store_header(header_text, header)
+    return header
+
+
+def expand_sources(patterns: list[str]) -> list[str]:
+    """Раскрытие шаблонов имён файлов. Аргументы без совпадений считаются именами файлов"""
+
+    sources = []
+    for pattern in patterns:
+        sources += sorted(glob.glob(pattern, recursive=True)) or [pattern]  # noqa: PTH207 # шаблоны могут быть абсолютными путями
+    return list(dict.fromkeys(sources))
+
+
+def make_jobs(
+    src_files: list[str], output_dir: str, cache: CompilationCache | None = None
+) -> tuple[list[TranslationJob], list[ParsedHeader | None]]:
+    """Препроцессинг программ и разбор их заголовков
+
+    Подключаемые файлы читаются один раз на все программы, a каждый различный заголовок (как правило, подключение
+    стандартной библиотеки) разбирается один раз. Если передан кэш компиляции, разобранные заголовки берутся из него
+    """
+
+    sources: dict[str, str] = {}
+    header_ids: dict[str, int] = {}
+    headers: list[ParsedHeader | None] = []
+    jobs = []
+
+    for src_file in src_files:
+        with open(src_file, encoding="utf-8") as f:
+            src = f.read()
+
+        preprocessor = IncludePreprocessor(src, src_file, sources)
+        header_text, body_text = preprocessor.preprocess_parts()
+        if header_text not in header_ids:
+            header_ids[header_text] = len(headers)
+            headers.append(load_header(header_text, cache))
+
+        name = Path(src_file).stem
+        jobs.append(
+            TranslationJob(
+                src_file,
+                header_ids[header_text],
+                header_text,
+                body_text,
+                preprocessor.dependencies(),
+                os.path.join(output_dir, name + "_instructions.bin"),
+                os.path.join(output_dir, name + "_data.bin"),
+            )
+        )
+
+    names = [job.instructions_file for job in jobs]
+    assert len(names) == len(set(names)), "Source files must have different names"
+    return jobs, headers
+
+
+def main(output_dir: str, patterns: list[str], workers: int | None = None, cache_dir: str | None = None) -> dict:
+    """Функция запуска пакетного транслятора
+
+    Для каждой программы `<name>.fs` в выходной каталог записываются `<name>_instructions.bin`, `<name>_data.bin`,
+    их шестнадцатеричные представления и файл зависимостей. Сводка по всем программам записывается в `summary.json`
+
+    Если указан каталог `cache_dir`, используется тот же кэш компиляции, что и в `translator.py`
+    """
+
+    start = time.perf_counter()
+
+    src_files = expand_sources(patterns)
+    jobs, headers = make_jobs(src_files, output_dir, None if cache_dir is None else CompilationCache(cache_dir))
+    preprocess_time = time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(headers, cache_dir)) as executor:
+        programs = list(executor.map(run_job, jobs))
+
+    summary = {
+        "programs": programs,
+        "total_instructions": sum(program["instructions"] for program in programs),
+        "preprocess_time": preprocess_time,
+        "total_time": time.perf_counter() - start,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, SUMMARY_FILE_NAME), "w", encoding="utf-8") as f:
+        f.write(json.dumps(summary, indent=4))
+
+    for program in programs:
+        print(
+            program["source"],
+            "code instr:",
+            program["instructions"],
+            "data:",
+            program["data"],
+            "time: {:.3f}s".format(program["time"]),
+        )
+    print(
+        "programs:",
+        len(programs),
+        "code instr:",
+        summary["total_instructions"],
+        "total time: {:.3f}s".format(summary["total_time"]),
+    )
+
+    return summary
+
+
+if __name__ == "__main__":
+    usage = "Wrong arguments: batch_translator.py [--cache=<cache_dir>] <output_dir> <input_file_or_glob>..."
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith(CACHE_OPTION)]
+    cache_directories = [
+        argument[len(CACHE_OPTION) :] for argument in sys.argv[1:] if argument.startswith(CACHE_OPTION)
+    ]
+    assert len(arguments) >= 2, usage
+    target_dir, *source_patterns = arguments
+    main(target_dir, source_patterns, cache_dir=cache_directories[-1] if cache_directories else None)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from src.isa.data import Data
+from src.isa.instructions.instruction import Instruction
+from src.translator.ast_.ast_ import Ast, AstBlock
+
+CACHE_FORMAT_VERSION = 1
+"""Версия формата записей кэша. Входит в ключи всех записей
+
+Увеличивается при изменении формата записей, чтобы записи старого формата не использовались
+"""
+
+SOURCES_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+"Каталог исходного кода транслятора и модели"
+
+
+def translator_fingerprint() -> str:
+    """Хэш исходного кода транслятора
+
+    Входит в ключи всех записей кэша, чтобы изменение транслятора не приводило к использованию устаревших результатов
+    """
+
+    digest = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(SOURCES_DIR):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            if file_name.endswith(".py"):
+                path = os.path.join(dir_path, file_name)
+                digest.update(os.path.relpath(path, SOURCES_DIR).encode())
+                with open(path, "rb") as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
+
+
+class ParsedHeader:
+    """Результат разбора заголовка программы (раскрытых директив `include` из начала файла)
+
+    Хранит всё, что нужно парсеру для продолжения разбора тела программы
+    """
+
+    children: list[Ast]
+    "AST-вершины заголовка"
+
+    symbol_table: dict[str, int]
+    "Таблица символов после разбора заголовка"
+
+    definitions: dict[str, AstBlock]
+    "Словарь пользовательских объявлений после разбора заголовка"
+
+    literals: list[str]
+    "Массив строковых литералов после разбора заголовка"
+
+    def __init__(
+        self, children: list[Ast], symbol_table: dict[str, int], definitions: dict[str, AstBlock], literals: list[str]
+    ):
+        self.children = children
+        self.symbol_table = symbol_table
+        self.definitions = definitions
+        self.literals = literals
+
+
+class CompilationCache:
+    """Кэш компиляции на диске
+
+    Все записи адресуются хэшем содержимого текста после препроцессинга и хэшем исходного кода транслятора.
+    Хранятся записи двух видов:
+
+    - `header` -- разобранный заголовок программы (`ParsedHeader`). Позволяет не выполнять лексический и
+      синтаксический разбор стандартной библиотеки, если изменился только сам файл программы
+
+    - `binary` -- итоговые инструкции и данные для полного текста программы. Позволяет не выполнять трансляцию
+      неизменившейся программы
+
+    Записи сохраняются атомарно, поэтому кэш можно использовать из нескольких процессов одновременно
+    """
+
+    cache_dir: str
+    "Каталог кэша"
+
+    fingerprint: str
+    "Хэш исходного кода транслятора"
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.fingerprint = translator_fingerprint()
+
+    def key(self, kind: str, text: str) -> str:
+        """Ключ записи вида `kind` для текста `text`"""
+
+        digest = hashlib.sha256()
+        digest.update(str(CACHE_FORMAT_VERSION).encode())
+        digest.update(self.fingerprint.encode())
+        digest.update(kind.encode())
+        digest.update(text.encode())
+        return digest.hexdigest()
+
+    def path(self, kind: str, text: str) -> str:
+        """Путь к файлу записи вида `kind` для текста `text`"""
+
+        return os.path.join(self.cache_dir, kind, self.key(kind, text) + ".pickle")
+
+    def load(self, kind: str, text: str) -> Any:
+        """Загрузка записи. Если записи нет, возвращается `None`
+
+        Повреждённая или несовместимая запись (например, сохранённая до переименования классов) также считается
+        отсутствующей и удаляется
+        """
+
+        path = self.path(kind, text)
+        try:
+            with open(path, "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            with contextlib.suppress(OSError):
+                Path(path).unlink()
+            return None
+
+    def store(self, kind: str, text: str, value: object):
+        """Атомарное сохранение записи"""
+
+        path = self.path(kind, text)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        Path(file.name).replace(path)
+
+    def load_header(self, header_text: str) -> ParsedHeader | None:
+        return self.load("header", header_text)
+
+    def store_header(self, header_text: str, header: ParsedHeader):
+        self.store("header", header_text, header)
+
+    def load_binary(self, text: str) -> tuple[list[Instruction], list[Data]] | None:
+        return self.load("binary", text)
+
+    def store_binary(self, text: str, instructions: list[Instruction], data: list[Data]):
+        self.store("binary", text, (instructions, data))
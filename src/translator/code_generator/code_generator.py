@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from src.constants import INSTRUCTION_MEMORY_SIZE, INTERRUPTS_HANDLER_ADDRESS
+from src.constants import INSTRUCTION_MEMORY_SIZE, INTERRUPTS_HANDLER_ADDRESS, NATIVE_EXTENDED_ARITHMETIC
 from src.isa.data import Data
 from src.isa.instructions.instruction import Instruction
 from src.isa.memory_config import DATA_AREA_START_ADDR
@@ -8,6 +8,7 @@ from src.isa.opcode_ import Opcode
 from src.translator.ast_.ast_ import (
     Ast,
     AstBlock,
+    AstCountedLoopStatement,
     AstDVariableDeclaration,
     AstExtendedNumber,
     AstIfStatement,
@@ -22,18 +23,34 @@ from src.translator.ast_.ast_ import (
     AstWhileStatement,
 )
 from src.translator.ast_.ast_node_visitor import AstNodeVisitor
+from src.translator.ast_.symbol_reference_counter import SymbolReferenceCounter
 from src.translator.code_generator.instruction_producers import (
+    COMPARISON_TRANSLATION,
     branch_stub_instructions_producer,
+    counted_loop_instructions_producer,
+    direct_access_instructions_producer,
+    fused_operation_instructions_producer,
     if_instructions_producer,
     jump_stub_instructions_producer,
     label_stub_instructions_producer,
     operation_instructions_producer,
+    pop_to_register_instructions_producer,
     push_extended_number_instructions_producer,
     push_number_instructions_producer,
+    push_register_instructions_producer,
     symbol_instructions_producer,
     while_instructions_producer,
 )
+from src.translator.code_generator.literal_sharing import LiteralSharingAnalyzer
+from src.translator.code_generator.register_allocator import RegisterAllocator
+from src.translator.code_generator.sequence_patterns import (
+    find_direct_access,
+    find_fused_operations,
+    flatten,
+    is_operation,
+)
 from src.translator.code_generator.stubs import BranchStub, JumpStub, LabelStub, Stub
+from src.translator.token.token_type import TokenType
 
 
 class CodeGenerator(AstNodeVisitor):
@@ -41,6 +58,9 @@ class CodeGenerator(AstNodeVisitor):
 
     Также производит формирование массива данных, выделяя место под
     переменные и заполняя строковые литералы
+
+    Место в памяти данных выделяется только под символы, к которым есть обращения.
+    Недостижимые инструкции удаляются перед простановкой адресов
     """
 
     tree = None
@@ -66,10 +86,46 @@ class CodeGenerator(AstNodeVisitor):
     interrupts = None
     "Массив инструкций для обработчика прерываний. Инициализируется пустым"
 
-    def __init__(self, tree: Ast, symbol_table: dict[str, int], literals: list[str]):
+    symbol_references = None
+    "Количество обращений к каждому символу в программе и обработчике прерываний"
+
+    register_variables = None
+    "Переменные, размещённые в регистрах вместо памяти данных (см. `RegisterAllocator`)"
+
+    counted_loop_depth = None
+    "Глубина вложенности циклов `do ... loop` в текущем месте программы"
+
+    is_native_extended_arithmetic = None
+    """Флаг использования инструкций двойной точности над парами регистров
+
+    Если сброшен, операции двойной точности транслируются через `SOFTWARE_EXTENDED_ARITHMETIC_TRANSLATION`
+    """
+
+    shared_literals = None
+    "Строковые литералы, в которые программа не пишет и которые можно хранить в одном экземпляре (см. `LiteralSharingAnalyzer`)"
+
+    literal_addresses = None
+    """Адреса размещённых в `data` разделяемых строковых литералов по их значению
+
+    Символы, объявленные c одинаковым разделяемым литералом, указывают на общую копию
+    """
+
+    def __init__(
+        self,
+        tree: Ast,
+        symbol_table: dict[str, int],
+        literals: list[str],
+        is_native_extended_arithmetic: bool = NATIVE_EXTENDED_ARITHMETIC,
+    ):
         self.tree = tree
         self.symbol_table = symbol_table
         self.literals = literals
+        self.symbol_references = SymbolReferenceCounter().count(tree)
+        self.register_variables = RegisterAllocator().allocate(tree)
+        self.counted_loop_depth = 0
+        self.is_native_extended_arithmetic = is_native_extended_arithmetic
+        self.shared_literals = LiteralSharingAnalyzer().analyze(tree)
+        self.literal_addresses: dict[str, int] = {}
         self.data: list[Data] = []
         self.instructions: list[Instruction] = []
         self.interrupts: list[Instruction] = []
@@ -91,6 +147,61 @@ class CodeGenerator(AstNodeVisitor):
         for instr in instructions:
             instr.address += shift
 
+    @staticmethod
+    def is_unconditional(instr: Instruction | Stub) -> bool:
+        """Проверяет, что после инструкции управление не переходит к следующей по порядку
+
+        Переходы внутри шаблонов операций задаются относительными смещениями и здесь не учитываются,
+        поэтому инструкции внутри шаблона никогда не считаются недостижимыми
+        """
+
+        if isinstance(instr, JumpStub):
+            return True
+        return isinstance(instr, Instruction) and instr.opcode in (Opcode.HALT, Opcode.RINT)
+
+    @staticmethod
+    def is_jump_to_next(instructions: list[Instruction | Stub], i: int) -> bool:
+        """Проверяет, что заглушка перехода ведёт на метку, идущую сразу после неё"""
+
+        label = instructions[i].label
+        for instr in instructions[i + 1 :]:
+            if instr is label:
+                return True
+            if not isinstance(instr, LabelStub):
+                return False
+        return False
+
+    def eliminate_dead_code(self, instructions: list[Instruction | Stub]) -> list[Instruction | Stub]:
+        """Удаляет недостижимые инструкции и бесполезные переходы
+
+        - Инструкции после безусловного перехода, `HALT` или `RINT` до ближайшей метки, на которую есть переход,
+          удаляются. Метки, на которые нет переходов, удаляются
+
+        - Переходы на метку, следующую сразу за переходом (например, `J` в конце `if` без `else`), удаляются
+
+        Удаление одного перехода может сделать недостижимыми другие инструкции, поэтому проход повторяется
+        до тех пор, пока список инструкций не перестанет меняться
+        """
+
+        while True:
+            targets = {id(instr.label) for instr in instructions if isinstance(instr, BranchStub | JumpStub)}
+            result = []
+            is_reachable = True
+            for i, instr in enumerate(instructions):
+                if isinstance(instr, LabelStub):
+                    if id(instr) in targets:
+                        is_reachable = True
+                        result.append(instr)
+                elif is_reachable and not (
+                    isinstance(instr, BranchStub | JumpStub) and self.is_jump_to_next(instructions, i)
+                ):
+                    result.append(instr)
+                    is_reachable = not self.is_unconditional(instr)
+
+            if len(result) == len(instructions):
+                return result
+            instructions = result
+
     @staticmethod
     def get_stub_replace(stub) -> list[Instruction]:
         if isinstance(stub, LabelStub):
@@ -149,6 +260,7 @@ class CodeGenerator(AstNodeVisitor):
 
         self.instructions = self.visit(self.tree)
         self.instructions.append(Instruction(Opcode.HALT))
+        self.instructions = self.eliminate_dead_code(self.instructions)
 
         self.link(self.instructions, 0)
         self.instructions = self.resolve_branches(self.instructions)
@@ -156,6 +268,7 @@ class CodeGenerator(AstNodeVisitor):
             max([instr.address for instr in self.instructions]) < INTERRUPTS_HANDLER_ADDRESS
         ), "Main instructions overlap interrupts block"
 
+        self.interrupts = self.eliminate_dead_code(self.interrupts)
         self.link(self.interrupts, INTERRUPTS_HANDLER_ADDRESS)
         self.interrupts = self.resolve_branches(self.interrupts)
 
@@ -167,7 +280,7 @@ class CodeGenerator(AstNodeVisitor):
         return program, self.data
 
     def visit_operation(self, node: AstOperation) -> list[Instruction]:
-        return operation_instructions_producer(node.token_type)
+        return operation_instructions_producer(node.token_type, self.is_native_extended_arithmetic)
 
     def visit_number(self, node: AstNumber) -> list[Instruction]:
         return push_number_instructions_producer(node.value)
@@ -176,11 +289,53 @@ class CodeGenerator(AstNodeVisitor):
         return push_extended_number_instructions_producer(node.value)
 
     def visit_block(self, node: AstBlock) -> list[Instruction]:
+        return self.visit_sequence(flatten(node))
+
+    def visit_sequence(self, children: list[Ast]) -> list[Instruction]:
+        """Транслирует плоскую последовательность вершин
+
+        - Если за операцией сравнения сразу следует `if`, то они транслируются вместе в одну инструкцию условного
+          перехода по операндам сравнения, без сохранения результата сравнения на стек
+
+        - Чтение и запись переменной по известному адресу (``<symbol> load``, ``<symbol> <value> store`` и их
+          варианты для двойной точности) транслируются в `lw`/`sw` c абсолютным адресом относительно `ZERO`,
+          без сохранения адреса на стек. Для переменных, размещённых в регистрах, -- в перемещение значения
+          между стеком и регистром
+
+        - Обращение к памяти по вычисленному сложением адресу (``+ load``, ``+ swap store``) транслируется
+          в одну инструкцию `lwx`/`swx` c адресацией база + индекс
+        """
+
         result = []
-        for block in node.children:
-            result += self.visit(block)
+        i = 0
+        while i < len(children):
+            child = children[i]
+            following = children[i + 1] if i + 1 < len(children) else None
+            if is_operation(child, COMPARISON_TRANSLATION.keys()) and isinstance(following, AstIfStatement):
+                result += self.visit_if_statement(following, child.token_type)
+                i += 2
+            elif (access := find_direct_access(children, i)) is not None:
+                result += self.visit_sequence(children[i + 1 : access])
+                result += self.direct_access_instructions(child.name, children[access].token_type)
+                i = access + 1
+            elif (operations := find_fused_operations(children, i)) is not None:
+                result += fused_operation_instructions_producer(operations)
+                i += len(operations)
+            else:
+                result += self.visit(child)
+                i += 1
         return result
 
+    def direct_access_instructions(self, name: str, token_type: TokenType) -> list[Instruction]:
+        """Обращение к переменной без адреса на стеке: перемещение между стеком и выделенным ей регистром
+        или `lw`/`sw` по абсолютному адресу"""
+
+        if name not in self.register_variables:
+            return direct_access_instructions_producer(self.symbol_table[name], token_type)
+        if token_type is TokenType.LOAD:
+            return push_register_instructions_producer(self.register_variables[name])
+        return pop_to_register_instructions_producer(self.register_variables[name])
+
     def visit_interrupt(self, node: AstInterrupt) -> list[Instruction]:
         """Парсит блок в массив `interrupts` и дописывает инструкцию `RINT` в конец"""
 
@@ -201,8 +356,19 @@ class CodeGenerator(AstNodeVisitor):
             self.data.append(Data(ord(c)))
         return []
 
+    def is_dead_symbol(self, name: str) -> bool:
+        """Проверяет, что к символу нет ни одного обращения. Под такие символы место в `data` не выделяется"""
+
+        return self.symbol_references[name] == 0
+
     def visit_variable_declaration(self, node: AstVariableDeclaration) -> list[Instruction]:
-        """Рассчитывает адрес переменной, записывает его в таблицу символов и добавляет ячейку в `data`"""
+        """Рассчитывает адрес переменной, записывает его в таблицу символов и добавляет ячейку в `data`
+
+        Для переменных, размещённых в регистрах, место в `data` не выделяется
+        """
+
+        if self.is_dead_symbol(node.name) or node.name in self.register_variables:
+            return []
 
         address = DATA_AREA_START_ADDR + len(self.data)
         self.symbol_table[node.name] = address
@@ -212,32 +378,71 @@ class CodeGenerator(AstNodeVisitor):
     def visit_d_variable_declaration(self, node: AstDVariableDeclaration) -> list[Instruction]:
         """Рассчитывает адрес переменной, записывает его в таблицу символов и добавляет две ячейки в `data`"""
 
+        if self.is_dead_symbol(node.name):
+            return []
+
         address = DATA_AREA_START_ADDR + len(self.data)
         self.symbol_table[node.name] = address
-        self.data += [Data()] * 2
+        self.data += [Data() for _ in range(2)]
         return []
 
     def visit_string_declaration(self, node: AstStringDeclaration) -> list[Instruction]:
-        """Рассчитывает адрес переменной, записывает его в таблицу символов и добавляет строку в `data`"""
+        """Рассчитывает адрес переменной, записывает его в таблицу символов и добавляет строку в `data`
+
+        Для разделяемого литерала, значение которого уже размещено, используется адрес его копии
+        """
+
+        if self.is_dead_symbol(node.name):
+            return []
+
+        value = self.literals[node.literal.value_id]
+        is_shared = node.name in self.shared_literals
+        if is_shared and value in self.literal_addresses:
+            self.symbol_table[node.name] = self.literal_addresses[value]
+            return []
 
         address = DATA_AREA_START_ADDR + len(self.data)
         self.symbol_table[node.name] = address
         self.visit(node.literal)
+        if is_shared:
+            self.literal_addresses[value] = address
         return []
 
     def visit_memory_block_declaration(self, node: AstMemoryBlockDeclaration) -> list[Instruction]:
         """Рассчитывает адрес переменной, записывает его в таблицу символов и добавляет `size` количество ячеек в `data`"""
 
+        if self.is_dead_symbol(node.name):
+            return []
+
         address = DATA_AREA_START_ADDR + len(self.data)
         self.symbol_table[node.name] = address
-        self.data += [Data()] * node.size
+        self.data += [Data() for _ in range(node.size)]
         return []
 
-    def visit_if_statement(self, node: AstIfStatement) -> list[Instruction]:
+    def visit_if_statement(self, node: AstIfStatement, comparison: TokenType | None = None) -> list[Instruction]:
+        """Условие -- значение на вершине стека или, если передано, операция сравнения `comparison`"""
+
         if_block_instructions = self.visit(node.if_block)
         else_block_instructions = [] if node.else_block is None else self.visit(node.else_block)
-        return if_instructions_producer(if_block_instructions, else_block_instructions)
+        return if_instructions_producer(if_block_instructions, else_block_instructions, comparison)
 
     def visit_while_statement(self, node: AstWhileStatement) -> list[Instruction]:
-        while_block_instructions = self.visit(node.while_block)
-        return while_instructions_producer(while_block_instructions)
+        """Если тело цикла заканчивается операцией сравнения, то она транслируется вместе c условным переходом"""
+
+        children = flatten(node.while_block)
+        if children and is_operation(children[-1], COMPARISON_TRANSLATION.keys()):
+            return while_instructions_producer(self.visit_sequence(children[:-1]), children[-1].token_type)
+        return while_instructions_producer(self.visit_sequence(children))
+
+    def visit_counted_loop_statement(self, node: AstCountedLoopStatement) -> list[Instruction]:
+        """Для вложенного цикла выделяет в `data` ячейку для сохранения счётчика внешнего цикла"""
+
+        save_address = None
+        if self.counted_loop_depth > 0:
+            save_address = DATA_AREA_START_ADDR + len(self.data)
+            self.data.append(Data())
+
+        self.counted_loop_depth += 1
+        loop_block_instructions = self.visit(node.loop_block)
+        self.counted_loop_depth -= 1
+        return counted_loop_instructions_producer(loop_block_instructions, save_address)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import copy
+from types import MappingProxyType
 
+from src.constants import NATIVE_EXTENDED_ARITHMETIC
 from src.isa.instructions.b_instruction import BInstruction
 from src.isa.instructions.i_instruction import IInstruction
 from src.isa.instructions.instruction import Instruction
@@ -9,26 +10,30 @@ from src.isa.instructions.j_instruction import JInstruction
 from src.isa.instructions.jr_instruction import JRInstruction
 from src.isa.instructions.r_instruction import RInstruction
 from src.isa.instructions.u_instruction import UInstruction
-from src.isa.memory_config import INPUT_ADDRESS, OUTPUT_ADDRESS
+from src.isa.memory_config import (
+    INPUT_ADDRESS,
+    INPUT_STATUS_ADDRESS,
+    INSTRUCTION_COUNTER_ADDRESS,
+    INTERRUPT_COUNTER_ADDRESS,
+    OUTPUT_ADDRESS,
+    TICK_COUNTER_ADDRESS,
+)
 from src.isa.opcode_ import Opcode
 from src.isa.register import Register
 from src.isa.util.binary import binary_to_signed_int, is_correct_bin_size_signed
 from src.translator.code_generator.stubs import BranchStub, JumpStub, LabelStub
 from src.translator.token.token_type import TokenType
 
+LOOP_COUNTER_REGISTER = Register.S1
+"Регистр счётчика цикла `do ... loop`. Если в программе есть такие циклы, переменные в нём не размещаются"
+
 
 def pop_to_register_instructions_producer(rd: Register) -> list[Instruction]:
-    return [
-        IInstruction(Opcode.LW, rd, Register.SP, 0),
-        IInstruction(Opcode.ADDI, Register.SP, Register.SP, 1),
-    ]
+    return [IInstruction(Opcode.LWPI, rd, Register.SP, 1)]
 
 
 def push_register_instructions_producer(rs: Register) -> list[Instruction]:
-    return [
-        IInstruction(Opcode.ADDI, Register.SP, Register.SP, -1),
-        BInstruction(Opcode.SW, Register.SP, rs, 0),
-    ]
+    return [BInstruction(Opcode.SWPD, Register.SP, rs, -1)]
 
 
 def push_number_instructions_producer(value) -> list[Instruction]:
@@ -55,24 +60,88 @@ def push_extended_number_instructions_producer(value) -> list[Instruction]:
     ]
 
 
-def while_instructions_producer(while_block_instructions: list[Instruction]) -> list[Instruction]:
+def condition_branch_instructions_producer(
+    comparison: TokenType | None, is_taken_if_true: bool, label: LabelStub
+) -> list[Instruction]:
+    """Переход на метку `label` в зависимости от истинности условия
+
+    Если условие -- значение на вершине стека (`comparison` равно `None`), то оно снимается со стека и сравнивается
+    c нулём
+
+    Если условие -- операция сравнения, то её операнды снимаются со стека и сравниваются одной инструкцией условного
+    перехода без сохранения результата сравнения на стек. Если подходящей инструкции перехода нет, результат сравнения
+    вычисляется в регистре и сравнивается c нулём
+    """
+
+    if comparison is None:
+        return [
+            *pop_to_register_instructions_producer(Register.T0),
+            BranchStub(Opcode.BNE if is_taken_if_true else Opcode.BEQ, Register.T0, Register.ZERO, label),
+        ]
+
+    opcode = COMPARISON_BRANCH_OPCODES[comparison][0 if is_taken_if_true else 1]
+    if opcode is not None:
+        return [
+            *pop_to_register_instructions_producer(Register.T1),
+            *pop_to_register_instructions_producer(Register.T0),
+            BranchStub(opcode, Register.T0, Register.T1, label),
+        ]
+    return [
+        *[template.instantiate() for template in COMPARISON_TRANSLATION[comparison]],
+        BranchStub(Opcode.BNE if is_taken_if_true else Opcode.BEQ, Register.T0, Register.ZERO, label),
+    ]
+
+
+def while_instructions_producer(
+    while_block_instructions: list[Instruction], comparison: TokenType | None = None
+) -> list[Instruction]:
     label = LabelStub()
     return [
         label,
         *while_block_instructions,
-        *pop_to_register_instructions_producer(Register.T0),
-        BranchStub(Opcode.BNE, Register.T0, Register.ZERO, label),
+        *condition_branch_instructions_producer(comparison, True, label),
+    ]
+
+
+def counted_loop_instructions_producer(
+    loop_block_instructions: list[Instruction], save_address: int | None = None
+) -> list[Instruction]:
+    """Цикл co счётчиком в регистре `LOOP_COUNTER_REGISTER`
+
+    Количество повторений снимается co стека. Если оно не положительно, тело не выполняется ни разу.
+    Каждая итерация завершается одной инструкцией `dbnz`
+
+    Для вложенного цикла счётчик внешнего цикла на время его выполнения сохраняется в память по адресу `save_address`
+    """
+
+    loop_label = LabelStub()
+    end_label = LabelStub()
+    save, restore = [], []
+    if save_address is not None:
+        save = [BInstruction(Opcode.SW, Register.ZERO, LOOP_COUNTER_REGISTER, save_address)]
+        restore = [IInstruction(Opcode.LW, LOOP_COUNTER_REGISTER, Register.ZERO, save_address)]
+    return [
+        *save,
+        *pop_to_register_instructions_producer(LOOP_COUNTER_REGISTER),
+        RInstruction(Opcode.SLT, Register.T0, Register.ZERO, LOOP_COUNTER_REGISTER),
+        BranchStub(Opcode.BEQ, Register.T0, Register.ZERO, end_label),
+        loop_label,
+        *loop_block_instructions,
+        BranchStub(Opcode.DBNZ, LOOP_COUNTER_REGISTER, Register.ZERO, loop_label),
+        end_label,
+        *restore,
     ]
 
 
 def if_instructions_producer(
-    if_block_instructions: list[Instruction], else_block_instructions: list[Instruction]
+    if_block_instructions: list[Instruction],
+    else_block_instructions: list[Instruction],
+    comparison: TokenType | None = None,
 ) -> list[Instruction]:
     else_label = LabelStub()
     if_label = LabelStub()
     return [
-        *pop_to_register_instructions_producer(Register.T0),
-        BranchStub(Opcode.BEQ, Register.T0, Register.ZERO, else_label),
+        *condition_branch_instructions_producer(comparison, False, else_label),
         *if_block_instructions,
         JumpStub(if_label),
         else_label,
@@ -121,6 +190,38 @@ def jump_stub_instructions_producer(stub: JumpStub) -> list[Instruction]:
     ]
 
 
+def direct_access_instructions_producer(symbol_address: int, token_type: TokenType) -> list[Instruction]:
+    """Обращение к переменной по известному адресу без адреса на стеке
+
+    - `LOAD`, `D_LOAD` -- чтение (``<symbol> load``, ``<symbol> 2load``)
+    - `STORE`, `D_STORE` -- запись значения c вершины стека (``<symbol> <value> store``, ``<symbol> <value> 2store``)
+    """
+
+    if token_type is TokenType.LOAD:
+        return [
+            IInstruction(Opcode.LW, Register.T0, Register.ZERO, symbol_address),
+            *push_register_instructions_producer(Register.T0),
+        ]
+    if token_type is TokenType.D_LOAD:
+        return [
+            IInstruction(Opcode.LW, Register.T0, Register.ZERO, symbol_address),
+            IInstruction(Opcode.LW, Register.T1, Register.ZERO, symbol_address + 1),
+            *push_register_instructions_producer(Register.T1),
+            *push_register_instructions_producer(Register.T0),
+        ]
+    if token_type is TokenType.STORE:
+        return [
+            *pop_to_register_instructions_producer(Register.T0),
+            BInstruction(Opcode.SW, Register.ZERO, Register.T0, symbol_address),
+        ]
+    return [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        BInstruction(Opcode.SW, Register.ZERO, Register.T0, symbol_address),
+        BInstruction(Opcode.SW, Register.ZERO, Register.T1, symbol_address + 1),
+    ]
+
+
 def symbol_instructions_producer(symbol_address: int) -> list[Instruction]:
     return [
         IInstruction(Opcode.ADDI, Register.T0, Register.ZERO, symbol_address),
@@ -128,9 +229,107 @@ def symbol_instructions_producer(symbol_address: int) -> list[Instruction]:
     ]
 
 
-def operation_instructions_producer(token_type: TokenType) -> list[Instruction]:
+def operation_instructions_producer(
+    token_type: TokenType, is_native_extended_arithmetic: bool = NATIVE_EXTENDED_ARITHMETIC
+) -> list[Instruction]:
     assert token_type in OPERATION_TRANSLATION, "Unsupported operation"
-    return copy.deepcopy(OPERATION_TRANSLATION[token_type])
+    if not is_native_extended_arithmetic and token_type in SOFTWARE_EXTENDED_ARITHMETIC_TRANSLATION:
+        return [template.instantiate() for template in SOFTWARE_EXTENDED_ARITHMETIC_TRANSLATION[token_type]]
+    return [template.instantiate() for template in OPERATION_TRANSLATION[token_type]]
+
+
+def fused_operation_instructions_producer(operations: tuple[TokenType, ...]) -> list[Instruction]:
+    return [template.instantiate() for template in FUSED_OPERATION_TRANSLATION[operations]]
+
+
+class InstructionTemplate:
+    """Шаблон инструкции в словарях трансляции операций (например, `OPERATION_TRANSLATION`)
+
+    Инструкция-образец хранится в шаблоне закрыто и не изменяется: наружу выдаются только её копии (`instantiate`),
+    поэтому изменение сгенерированной инструкции (например, назначение адреса при линковке) не затрагивает шаблон
+    """
+
+    _instruction = None
+    "Инструкция-образец"
+
+    def __init__(self, instruction: Instruction):
+        self._instruction = instruction.instantiate()
+
+    def instantiate(self) -> Instruction:
+        """Создание новой инструкции по шаблону (см. `Instruction.instantiate`)"""
+
+        return self._instruction.instantiate()
+
+    def __str__(self) -> str:
+        return str(self._instruction)
+
+
+def _freeze_templates(translation: dict[TokenType, list[Instruction]]) -> MappingProxyType:
+    """Превращает словарь трансляции операций в неизменяемый словарь кортежей шаблонов (`InstructionTemplate`)"""
+
+    return MappingProxyType(
+        {
+            token_type: tuple(InstructionTemplate(instruction) for instruction in instructions)
+            for token_type, instructions in translation.items()
+        }
+    )
+
+
+COMPARISON_TRANSLATION = {
+    TokenType.EQUALS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T1, Register.T0),
+    ],
+    TokenType.NOT_EQUALS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T1, Register.T0),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T0, Register.ZERO),
+    ],
+    TokenType.GREATER: [
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T1, Register.T0),
+    ],
+    TokenType.LESS: [
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T0, Register.T1),
+    ],
+    TokenType.GREATER_EQUAL: [
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T0, Register.T1),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T0, Register.ZERO),
+    ],
+    TokenType.LESS_EQUAL: [
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T1, Register.T0),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T0, Register.ZERO),
+    ],
+}
+"""Вычисление результата операций сравнения в регистре `T0`. Операнды снимаются c вершины стека
+
+Используется в `OPERATION_TRANSLATION` (c сохранением результата на стек) и при генерации условных переходов
+"""
+
+COMPARISON_BRANCH_OPCODES = {
+    TokenType.EQUALS: (Opcode.BEQ, Opcode.BNE),
+    TokenType.NOT_EQUALS: (Opcode.BNE, Opcode.BEQ),
+    TokenType.GREATER: (Opcode.BGT, None),
+    TokenType.LESS: (Opcode.BLT, None),
+    TokenType.GREATER_EQUAL: (None, Opcode.BLT),
+    TokenType.LESS_EQUAL: (None, Opcode.BGT),
+}
+"""Инструкции условного перехода для операций сравнения ``a b <op>``. Операнд `a` находится в регистре `T0`, `b` -- в `T1`
+
+Первая инструкция выполняет переход, если сравнение истинно, вторая -- если ложно.
+`None` означает, что одной инструкцией перехода условие не проверить
+"""
+
+COMPARISON_TRANSLATION = _freeze_templates(COMPARISON_TRANSLATION)
 
 
 OPERATION_TRANSLATION = {
@@ -185,10 +384,7 @@ OPERATION_TRANSLATION = {
         *pop_to_register_instructions_producer(Register.T1),
         *pop_to_register_instructions_producer(Register.T2),
         *pop_to_register_instructions_producer(Register.T3),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        RInstruction(Opcode.DADD, Register.T0, Register.T2, Register.T0),
         *push_register_instructions_producer(Register.T1),
         *push_register_instructions_producer(Register.T0),
     ],
@@ -203,50 +399,55 @@ OPERATION_TRANSLATION = {
     TokenType.D_MINUS: [
         *pop_to_register_instructions_producer(Register.T0),
         *pop_to_register_instructions_producer(Register.T1),
-        IInstruction(Opcode.ADDI, Register.T2, Register.ZERO, -1),
-        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.XOR, Register.T1, Register.T2, Register.T1),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
         *pop_to_register_instructions_producer(Register.T2),
         *pop_to_register_instructions_producer(Register.T3),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        RInstruction(Opcode.DSUB, Register.T0, Register.T2, Register.T0),
         *push_register_instructions_producer(Register.T1),
         *push_register_instructions_producer(Register.T0),
     ],
     TokenType.D_NEG: [
         *pop_to_register_instructions_producer(Register.T0),
         *pop_to_register_instructions_producer(Register.T1),
-        IInstruction(Opcode.ADDI, Register.T2, Register.ZERO, -1),
-        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.XOR, Register.T1, Register.T2, Register.T1),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        RInstruction(Opcode.DNEG, Register.T0, Register.T0, Register.ZERO),
         *push_register_instructions_producer(Register.T1),
         *push_register_instructions_producer(Register.T0),
     ],
     TokenType.D_ABS: [
         *pop_to_register_instructions_producer(Register.T0),
-        BInstruction(Opcode.BGT, Register.T0, Register.ZERO, 13),
-        BInstruction(Opcode.BEQ, Register.T0, Register.ZERO, 12),
         *pop_to_register_instructions_producer(Register.T1),
-        IInstruction(Opcode.ADDI, Register.T2, Register.ZERO, -1),
-        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.XOR, Register.T1, Register.T2, Register.T1),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
-        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
-        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        RInstruction(Opcode.SLT, Register.T2, Register.T0, Register.ZERO),
+        BInstruction(Opcode.BEQ, Register.T2, Register.ZERO, 2),
+        RInstruction(Opcode.DNEG, Register.T0, Register.T0, Register.ZERO),
         *push_register_instructions_producer(Register.T1),
         *push_register_instructions_producer(Register.T0),
     ],
+    TokenType.D_EQUALS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        RInstruction(Opcode.DCMP, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T0, Register.ZERO),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_LESS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        RInstruction(Opcode.DCMP, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T0, Register.ZERO),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_GREATER: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        RInstruction(Opcode.DCMP, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.ZERO, Register.T0),
+        *push_register_instructions_producer(Register.T0),
+    ],
     TokenType.AND: [
         *pop_to_register_instructions_producer(Register.T0),
         *pop_to_register_instructions_producer(Register.T1),
@@ -311,62 +512,13 @@ OPERATION_TRANSLATION = {
         *push_register_instructions_producer(Register.T1),
         *push_register_instructions_producer(Register.T0),
     ],
-    TokenType.EQUALS: [
-        *pop_to_register_instructions_producer(Register.T0),
-        *pop_to_register_instructions_producer(Register.T1),
-        BInstruction(Opcode.BEQ, Register.T0, Register.T1, 3),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 0),
-        JInstruction(Opcode.J, 2),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        *push_register_instructions_producer(Register.T3),
-    ],
-    TokenType.NOT_EQUALS: [
-        *pop_to_register_instructions_producer(Register.T0),
-        *pop_to_register_instructions_producer(Register.T1),
-        BInstruction(Opcode.BNE, Register.T0, Register.T1, 3),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 0),
-        JInstruction(Opcode.J, 2),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        *push_register_instructions_producer(Register.T3),
-    ],
-    TokenType.GREATER: [
-        *pop_to_register_instructions_producer(Register.T1),
-        *pop_to_register_instructions_producer(Register.T0),
-        BInstruction(Opcode.BGT, Register.T0, Register.T1, 3),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 0),
-        JInstruction(Opcode.J, 2),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        *push_register_instructions_producer(Register.T3),
-    ],
-    TokenType.LESS: [
-        *pop_to_register_instructions_producer(Register.T1),
-        *pop_to_register_instructions_producer(Register.T0),
-        BInstruction(Opcode.BLT, Register.T0, Register.T1, 3),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 0),
-        JInstruction(Opcode.J, 2),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        *push_register_instructions_producer(Register.T3),
-    ],
-    TokenType.GREATER_EQUAL: [
-        *pop_to_register_instructions_producer(Register.T1),
-        *pop_to_register_instructions_producer(Register.T0),
-        BInstruction(Opcode.BGT, Register.T0, Register.T1, 4),
-        BInstruction(Opcode.BEQ, Register.T0, Register.T1, 3),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 0),
-        JInstruction(Opcode.J, 2),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        *push_register_instructions_producer(Register.T3),
-    ],
-    TokenType.LESS_EQUAL: [
-        *pop_to_register_instructions_producer(Register.T1),
-        *pop_to_register_instructions_producer(Register.T0),
-        BInstruction(Opcode.BLT, Register.T0, Register.T1, 4),
-        BInstruction(Opcode.BEQ, Register.T0, Register.T1, 3),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 0),
-        JInstruction(Opcode.J, 2),
-        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
-        *push_register_instructions_producer(Register.T3),
-    ],
+    **{
+        token_type: [
+            *(template.instantiate() for template in templates),
+            *push_register_instructions_producer(Register.T0),
+        ]
+        for token_type, templates in COMPARISON_TRANSLATION.items()
+    },
     TokenType.PRINT: [
         *pop_to_register_instructions_producer(Register.T0),
         IInstruction(Opcode.ADDI, Register.T1, Register.ZERO, OUTPUT_ADDRESS),
@@ -377,6 +529,22 @@ OPERATION_TRANSLATION = {
         IInstruction(Opcode.LW, Register.T0, Register.T1, 0),
         *push_register_instructions_producer(Register.T0),
     ],
+    TokenType.INPUT_COUNT: [
+        IInstruction(Opcode.LW, Register.T0, Register.ZERO, INPUT_STATUS_ADDRESS),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.TICK_COUNT: [
+        IInstruction(Opcode.LW, Register.T0, Register.ZERO, TICK_COUNTER_ADDRESS),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.INSTRUCTION_COUNT: [
+        IInstruction(Opcode.LW, Register.T0, Register.ZERO, INSTRUCTION_COUNTER_ADDRESS),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.INTERRUPT_COUNT: [
+        IInstruction(Opcode.LW, Register.T0, Register.ZERO, INTERRUPT_COUNTER_ADDRESS),
+        *push_register_instructions_producer(Register.T0),
+    ],
     TokenType.STORE: [
         *pop_to_register_instructions_producer(Register.T0),
         *pop_to_register_instructions_producer(Register.T1),
@@ -392,17 +560,216 @@ OPERATION_TRANSLATION = {
         *pop_to_register_instructions_producer(Register.T1),
         *pop_to_register_instructions_producer(Register.T2),
         BInstruction(Opcode.SW, Register.T2, Register.T0, 0),
-        IInstruction(Opcode.ADDI, Register.T2, Register.T2, 1),
-        BInstruction(Opcode.SW, Register.T2, Register.T1, 0),
+        BInstruction(Opcode.SW, Register.T2, Register.T1, 1),
     ],
     TokenType.D_LOAD: [
         *pop_to_register_instructions_producer(Register.T2),
         IInstruction(Opcode.LW, Register.T0, Register.T2, 0),
-        IInstruction(Opcode.ADDI, Register.T2, Register.T2, 1),
-        IInstruction(Opcode.LW, Register.T1, Register.T2, 0),
+        IInstruction(Opcode.LW, Register.T1, Register.T2, 1),
         *push_register_instructions_producer(Register.T1),
         *push_register_instructions_producer(Register.T0),
     ],
+    TokenType.MOVE: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        RInstruction(Opcode.MOVE, Register.T0, Register.T2, Register.T1),
+    ],
+    TokenType.FILL: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        RInstruction(Opcode.FILL, Register.T1, Register.T2, Register.T0),
+    ],
     TokenType.ENABLE_INT: [Instruction(Opcode.EINT)],
     TokenType.DISABLE_INT: [Instruction(Opcode.DINT)],
+    TokenType.WAIT_INT: [Instruction(Opcode.WFI)],
 }
+OPERATION_TRANSLATION = _freeze_templates(OPERATION_TRANSLATION)
+"""Шаблоны инструкций для операций языка
+
+Шаблоны (`InstructionTemplate`) не изменяются: для каждого вхождения операции в программу создаются
+новые инструкции через `InstructionTemplate.instantiate`. Адреса им назначаются при линковке
+"""
+
+SOFTWARE_EXTENDED_ARITHMETIC_TRANSLATION = {
+    TokenType.D_PLUS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        *push_register_instructions_producer(Register.T1),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_MINUS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        IInstruction(Opcode.ADDI, Register.T2, Register.ZERO, -1),
+        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.XOR, Register.T1, Register.T2, Register.T1),
+        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
+        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        *push_register_instructions_producer(Register.T1),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_NEG: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        IInstruction(Opcode.ADDI, Register.T2, Register.ZERO, -1),
+        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.XOR, Register.T1, Register.T2, Register.T1),
+        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
+        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        *push_register_instructions_producer(Register.T1),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_ABS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        BInstruction(Opcode.BGT, Register.T0, Register.ZERO, 11),
+        BInstruction(Opcode.BEQ, Register.T0, Register.ZERO, 10),
+        *pop_to_register_instructions_producer(Register.T1),
+        IInstruction(Opcode.ADDI, Register.T2, Register.ZERO, -1),
+        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.XOR, Register.T1, Register.T2, Register.T1),
+        IInstruction(Opcode.ADDI, Register.T3, Register.ZERO, 1),
+        RInstruction(Opcode.ADC, Register.T2, Register.T3, Register.T1),
+        RInstruction(Opcode.ADD, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.ADD, Register.T1, Register.T3, Register.T1),
+        *push_register_instructions_producer(Register.T1),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_EQUALS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        RInstruction(Opcode.XOR, Register.T0, Register.T2, Register.T0),
+        RInstruction(Opcode.XOR, Register.T1, Register.T3, Register.T1),
+        RInstruction(Opcode.OR, Register.T0, Register.T0, Register.T1),
+        RInstruction(Opcode.SEQ, Register.T0, Register.T0, Register.ZERO),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_LESS: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        BInstruction(Opcode.BNE, Register.T2, Register.T0, 6),
+        UInstruction(Opcode.LUI, Register.T0, -(1 << 23)),
+        RInstruction(Opcode.XOR, Register.T1, Register.T1, Register.T0),
+        RInstruction(Opcode.XOR, Register.T3, Register.T3, Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T3, Register.T1),
+        BInstruction(Opcode.BEQ, Register.ZERO, Register.ZERO, 2),
+        RInstruction(Opcode.SLT, Register.T0, Register.T2, Register.T0),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    TokenType.D_GREATER: [
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T2),
+        *pop_to_register_instructions_producer(Register.T3),
+        BInstruction(Opcode.BNE, Register.T2, Register.T0, 6),
+        UInstruction(Opcode.LUI, Register.T0, -(1 << 23)),
+        RInstruction(Opcode.XOR, Register.T1, Register.T1, Register.T0),
+        RInstruction(Opcode.XOR, Register.T3, Register.T3, Register.T0),
+        RInstruction(Opcode.SLT, Register.T0, Register.T1, Register.T3),
+        BInstruction(Opcode.BEQ, Register.ZERO, Register.ZERO, 2),
+        RInstruction(Opcode.SLT, Register.T0, Register.T0, Register.T2),
+        *push_register_instructions_producer(Register.T0),
+    ],
+}
+SOFTWARE_EXTENDED_ARITHMETIC_TRANSLATION = _freeze_templates(SOFTWARE_EXTENDED_ARITHMETIC_TRANSLATION)
+"""Шаблоны инструкций для операций двойной точности без инструкций над парами регистров (`dadd`, `dsub`, `dneg`, `dcmp`)
+
+Значения собираются из машинных слов c помощью `ADC`, `XOR` и сравнений старших и младших частей.
+Используются вместо соответствующих шаблонов из `OPERATION_TRANSLATION`, если трансляция выполняется
+для процессора без инструкций двойной точности (см. `NATIVE_EXTENDED_ARITHMETIC`)
+"""
+
+FUSED_OPERATION_TRANSLATION = {
+    (TokenType.PLUS, TokenType.LOAD): [
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T0),
+        RInstruction(Opcode.LWX, Register.T0, Register.T0, Register.T1),
+        *push_register_instructions_producer(Register.T0),
+    ],
+    (TokenType.PLUS, TokenType.SWAP, TokenType.STORE): [
+        *pop_to_register_instructions_producer(Register.T1),
+        *pop_to_register_instructions_producer(Register.T0),
+        *pop_to_register_instructions_producer(Register.T2),
+        RInstruction(Opcode.SWX, Register.T2, Register.T0, Register.T1),
+    ],
+}
+FUSED_OPERATION_TRANSLATION = _freeze_templates(FUSED_OPERATION_TRANSLATION)
+"""Шаблоны инструкций для последовательностей операций, которые транслируются вместе
+
+Обращение к памяти по адресу, вычисленному сложением (``base index + load``, ``value base index + swap store``),
+выполняется одной инструкцией c адресацией база + индекс без сохранения адреса на стек
+"""
+
+OPERATION_STACK_EFFECTS = {
+    **{token_type: (2, 1) for token_type in COMPARISON_TRANSLATION},
+    TokenType.PLUS: (2, 1),
+    TokenType.MINUS: (2, 1),
+    TokenType.MUL: (2, 1),
+    TokenType.DIV: (2, 1),
+    TokenType.MOD: (2, 1),
+    TokenType.NEG: (1, 1),
+    TokenType.ABS: (1, 1),
+    TokenType.D_PLUS: (4, 2),
+    TokenType.D_MUL: (2, 2),
+    TokenType.D_MINUS: (4, 2),
+    TokenType.D_NEG: (2, 2),
+    TokenType.D_ABS: (2, 2),
+    TokenType.D_EQUALS: (4, 1),
+    TokenType.D_LESS: (4, 1),
+    TokenType.D_GREATER: (4, 1),
+    TokenType.AND: (2, 1),
+    TokenType.OR: (2, 1),
+    TokenType.XOR: (2, 1),
+    TokenType.NOT: (1, 1),
+    TokenType.DUP: (1, 2),
+    TokenType.DROP: (1, 0),
+    TokenType.SWAP: (2, 2),
+    TokenType.OVER: (2, 3),
+    TokenType.D_DUP: (2, 4),
+    TokenType.D_DROP: (2, 0),
+    TokenType.D_SWAP: (4, 4),
+    TokenType.D_OVER: (4, 6),
+    TokenType.PRINT: (1, 0),
+    TokenType.READ: (0, 1),
+    TokenType.INPUT_COUNT: (0, 1),
+    TokenType.TICK_COUNT: (0, 1),
+    TokenType.INSTRUCTION_COUNT: (0, 1),
+    TokenType.INTERRUPT_COUNT: (0, 1),
+    TokenType.STORE: (2, 0),
+    TokenType.LOAD: (1, 1),
+    TokenType.D_STORE: (3, 0),
+    TokenType.D_LOAD: (1, 2),
+    TokenType.MOVE: (3, 0),
+    TokenType.FILL: (3, 0),
+    TokenType.ENABLE_INT: (0, 0),
+    TokenType.DISABLE_INT: (0, 0),
+    TokenType.WAIT_INT: (0, 0),
+}
+"""Стековый эффект операций языка: сколько значений операция использует c вершины стека и сколько оставляет вместо них
+
+Используется при поиске записи в переменную по известному адресу
+"""
+
+DIRECT_STORE_SIZES = {TokenType.STORE: 1, TokenType.D_STORE: 2}
+"Количество записываемых в память слов для операций записи"
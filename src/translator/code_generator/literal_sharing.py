@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from src.constants import DMA_INPUT_COMMAND
+from src.isa.memory_config import DATA_AREA_START_ADDR, DMA_CONTROL_ADDRESS
+from src.translator.ast_.ast_ import (
+    Ast,
+    AstBlock,
+    AstCountedLoopStatement,
+    AstIfStatement,
+    AstInterrupt,
+    AstNumber,
+    AstOperation,
+    AstStringDeclaration,
+    AstWhileStatement,
+)
+from src.translator.ast_.ast_node_visitor import AstNodeVisitor
+from src.translator.code_generator.sequence_patterns import find_direct_access, find_direct_store, flatten, is_operation
+from src.translator.token.token_type import TokenType
+
+INDIRECT_WRITE_OPERATIONS = frozenset({TokenType.STORE, TokenType.D_STORE, TokenType.MOVE, TokenType.FILL})
+"Операции, которые могут записать в память по вычисленному адресу"
+
+
+def find_device_store(children: list[Ast], i: int) -> int | None:
+    """Ищет запись в регистр устройства по постоянному адресу `children[i]`
+
+    Распознаются ``<address> <value> store`` (см. `find_direct_store`) и ``<address> swap store``, где записываемое
+    значение уже лежит на стеке. Возвращает индекс операции записи
+    """
+
+    node = children[i]
+    if not isinstance(node, AstNumber) or not 0 <= node.value < DATA_AREA_START_ADDR:
+        return None
+    following = children[i + 1 : i + 3]
+    if (
+        len(following) == 2
+        and is_operation(following[0], {TokenType.SWAP})
+        and is_operation(following[1], {TokenType.STORE})
+    ):
+        return i + 2
+    store = find_direct_store(children, i)
+    if store is None or not is_operation(children[store], {TokenType.STORE}):
+        return None
+    return store
+
+
+def may_start_dma_input(children: list[Ast], i: int, store: int) -> bool:
+    """Может ли запись в регистр устройства `children[i]` операцией `children[store]` запустить ввод через DMA
+
+    Ввод через DMA пишет в буфер, адрес которого программа передала контроллеру, поэтому такая запись считается
+    записью по вычисленному адресу. Команды, отличные от `DMA_INPUT_COMMAND`, память данных не меняют
+    """
+
+    if children[i].value != DMA_CONTROL_ADDRESS:
+        return False
+    value = children[i + 1 : store]
+    return not (len(value) == 1 and isinstance(value[0], AstNumber) and value[0].value != DMA_INPUT_COMMAND)
+
+
+class LiteralSharingAnalyzer(AstNodeVisitor):
+    """Выбирает строковые литералы (`str`), которые можно хранить в памяти в одном экземпляре c одинаковыми
+
+    Память строк доступна для записи, поэтому литерал разделяется, только если программа точно в него не пишет:
+    все записи в память в программе и обработчике прерываний -- это записи без адреса на стеке
+    (``x <value> store``, см. `find_direct_access`), ни одна из которых не направлена в саму строку, и записи
+    в регистры устройств по постоянному адресу (см. `find_device_store`), например передача адреса буфера
+    и команды вывода контроллеру DMA.
+
+    Любая запись по вычисленному адресу, запуск ввода через DMA (см. `may_start_dma_input`) и операции `move`
+    и `fill` могут изменить любую строку, и тогда все строки размещаются раздельно
+    """
+
+    strings = None
+    "Объявленные в программе строковые литералы"
+
+    written = None
+    "Строковые литералы, в которые есть запись без адреса на стеке"
+
+    has_indirect_writes = None
+    "Есть ли в программе запись по вычисленному адресу"
+
+    def analyze(self, tree: Ast) -> set[str]:
+        """Возвращает имена строковых литералов, которые можно разделять"""
+
+        self.strings = set()
+        self.written = set()
+        self.has_indirect_writes = False
+        self.visit(tree)
+
+        if self.has_indirect_writes:
+            return set()
+        return self.strings - self.written
+
+    def visit_block(self, node: AstBlock):
+        self.visit_sequence(flatten(node))
+
+    def visit_sequence(self, children: list[Ast]):
+        """Обходит последовательность так же, как генератор кода: значение перед записью -- отдельной подпоследовательностью"""
+
+        i = 0
+        while i < len(children):
+            access = find_direct_access(children, i)
+            device_store = find_device_store(children, i) if access is None else None
+            if access is not None:
+                if children[access].token_type in (TokenType.STORE, TokenType.D_STORE):
+                    self.written.add(children[i].name)
+            elif device_store is not None:
+                if may_start_dma_input(children, i, device_store):
+                    self.has_indirect_writes = True
+                access = device_store
+            else:
+                self.visit(children[i])
+                i += 1
+                continue
+
+            self.visit_sequence(children[i + 1 : access])
+            i = access + 1
+
+    def visit_operation(self, node: AstOperation):
+        if node.token_type in INDIRECT_WRITE_OPERATIONS:
+            self.has_indirect_writes = True
+
+    def visit_interrupt(self, node: AstInterrupt):
+        self.visit_block(node.block)
+
+    def visit_string_declaration(self, node: AstStringDeclaration):
+        self.strings.add(node.name)
+
+    def visit_if_statement(self, node: AstIfStatement):
+        self.visit(node.if_block)
+        if node.else_block is not None:
+            self.visit(node.else_block)
+
+    def visit_while_statement(self, node: AstWhileStatement):
+        self.visit(node.while_block)
+
+    def visit_counted_loop_statement(self, node: AstCountedLoopStatement):
+        self.visit(node.loop_block)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from src.isa.register import Register
+from src.translator.ast_.ast_ import (
+    Ast,
+    AstBlock,
+    AstCountedLoopStatement,
+    AstIfStatement,
+    AstInterrupt,
+    AstSymbol,
+    AstVariableDeclaration,
+    AstWhileStatement,
+)
+from src.translator.ast_.ast_node_visitor import AstNodeVisitor
+from src.translator.ast_.symbol_reference_counter import SymbolReferenceCounter
+from src.translator.code_generator.instruction_producers import LOOP_COUNTER_REGISTER
+from src.translator.code_generator.sequence_patterns import find_direct_access, flatten
+from src.translator.token.token_type import TokenType
+
+ALLOCATABLE_REGISTERS = (Register.S0, Register.S1)
+"Регистры, в которых размещаются переменные. Инструкции операций языка их не используют"
+
+LOOP_WEIGHT = 8
+"Множитель веса обращения для каждого уровня вложенности циклов"
+
+
+class RegisterAllocator(AstNodeVisitor):
+    """Выбирает переменные, которые на всё время работы программы размещаются в регистрах вместо памяти данных
+
+    Кандидаты -- переменные одинарной точности (`var`), ко всем обращениям к которым применимо чтение и запись
+    без адреса на стеке (``x load`` и ``x <value> store``) и к которым нет обращений из обработчика прерываний.
+    Адрес такой переменной нигде не используется, поэтому её можно не размещать в памяти.
+
+    Из кандидатов выбираются наиболее часто используемые. Частота оценивается статически: каждое обращение
+    учитывается c весом `LOOP_WEIGHT` в степени вложенности циклов
+    """
+
+    variables = None
+    "Объявленные в программе переменные одинарной точности"
+
+    weights = None
+    "Оценка частоты обращений к каждой переменной"
+
+    excluded = None
+    "Переменные, которые нельзя разместить в регистре"
+
+    weight = None
+    "Текущий вес обращения: зависит от вложенности циклов"
+
+    has_counted_loops = None
+    "Есть ли в программе циклы `do ... loop`. Если есть, регистр их счётчика переменным не выделяется"
+
+    def allocate(self, tree: Ast) -> dict[str, Register]:
+        """Возвращает регистры, выделенные переменным"""
+
+        self.variables = set()
+        self.weights = Counter()
+        self.excluded = set()
+        self.weight = 1
+        self.has_counted_loops = False
+        self.visit(tree)
+
+        registers = [r for r in ALLOCATABLE_REGISTERS if not (self.has_counted_loops and r is LOOP_COUNTER_REGISTER)]
+        candidates = [name for name, _ in self.weights.most_common() if name in self.variables - self.excluded]
+        return dict(zip(candidates, registers, strict=False))
+
+    def visit_block(self, node: AstBlock):
+        self.visit_sequence(flatten(node))
+
+    def visit_sequence(self, children: list[Ast]):
+        """Обходит последовательность так же, как генератор кода: значение перед записью -- отдельной подпоследовательностью"""
+
+        i = 0
+        while i < len(children):
+            access = find_direct_access(children, i)
+            if access is None:
+                self.visit(children[i])
+                i += 1
+                continue
+
+            name = children[i].name
+            if children[access].token_type in (TokenType.LOAD, TokenType.STORE):
+                self.weights[name] += self.weight
+            else:
+                self.excluded.add(name)
+            self.visit_sequence(children[i + 1 : access])
+            i = access + 1
+
+    def visit_interrupt(self, node: AstInterrupt):
+        self.excluded |= SymbolReferenceCounter().count(node.block).keys()
+
+    def visit_symbol(self, node: AstSymbol):
+        self.excluded.add(node.name)
+
+    def visit_variable_declaration(self, node: AstVariableDeclaration):
+        self.variables.add(node.name)
+
+    def visit_if_statement(self, node: AstIfStatement):
+        self.visit(node.if_block)
+        if node.else_block is not None:
+            self.visit(node.else_block)
+
+    def visit_while_statement(self, node: AstWhileStatement):
+        self.weight *= LOOP_WEIGHT
+        self.visit(node.while_block)
+        self.weight //= LOOP_WEIGHT
+
+    def visit_counted_loop_statement(self, node: AstCountedLoopStatement):
+        self.has_counted_loops = True
+        self.weight *= LOOP_WEIGHT
+        self.visit(node.loop_block)
+        self.weight //= LOOP_WEIGHT
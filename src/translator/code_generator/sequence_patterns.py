@@ -0,0 +1,94 @@
+"""Поиск шаблонов в плоских последовательностях AST-вершин. Используется генератором кода и распределением регистров"""
+
+from __future__ import annotations
+
+from src.translator.ast_.ast_ import (
+    Ast,
+    AstBlock,
+    AstExtendedNumber,
+    AstNumber,
+    AstOperation,
+    AstSymbol,
+)
+from src.translator.code_generator.instruction_producers import (
+    DIRECT_STORE_SIZES,
+    FUSED_OPERATION_TRANSLATION,
+    OPERATION_STACK_EFFECTS,
+)
+from src.translator.token.token_type import TokenType
+
+
+def flatten(node: AstBlock) -> list[Ast]:
+    """Раскрывает вложенные блоки (в том числе подставленные объявления) в плоскую последовательность вершин
+
+    Исходное дерево не изменяется, так как блоки объявлений могут входить в него несколько раз
+    """
+
+    result = []
+    for child in node.children:
+        if isinstance(child, AstBlock):
+            result += flatten(child)
+        else:
+            result.append(child)
+    return result
+
+
+def is_operation(node: Ast | None, token_types: set[TokenType]) -> bool:
+    return isinstance(node, AstOperation) and node.token_type in token_types
+
+
+def stack_effect(node: Ast) -> tuple[int, int] | None:
+    """Количество снимаемых со стека и кладущихся на стек значений для слова. Для конструкций -- `None`"""
+
+    if isinstance(node, AstNumber | AstSymbol):
+        return 0, 1
+    if isinstance(node, AstExtendedNumber):
+        return 0, 2
+    if isinstance(node, AstOperation):
+        return OPERATION_STACK_EFFECTS[node.token_type]
+    return None
+
+
+def find_direct_store(children: list[Ast], i: int) -> int | None:
+    """Ищет `store`/`2store` по адресу символа `children[i]`: ``<symbol> <value> store``
+
+    Вычисление значения между символом и операцией записи должно состоять только из слов, не затрагивать
+    адрес символа на стеке и оставлять на стеке ровно записываемое значение. Возвращает индекс операции записи
+    """
+
+    depth = 0
+    for j in range(i + 1, len(children)):
+        child = children[j]
+        if is_operation(child, DIRECT_STORE_SIZES.keys()) and depth == DIRECT_STORE_SIZES[child.token_type]:
+            return j
+        effect = stack_effect(child)
+        if effect is None or depth < effect[0]:
+            return None
+        depth += effect[1] - effect[0]
+    return None
+
+
+def find_direct_access(children: list[Ast], i: int) -> int | None:
+    """Ищет обращение по адресу символа `children[i]`, которое можно выполнить без адреса на стеке
+
+    Возвращает индекс операции `load`/`2load`, следующей сразу за символом, или операции записи
+    (см. `find_direct_store`). Если символ используется иначе (например, в адресной арифметике), возвращает `None`
+    """
+
+    if not isinstance(children[i], AstSymbol):
+        return None
+    if i + 1 < len(children) and is_operation(children[i + 1], {TokenType.LOAD, TokenType.D_LOAD}):
+        return i + 1
+    return find_direct_store(children, i)
+
+
+def find_fused_operations(children: list[Ast], i: int) -> tuple[TokenType, ...] | None:
+    """Ищет начинающуюся c `children[i]` последовательность операций из `FUSED_OPERATION_TRANSLATION`"""
+
+    for operations in FUSED_OPERATION_TRANSLATION:
+        candidates = children[i : i + len(operations)]
+        if len(candidates) == len(operations) and all(
+            is_operation(child, {token_type}) for child, token_type in zip(candidates, operations, strict=True)
+        ):
+            return operations
+    return None
@@ -1,12 +1,39 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+
 from src.translator.token.token_ import Token
 from src.translator.token.token_type import TokenType
 
+NOT_SIMPLE_TOKEN_TYPES = {
+    TokenType.NUMBER,
+    TokenType.EXTENDED_NUMBER,
+    TokenType.SYMBOL,
+    TokenType.LITERAL,
+    TokenType.EOF,
+}
+"Типы токенов, которые не определяются по строковому значению слова"
+
+SIMPLE_TOKEN_TYPES = {
+    token_type.value: token_type for token_type in TokenType if token_type not in NOT_SIMPLE_TOKEN_TYPES
+}
+"Словарь для определения типа простых токенов по их строковому значению"
+
+WORD_REGEX = re.compile(r"(?P<comment>\\[^\n]*)|(?P<word>\S+)")
+"""Регулярное выражение для поиска очередного слова или комментария
+
+Пробельные символы пропускаются самим поиском. Комментарий начинается знаком ``\\`` в начале слова
+и идёт до конца строки
+"""
+
 
 class Lexer:
-    """Выполняет преобразование текстового кода в поток токенов"""
+    """Выполняет преобразование текстового кода в поток токенов
 
-    is_literal_mode = None
-    "Флаг режима чтения литерала. Инициализируется значением `False`"
+    Текст не копируется и не собирается посимвольно: слова находятся скомпилированным регулярным выражением,
+    а литералы вырезаются срезами по индексам
+    """
 
     text = None
     "Текстовая программа для обработки"
@@ -14,53 +41,30 @@ class Lexer:
     pos = None
     "Текущая позиция в тексте. Инициализируется значением `0`"
 
-    current_char = None
-    """Символ на который указывает `pos`. Инициализируется вместе c `pos`.
-
-    B случае если строка изначально пуста инициализируется значением `None`
-    """
+    _tokens = None
+    "Генератор токенов, из которого берёт значения `get_next_token`"
 
-    def __init__(self, text):
+    def __init__(self, text: str):
         self.text = text
         self.pos = 0
-        self.current_char = self.text[self.pos] if len(self.text) > 0 else None
-        self.is_literal_mode = False
+        self._tokens = self.tokens()
 
     @staticmethod
     def is_simple_token_type(value: str) -> bool:
-        """Определяет, является ли строковое значение простым токеном
-
-        Для проверки производится попытка создать объект токена по значению
-
-        При этом не простые токены:
+        """Определяет, является ли строковое значение простым токеном"""
 
-        - NUMBER
-
-        - EXTENDED_NUMBER
-
-        - SYMBOL
-
-        - LITERAL
-
-        - EOF
-
-        исключаются из рассмотрения
-        """
-        try:
-            token = TokenType(value)
-        except ValueError:
-            return False
-        else:
-            excluded = {TokenType.NUMBER, TokenType.EXTENDED_NUMBER, TokenType.SYMBOL, TokenType.LITERAL, TokenType.EOF}
-            return token not in excluded
+        return value in SIMPLE_TOKEN_TYPES
 
     @staticmethod
     def is_number(value: str) -> bool:
         """Проверяет, является ли строковое значение целым числом
 
-        Для проверки выполняется попытка конвертации в `int`
+        Для проверки выполняется попытка конвертации в `int`. Слова, которые не могут быть числом
+        (не начинаются c цифры или знака), отбрасываются без неё
         """
 
+        if not value or not (value[0].isdigit() or value[0] in "+-"):
+            return False
         try:
             int(value)
         except ValueError:
@@ -68,102 +72,59 @@ class Lexer:
         else:
             return True
 
-    def shift_pos(self, shift):
-        """Выполняет смещение текущей позиции на `shift`
-
-        Также обновляет `current_char`
-
-        В случае если достигнут конец текста, в `current_char` записывается `None`
-        """
-
-        self.pos += shift
-        if self.pos >= len(self.text):
-            self.current_char = None
-        else:
-            self.current_char = self.text[self.pos]
-
-    def next_char(self):
-        """Выполняет смещение на 1 символ вправо"""
-
-        self.shift_pos(1)
-
-    def skip_whitespace(self):
-        """Выполняет пропуск пробельных символов"""
-
-        while self.current_char is not None and self.current_char.isspace():
-            self.next_char()
-
-    def skip_comment(self):
-        """Выполняет пропуск комментария
-
-        Фактически пропускает всё до первого перевода строки
-        """
-
-        while self.current_char is not None and self.current_char != "\n":
-            self.next_char()
-
-    def parse_word(self):
-        """Парсит отдельное слово
-
-        Разделителем между словами является пробел
-        """
-
-        result = ""
-        while self.current_char is not None and not self.current_char.isspace():
-            result += self.current_char
-            self.next_char()
-        return result
-
-    def parse_literal(self):
+    def parse_literal(self) -> str:
         """Парсит строковый литерал
 
-        Предполагается, что литерал имеет вид ``" <literal>"`` и текущий указатель находится
+        Предполагается, что литерал имеет вид ``" <literal>"`` и текущая позиция находится
         сразу после первого символа ``"``
 
-        В начале происходит пропуск пробельного символа, после чего парится всё до первого символа ``"``
+        В начале происходит пропуск пробельного символа, после чего берётся всё до первого символа ``"``
 
         В конце происходит пропуск символа ``"``
         """
 
-        self.next_char()
-        literal = ""
-        while self.current_char is not None and self.current_char != TokenType.STR_LITERAL_SEP.value:
-            literal += self.current_char
-            self.next_char()
-        self.next_char()
-        return literal
-
-    def get_next_token(self):  # noqa: C901 # На данный момент не проблема4
-        """Возвращает очередной токен"""
-
-        while self.current_char is not None:
-            if self.is_literal_mode:
-                value = self.parse_literal()
-                self.is_literal_mode = False
-                return Token(TokenType.LITERAL, value)
-
-            if self.current_char == TokenType.COMMENT_START.value:
-                self.skip_comment()
-                continue
-
-            if self.current_char.isspace():
-                self.skip_whitespace()
+        start = self.pos + 1
+        end = self.text.find(TokenType.STR_LITERAL_SEP.value, start)
+        if end == -1:
+            end = len(self.text)
+        self.pos = end + 1
+        return self.text[start:end]
+
+    def make_word_token(self, word: str) -> Token:
+        """Определяет тип токена по слову"""
+
+        token_type = SIMPLE_TOKEN_TYPES.get(word)
+        if token_type is not None:
+            return Token(token_type, word)
+        if self.is_number(word):
+            return Token(TokenType.NUMBER, word)
+        if word[-1] == "." and self.is_number(word[:-1]):
+            return Token(TokenType.EXTENDED_NUMBER, word[:-1])
+        return Token(TokenType.SYMBOL, word)
+
+    def tokens(self) -> Iterator[Token]:
+        """Генератор токенов. Последним всегда выдаётся токен `EOF`"""
+
+        text = self.text
+        search = WORD_REGEX.search
+        while True:
+            match = search(text, self.pos)
+            if match is None:
+                break
+            self.pos = match.end()
+            if match.lastgroup == "comment":
                 continue
 
-            word = self.parse_word()
+            token = self.make_word_token(match.group())
+            yield token
 
-            if self.is_simple_token_type(word):
-                token = Token(TokenType(word), word)
-            elif self.is_number(word):
-                token = Token(TokenType.NUMBER, word)
-            elif word[-1] == "." and self.is_number(word[:-1]):
-                token = Token(TokenType.EXTENDED_NUMBER, word[:-1])
-            else:
-                token = Token(TokenType.SYMBOL, word)
+            if token.type is TokenType.STR_LITERAL_SEP and self.pos < len(text):
+                yield Token(TokenType.LITERAL, self.parse_literal())
 
-            if token.type == TokenType.STR_LITERAL_SEP:
-                self.is_literal_mode = True
+        self.pos = len(text)
+        yield Token(TokenType.EOF, "eof")
 
-            return token
+    def get_next_token(self) -> Token:
+        """Возвращает очередной токен. После окончания текста всегда возвращается `EOF`"""
 
-        return Token(TokenType.EOF, "eof")
+        return next(self._tokens, None) or Token(TokenType.EOF, "eof")
@@ -3,6 +3,7 @@ from __future__ import annotations
 from src.constants import MAX_EXTENDED_NUMBER, MAX_NUMBER, MIN_EXTENDED_NUMBER, MIN_NUMBER
 from src.translator.ast_.ast_ import (
     AstBlock,
+    AstCountedLoopStatement,
     AstDVariableDeclaration,
     AstExtendedNumber,
     AstIfStatement,
@@ -81,6 +82,17 @@ class Parser:
         self.definitions: dict[str, AstBlock] = {}
         self.literals: list[str] = []
 
+    def restore_state(self, symbol_table: dict[str, int], definitions: dict[str, AstBlock], literals: list[str]):
+        """Восстанавливает таблицу символов, словарь объявлений и литералы после разбора предыдущей части программы
+
+        Используется для продолжения разбора после заголовка программы, взятого из кэша компиляции.
+        Сохраняются копии, поэтому одно и то же состояние можно переиспользовать для разбора нескольких программ
+        """
+
+        self.symbol_table = dict(symbol_table)
+        self.definitions = dict(definitions)
+        self.literals = list(literals)
+
     def compare_and_next(self, expected_token_type: TokenType):
         """Сравнивает текущий символ с ожидаемым и переходит к следующему при совпадении
 
@@ -223,6 +235,8 @@ class Parser:
                 children.append(self.if_statement())
             if token.type is TokenType.BEGIN:
                 children.append(self.loop_statement())
+            if token.type is TokenType.DO:
+                children.append(self.counted_loop_statement())
         return AstBlock(children)
 
     def variable_declaration(self) -> AstVariableDeclaration:
@@ -301,6 +315,12 @@ class Parser:
         self.compare_and_next(TokenType.UNTIL)
         return AstWhileStatement(while_body)
 
+    def counted_loop_statement(self) -> AstCountedLoopStatement:
+        self.compare_and_next(TokenType.DO)
+        loop_body = self.statement_body()
+        self.compare_and_next(TokenType.LOOP)
+        return AstCountedLoopStatement(loop_body)
+
     def literal(self) -> AstLiteral:
         self.compare_and_next(TokenType.STR_LITERAL_SEP)
         value = self.current_token.value
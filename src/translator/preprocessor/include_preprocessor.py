@@ -5,6 +5,15 @@ import re
 
 from src.translator.exceptions.exceptions import IncludeFileNotFoundError, IncludeFileReadingError
 
+INCLUDE_REGEX = re.compile(r'#include\s*"(.*?)"')
+"Регулярное выражение для поиска директивы `include`"
+
+HEADER_REGEX = re.compile(r'(?:\s*(?:#include\s*"[^"\n]*"|\\[^\n]*))*')
+"""Регулярное выражение для выделения заголовка файла
+
+Заголовок -- это идущие в начале файла директивы `include`, пробельные символы и комментарии
+"""
+
 
 class IncludePreprocessor:
     """Выполняет обработку директив, начинающихся с символа `#`
@@ -12,45 +21,114 @@ class IncludePreprocessor:
     Поддерживаемые директивы:
 
     - ``#include "path-to-file"`` -- выполняется подстановка содержимого файла вместо директивы
+
+    B процессе обработки строится граф подключений: каждый файл читается c диска не более одного раза,
+    a повторное подключение уже раскрытого файла заменяется пустой строкой
     """
 
     src_file_text = None
     "Исходный код"
 
     src_file_name = None
-    "Директория, в которой находится обрабатываемый файл"
+    "Путь к обрабатываемому файлу. Относительно него разрешаются пути в директивах `include`"
 
     include_history: set[str] = None
     "Множество для хранения подключённых файлов. Используется для выявления циклических и повторяющихся зависимостей"
 
-    def __init__(self, text: str, file_name: str):
+    include_graph: dict[str, list[str]] = None
+    """Граф подключений: для каждого файла -- список подключаемых им файлов в порядке появления директив `include`
+
+    Ключи идут в порядке первого подключения, первым идёт обрабатываемый файл. Пути нормализованы
+    """
+
+    sources: dict[str, str] = None
+    """Прочитанные тексты файлов по нормализованному пути
+
+    Может быть общим для нескольких препроцессоров, тогда подключаемые файлы читаются один раз на все программы
+    """
+
+    def __init__(self, text: str, file_name: str, sources: dict[str, str] | None = None):
         self.src_file_text = text
         self.src_file_name = file_name
         self.include_history = set()
+        self.include_graph = {}
+        self.sources = {} if sources is None else sources
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        return os.path.normpath(os.path.abspath(path))
 
-    def preprocess(self):
-        return self.include_preprocessor(self.src_file_text, self.src_file_name)
+    def preprocess(self) -> str:
+        return "".join(self.preprocess_parts())
 
-    def include_preprocessor(self, src_file_text: str, src_file_name: str) -> str:
+    def preprocess_parts(self) -> tuple[str, str]:
+        """Выполняет обработку исходного кода, разделяя результат на заголовок и тело
+
+        Заголовок -- раскрытые директивы `include` из начала файла (как правило, подключение стандартной библиотеки).
+        Конкатенация заголовка и тела совпадает с результатом `preprocess`
+        """
+
+        file_name = self.normalize_path(self.src_file_name)
+        if file_name in self.include_history:
+            return "", ""
+
+        self.include_history.add(file_name)
+        self.include_graph[file_name] = []
+        self.sources[file_name] = self.src_file_text
+
+        split = HEADER_REGEX.match(self.src_file_text).end()
+        header, body = [], []
+        self.expand(self.src_file_text[:split], file_name, header)
+        self.expand(self.src_file_text[split:], file_name, body)
+        return "".join(header), "".join(body)
+
+    def dependencies(self) -> list[str]:
+        """Все файлы, вошедшие в результат обработки: сам обрабатываемый файл и все подключённые им"""
+
+        return list(self.include_graph)
+
+    def expand(self, src_file_text: str, src_file_name: str, parts: list[str]):
+        """Раскрывает директивы `include` в тексте файла, дописывая фрагменты результата в `parts`
+
+        Фрагменты собираются в общий список и склеиваются один раз, поэтому текст вложенных файлов не копируется
+        на каждом уровне вложенности
+        """
+
+        src_file_dir = os.path.dirname(src_file_name)
+        pos = 0
+        for match in INCLUDE_REGEX.finditer(src_file_text):
+            parts.append(src_file_text[pos : match.start()])
+            parts.append("\n")
+            self.include(match.group(1), src_file_dir, src_file_name, parts)
+            parts.append("\n")
+            pos = match.end()
+        parts.append(src_file_text[pos:])
+
+    def include(self, included_file_path: str, src_file_dir: str, src_file_name: str, parts: list[str]):
         """Выполняет обработку директивы `include`"""
 
-        if src_file_name in self.include_history:
-            return ""
+        included_file_full_path = self.normalize_path(os.path.join(src_file_dir, included_file_path))
+        self.include_graph[src_file_name].append(included_file_full_path)
+
+        if included_file_full_path in self.include_history:
+            return
 
-        self.include_history.add(src_file_name)
-        src_file_dir = os.path.dirname(os.path.abspath(src_file_name))
+        included_file_text = self.read_source(included_file_path, included_file_full_path)
+        self.include_history.add(included_file_full_path)
+        self.include_graph[included_file_full_path] = []
+        self.expand(included_file_text, included_file_full_path, parts)
 
-        def replacement_function(match):
-            included_file_path = match.group(1)
-            included_file_full_path = os.path.join(src_file_dir, included_file_path)
+    def read_source(self, included_file_path: str, included_file_full_path: str) -> str:
+        """Чтение подключаемого файла. Уже прочитанные файлы берутся из `sources`"""
 
-            try:
-                with open(included_file_full_path, encoding="utf-8") as file:
-                    included_file_text = file.read()
-                    return f"\n{self.include_preprocessor(included_file_text, included_file_full_path)}\n"
-            except FileNotFoundError as e:
-                raise IncludeFileNotFoundError(included_file_path) from e
-            except Exception as e:
-                raise IncludeFileReadingError(included_file_path) from e
+        if included_file_full_path in self.sources:
+            return self.sources[included_file_full_path]
 
-        return re.sub(r'#include\s*"(.*?)"', replacement_function, src_file_text)
+        try:
+            with open(included_file_full_path, encoding="utf-8") as file:
+                self.sources[included_file_full_path] = file.read()
+                return self.sources[included_file_full_path]
+        except FileNotFoundError as e:
+            raise IncludeFileNotFoundError(included_file_path) from e
+        except Exception as e:
+            raise IncludeFileReadingError(included_file_path) from e
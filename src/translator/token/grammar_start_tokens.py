@@ -31,6 +31,8 @@ logical_operation_start_tokens = [
     TokenType.GREATER_EQUAL,
 ]
 
+extended_logical_operation_start_tokens = [TokenType.D_EQUALS, TokenType.D_LESS, TokenType.D_GREATER]
+
 stack_operation_start_tokens = [TokenType.DUP, TokenType.DROP, TokenType.SWAP, TokenType.OVER]
 
 extended_stack_operation_start_tokens = [TokenType.D_DUP, TokenType.D_DROP, TokenType.D_SWAP, TokenType.D_OVER]
@@ -39,19 +41,30 @@ memory_operation_start_tokens = [TokenType.STORE, TokenType.LOAD]
 
 extended_memory_operation_start_tokens = [TokenType.D_STORE, TokenType.D_LOAD]
 
-io_operation_start_tokens = [TokenType.PRINT, TokenType.READ]
+block_memory_operation_start_tokens = [TokenType.MOVE, TokenType.FILL]
+
+io_operation_start_tokens = [
+    TokenType.PRINT,
+    TokenType.READ,
+    TokenType.INPUT_COUNT,
+    TokenType.TICK_COUNT,
+    TokenType.INSTRUCTION_COUNT,
+    TokenType.INTERRUPT_COUNT,
+]
 
-interrupt_operation_start_token = [TokenType.ENABLE_INT, TokenType.DISABLE_INT]
+interrupt_operation_start_token = [TokenType.ENABLE_INT, TokenType.DISABLE_INT, TokenType.WAIT_INT]
 
 operation_start_tokens = [
     *arithmetic_operation_start_token,
     *extended_arithmetic_operation_start_token,
     *binary_operation_start_tokens,
     *logical_operation_start_tokens,
+    *extended_logical_operation_start_tokens,
     *stack_operation_start_tokens,
     *extended_stack_operation_start_tokens,
     *memory_operation_start_tokens,
     *extended_memory_operation_start_tokens,
+    *block_memory_operation_start_tokens,
     *io_operation_start_tokens,
     *interrupt_operation_start_token,
 ]
@@ -60,7 +73,7 @@ declaration_start_tokens = [TokenType.VAR, TokenType.D_VAR, TokenType.STR, Token
 
 word_start_tokens = [TokenType.SYMBOL, TokenType.NUMBER, TokenType.EXTENDED_NUMBER, *operation_start_tokens]
 
-statement_body_start_tokens = [TokenType.IF, TokenType.BEGIN, *word_start_tokens]
+statement_body_start_tokens = [TokenType.IF, TokenType.BEGIN, TokenType.DO, *word_start_tokens]
 
 statement_start_tokens = [TokenType.COLON, *declaration_start_tokens, TokenType.BEGIN_INT]
 
@@ -38,6 +38,10 @@ class TokenType(str, Enum):
     LESS = "<"
     LESS_EQUAL = "<="
 
+    D_EQUALS = "2="
+    D_GREATER = "2>"
+    D_LESS = "2<"
+
     DUP = "dup"
     DROP = "drop"
     SWAP = "swap"
@@ -54,11 +58,20 @@ class TokenType(str, Enum):
     D_STORE = "2store"
     D_LOAD = "2load"
 
+    MOVE = "move"
+    FILL = "fill"
+
     PRINT = "print"
     READ = "read"
+    INPUT_COUNT = "input_count"
+
+    TICK_COUNT = "tick_count"
+    INSTRUCTION_COUNT = "instruction_count"
+    INTERRUPT_COUNT = "interrupt_count"
 
     ENABLE_INT = "en_int"
     DISABLE_INT = "di_int"
+    WAIT_INT = "wait_int"
 
     STR_LITERAL_SEP = '"'
 
@@ -67,6 +80,8 @@ class TokenType(str, Enum):
     ELSE = "else"
     BEGIN = "begin"
     UNTIL = "until"
+    DO = "do"
+    LOOP = "loop"
 
     COLON = ":"
     SEMICOLON = ";"
@@ -13,36 +13,131 @@ from src.isa.util.data_translators import (
     to_json_data,
     to_json_instructions,
 )
+from src.translator.ast_.ast_ import AstBlock
+from src.translator.cache.compilation_cache import CompilationCache, ParsedHeader
 from src.translator.code_generator.code_generator import CodeGenerator
+from src.translator.exceptions.exceptions import TranslationError
 from src.translator.lexer.lexer import Lexer
 from src.translator.parser.parser import Parser
 from src.translator.preprocessor.include_preprocessor import IncludePreprocessor
 
 
-def translate(text: str, src_file: str) -> (list[Instruction], list[Data]):
+def parse_header(header_text: str) -> ParsedHeader | None:
+    """Разбор заголовка программы (раскрытых директив `include` из начала файла) отдельно от тела
+
+    Если заголовок нельзя разобрать отдельно от тела, возвращается `None`
+    """
+
+    parser = Parser(Lexer(header_text))
+    try:
+        header_tree, _, _ = parser.parse()
+    except TranslationError:
+        return None
+    return ParsedHeader(header_tree.children, parser.symbol_table, parser.definitions, parser.literals)
+
+
+def parse_body(header: ParsedHeader, body_text: str) -> tuple[AstBlock, dict[str, int], list[str]]:
+    """Разбор тела программы c состояния парсера после разобранного заголовка"""
+
+    parser = Parser(Lexer(body_text))
+    parser.restore_state(header.symbol_table, header.definitions, header.literals)
+    body_tree, symbol_table, literals = parser.parse()
+    return AstBlock(header.children + body_tree.children), symbol_table, literals
+
+
+def parse_with_header_cache(
+    header_text: str, body_text: str, cache: CompilationCache
+) -> tuple[AstBlock, dict[str, int], list[str]]:
+    """Разбор программы c использованием кэша разобранного заголовка
+
+    Заголовок (раскрытые директивы `include` из начала файла) разбирается отдельно и сохраняется в кэш,
+    после чего разбор тела продолжается c состояния парсера после заголовка
+
+    Если заголовок нельзя разобрать отдельно от тела, программа разбирается целиком
+    """
+
+    header = cache.load_header(header_text)
+    if header is None:
+        header = parse_header(header_text)
+        if header is None:
+            return Parser(Lexer(header_text + body_text)).parse()
+        cache.store_header(header_text, header)
+
+    return parse_body(header, body_text)
+
+
+def translate_preprocessed(
+    header_text: str, body_text: str, cache: CompilationCache | None = None
+) -> tuple[list[Instruction], list[Data]]:
+    """Трансляция текста программы после препроцессинга, разделённого на заголовок и тело
+
+    Если передан кэш компиляции, то для неизменившейся программы результат берётся из него,
+    а разбор заголовка программы (как правило, подключение стандартной библиотеки) переиспользуется
+    """
+
+    text = header_text + body_text
+
+    if cache is None:
+        tree, symbol_table, literals = Parser(Lexer(text)).parse()
+        return CodeGenerator(tree, symbol_table, literals).translate()
+
+    cached = cache.load_binary(text)
+    if cached is not None:
+        return cached
+
+    tree, symbol_table, literals = parse_with_header_cache(header_text, body_text, cache)
+    program, data = CodeGenerator(tree, symbol_table, literals).translate()
+    cache.store_binary(text, program, data)
+
+    return program, data
+
+
+def translate(text: str, src_file: str, cache: CompilationCache | None = None) -> tuple[list[Instruction], list[Data]]:
     """Основная функция трансляции
 
     Выполняет инициализацию препроцессора, лексера, парсера и генератора машинного кода, и их использование
 
     На выходе даёт массив инструкций, блок данных и информацию о прерываниях
     """
-    text = IncludePreprocessor(text, src_file).preprocess()
-    lexer = Lexer(text)
-    parser = Parser(lexer)
-    tree, symbol_table, literals = parser.parse()
-    code_generator = CodeGenerator(tree, symbol_table, literals)
-    program, data = code_generator.translate()
 
-    return program, data
+    header_text, body_text = IncludePreprocessor(text, src_file).preprocess_parts()
+    return translate_preprocessed(header_text, body_text, cache)
 
 
-def main(src_file: str, instructions_file: str, data_file: str):
-    """Функция запуска транслятора. Параметры -- исходный и целевой файлы."""
+def escape_make_path(path: str) -> str:
+    """Экранирование пути для использования в правиле `make`"""
+
+    return path.replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
 
-    with open(src_file, encoding="utf-8") as f:
-        src = f.read()
 
-    instructions, data = translate(src, src_file)
+def to_dependency_rule(targets: list[str], dependencies: list[str]) -> str:
+    """Формирует правила зависимостей в формате `make` (как `gcc -MD -MP`)
+
+    Первое правило связывает все целевые файлы c исходными файлами, вошедшими в программу. Для каждого подключаемого
+    файла дополнительно добавляется пустое правило, чтобы удаление файла не ломало сборку
+    """
+
+    rule = " ".join(map(escape_make_path, targets)) + ":"
+    for dependency in dependencies:
+        rule += " \\\n  " + escape_make_path(dependency)
+    rule += "\n"
+    for dependency in dependencies[1:]:
+        rule += "\n" + escape_make_path(dependency) + ":\n"
+    return rule
+
+
+def write_outputs(
+    instructions: list[Instruction],
+    data: list[Data],
+    instructions_file: str,
+    data_file: str,
+    dependencies: list[str],
+):
+    """Запись результатов трансляции: инструкций, данных и файла зависимостей `<instructions_file>.d`
+
+    Для файлов c расширением `.bin` записывается бинарное представление и рядом c ним шестнадцатеричное,
+    иначе -- представление в формате JSON
+    """
 
     binary_instructions = to_bytes_instructions(instructions)
     binary_data = to_bytes_data(data)
@@ -53,7 +148,10 @@ def main(src_file: str, instructions_file: str, data_file: str):
     os.makedirs(os.path.dirname(os.path.abspath(instructions_file)) or ".", exist_ok=True)
     os.makedirs(os.path.dirname(os.path.abspath(data_file)) or ".", exist_ok=True)
 
+    targets = [instructions_file, data_file]
     if instructions_file.endswith(".bin"):
+        targets += [instructions_file + ".hex", data_file + ".hex"]
+
         with open(instructions_file, "wb") as f:
             f.write(binary_instructions)
 
@@ -75,12 +173,29 @@ def main(src_file: str, instructions_file: str, data_file: str):
         with open(data_file, "w") as f:
             f.write(json_data)
 
+    with open(instructions_file + ".d", "w") as f:
+        f.write(to_dependency_rule(targets, dependencies))
+
+
+def main(src_file: str, instructions_file: str, data_file: str, cache_dir: str | None = None):
+    """Функция запуска транслятора. Параметры -- исходный и целевой файлы, а также необязательный каталог кэша."""
+
+    with open(src_file, encoding="utf-8") as f:
+        src = f.read()
+
+    cache = None if cache_dir is None else CompilationCache(cache_dir)
+    preprocessor = IncludePreprocessor(src, src_file)
+    header_text, body_text = preprocessor.preprocess_parts()
+    instructions, data = translate_preprocessed(header_text, body_text, cache)
+
+    write_outputs(instructions, data, instructions_file, data_file, preprocessor.dependencies())
+
     print("source LoC:", len(src.split("\n")), "code instr:", len(instructions))
 
 
 if __name__ == "__main__":
     assert (
-        len(sys.argv) == 4
-    ), "Wrong arguments: translator.py <input_file> <target_instructions_file> <target_data_file>"
-    _, source, target_instructions_file, target_data_file = sys.argv
-    main(source, target_instructions_file, target_data_file)
+        4 <= len(sys.argv) <= 5
+    ), "Wrong arguments: translator.py <input_file> <target_instructions_file> <target_data_file> [<cache_dir>]"
+    _, source, target_instructions_file, target_data_file, *cache_directory = sys.argv
+    main(source, target_instructions_file, target_data_file, *cache_directory)
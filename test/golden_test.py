@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import contextlib
 import io
 import logging
@@ -8,16 +10,21 @@ import tempfile
 import pytest
 import src.machine.machine as machine
 import src.translator.translator as translator
+from src.isa.util.data_translators import from_bytes_data, from_bytes_instructions
+from src.machine.simulation_result import SimulationResult, StopReason
 
 MAX_LOG = 10000
 
+SEPARATOR = "============================================================\n"
+
 
 @pytest.mark.golden_test("golden/*.yaml")
 def test_translator_and_machine(golden, caplog):
     caplog.set_level(logging.DEBUG)
 
     with tempfile.TemporaryDirectory() as tmpdirname:
-        source = os.path.join(tmpdirname, "source.fs")
+        sources_dir = os.path.join(tmpdirname, "golden sources")
+        source = os.path.join(sources_dir, "source.fs")
         input_timetable = os.path.join(tmpdirname, "input_timetable.txt")
         target_instructions = os.path.join(tmpdirname, "target_instructions.bin")
         target_instructions_hex = os.path.join(tmpdirname, "target_instructions.bin.hex")
@@ -25,7 +32,7 @@ def test_translator_and_machine(golden, caplog):
         target_data_hex = os.path.join(tmpdirname, "target_data.bin.hex")
 
         stdlib_dir = "examples/stdlib"
-        shutil.copytree(stdlib_dir, os.path.join(tmpdirname, "stdlib"))
+        shutil.copytree(stdlib_dir, os.path.join(sources_dir, "stdlib"))
 
         with open(source, "w", encoding="utf-8") as file:
             file.write(golden["in_source"])
@@ -34,7 +41,7 @@ def test_translator_and_machine(golden, caplog):
 
         with contextlib.redirect_stdout(io.StringIO()) as stdout:
             translator.main(source, target_instructions, target_data)
-            print("============================================================")
+            print(SEPARATOR, end="")
             machine.main(target_instructions, target_data, input_timetable)
 
         with open(target_instructions, "rb") as file:
@@ -45,10 +52,69 @@ def test_translator_and_machine(golden, caplog):
             data = file.read()
         with open(target_data_hex, encoding="utf-8") as file:
             data_hex = file.read()
+        with open(target_instructions + ".d", encoding="utf-8") as file:
+            dependencies = file.read().replace(tmpdirname, "<tmp>")
 
         assert instructions == golden.out["out_instructions"]
         assert instructions_hex == golden.out["out_instructions_hex"]
         assert data == golden.out["out_data"]
         assert data_hex == golden.out["out_data_hex"]
+        assert dependencies == golden.out["out_dependencies"]
         assert stdout.getvalue() == golden.out["out_stdout"]
         assert caplog.text[0:MAX_LOG] + "EOF" == golden.out["out_log"]
+
+        timetable = machine.read_input_timetable(input_timetable)
+        timetables = {False: (timetable, None), True: ({}, machine.to_input_stream(timetable))}
+        reference_results = {
+            is_backpressure: simulate(instructions, data, *timetables[is_backpressure])
+            for is_backpressure in (False, True)
+        }
+        assert reference_results[False].statistics is None
+        statistics = [
+            simulate(
+                instructions, data, timetable, None, is_fast_mode=is_fast_mode, is_collecting_statistics=True
+            ).statistics.to_dict()
+            for is_fast_mode in (False, True)
+        ]
+        assert statistics[0] == statistics[1]
+
+        for options in (
+            {"is_fast_mode": True},
+            {"is_spin_wait_skipping": True},
+            {"is_loop_detecting": True},
+            {"is_backpressure": True},
+            {"is_backpressure": True, "is_loop_detecting": True},
+        ):
+            with contextlib.redirect_stdout(io.StringIO()) as accelerated_stdout:
+                machine.main(target_instructions, target_data, input_timetable, **options)
+
+            assert accelerated_stdout.getvalue() == stdout.getvalue().split(SEPARATOR)[1]
+
+            simulation_options = {name: value for name, value in options.items() if name != "is_backpressure"}
+            is_backpressure = options.get("is_backpressure", False)
+            result = simulate(instructions, data, *timetables[is_backpressure], **simulation_options)
+            reference_result = reference_results[is_backpressure]
+
+            assert result.output_buffer == reference_result.output_buffer
+            if options.get("is_loop_detecting") and reference_result.stop_reason is StopReason.LIMIT:
+                assert result.stop_reason is StopReason.NON_TERMINATING
+                assert result.ticks <= reference_result.ticks
+            else:
+                assert result.ticks == reference_result.ticks
+                assert result.stop_reason is reference_result.stop_reason
+
+
+def simulate(
+    instructions: bytes, data: bytes, timetable: dict[int, int], input_stream: list[int] | None, **options
+) -> SimulationResult:
+    """Запуск модели на машинном коде из бинарных файлов c параметрами, как при запуске через `machine.main`"""
+
+    return machine.simulation(
+        from_bytes_instructions(instructions),
+        from_bytes_data(data),
+        timetable,
+        data_memory_size=machine.DATA_MEMORY_SIZE,
+        limit=machine.TICK_LIMIT,
+        input_stream=input_stream,
+        **options,
+    )
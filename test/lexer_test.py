@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import pytest
+from src.translator.lexer.lexer import Lexer
+from src.translator.token.token_type import TokenType
+
+
+def token_stream(text: str) -> list[tuple[TokenType, str]]:
+    """Все токены текста `text` до `EOF` включительно в виде пар (тип, значение)"""
+
+    lexer = Lexer(text)
+    tokens = []
+    while True:
+        token = lexer.get_next_token()
+        tokens.append((token.type, token.value))
+        if token.type is TokenType.EOF:
+            return tokens
+
+
+EOF = (TokenType.EOF, "eof")
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", [EOF]),
+        (" \n\t ", [EOF]),
+        (
+            ": w\t1\n\n 2 ;",
+            [
+                (TokenType.COLON, ":"),
+                (TokenType.SYMBOL, "w"),
+                (TokenType.NUMBER, "1"),
+                (TokenType.NUMBER, "2"),
+                (TokenType.SEMICOLON, ";"),
+                EOF,
+            ],
+        ),
+        # Комментарии
+        (
+            "1 2 + \\ comment\n3",
+            [(TokenType.NUMBER, "1"), (TokenType.NUMBER, "2"), (TokenType.PLUS, "+"), (TokenType.NUMBER, "3"), EOF],
+        ),
+        ("\\ only comment", [EOF]),
+        ("1 \\ comment at eof", [(TokenType.NUMBER, "1"), EOF]),
+        ("\\\n1", [(TokenType.NUMBER, "1"), EOF]),
+        ("a\\b c", [(TokenType.SYMBOL, "a\\b"), (TokenType.SYMBOL, "c"), EOF]),
+        # Строковые литералы
+        (
+            'str s " hello world" \\ comment',
+            [
+                (TokenType.STR, "str"),
+                (TokenType.SYMBOL, "s"),
+                (TokenType.STR_LITERAL_SEP, '"'),
+                (TokenType.LITERAL, "hello world"),
+                EOF,
+            ],
+        ),
+        (
+            'str s "  two  spaces " 1',
+            [
+                (TokenType.STR, "str"),
+                (TokenType.SYMBOL, "s"),
+                (TokenType.STR_LITERAL_SEP, '"'),
+                (TokenType.LITERAL, " two  spaces "),
+                (TokenType.NUMBER, "1"),
+                EOF,
+            ],
+        ),
+        (
+            'str s " "',
+            [
+                (TokenType.STR, "str"),
+                (TokenType.SYMBOL, "s"),
+                (TokenType.STR_LITERAL_SEP, '"'),
+                (TokenType.LITERAL, ""),
+                EOF,
+            ],
+        ),
+        (
+            'str s " unterminated',
+            [
+                (TokenType.STR, "str"),
+                (TokenType.SYMBOL, "s"),
+                (TokenType.STR_LITERAL_SEP, '"'),
+                (TokenType.LITERAL, "unterminated"),
+                EOF,
+            ],
+        ),
+        ('str s "', [(TokenType.STR, "str"), (TokenType.SYMBOL, "s"), (TokenType.STR_LITERAL_SEP, '"'), EOF]),
+        ('"', [(TokenType.STR_LITERAL_SEP, '"'), EOF]),
+        # Числа
+        (
+            "-5 +7 -0 12. -3. 1.5",
+            [
+                (TokenType.NUMBER, "-5"),
+                (TokenType.NUMBER, "+7"),
+                (TokenType.NUMBER, "-0"),
+                (TokenType.EXTENDED_NUMBER, "12"),
+                (TokenType.EXTENDED_NUMBER, "-3"),
+                (TokenType.SYMBOL, "1.5"),
+                EOF,
+            ],
+        ),
+        ("- + .", [(TokenType.MINUS, "-"), (TokenType.PLUS, "+"), (TokenType.SYMBOL, "."), EOF]),
+        # Знаки препинания без пробелов -- части одного слова
+        (
+            "begin 1 until;",
+            [(TokenType.BEGIN, "begin"), (TokenType.NUMBER, "1"), (TokenType.SYMBOL, "until;"), EOF],
+        ),
+        (
+            ";: : x ;",
+            [
+                (TokenType.SYMBOL, ";:"),
+                (TokenType.COLON, ":"),
+                (TokenType.SYMBOL, "x"),
+                (TokenType.SEMICOLON, ";"),
+                EOF,
+            ],
+        ),
+        ('x" y', [(TokenType.SYMBOL, 'x"'), (TokenType.SYMBOL, "y"), EOF]),
+        ("dup2 2dup", [(TokenType.SYMBOL, "dup2"), (TokenType.D_DUP, "2dup"), EOF]),
+    ],
+)
+def test_lexer_token_stream(text, expected):
+    assert token_stream(text) == expected
+
+
+def test_lexer_returns_eof_after_end():
+    lexer = Lexer("1")
+    assert [lexer.get_next_token().type for _ in range(4)] == [TokenType.NUMBER] + [TokenType.EOF] * 3
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import logging
+
+import pytest
+import src.machine.machine as machine
+import src.translator.translator as translator
+from src.isa.util.data_translators import from_bytes_data, from_bytes_instructions
+from src.machine.simulation_result import SimulationResult, StopReason
+
+INFINITE_LOOP = ": main begin 1 until ; main\n"
+"Программа, которая не завершается и не зависит от ввода"
+
+WAIT_FOR_INTERRUPT = "en_int wait_int\n"
+"Программа, которая ожидает прерывания"
+
+POLLING_READ = ": main begin input_count if 0 else 1 then until read print ; main\n"
+"Программа, которая опрашивает буфер ввода в цикле ожидания, a затем выводит прочитанное значение"
+
+
+def simulate(tmp_path, source_text: str, timetable: dict[int, int], **options) -> SimulationResult:
+    """Трансляция программы `source_text` и запуск модели c параметрами, как при запуске через `machine.main`"""
+
+    source = tmp_path / "source.fs"
+    source.write_text(source_text, encoding="utf-8")
+    target_instructions = tmp_path / "target_instructions.bin"
+    target_data = tmp_path / "target_data.bin"
+    with contextlib.redirect_stdout(io.StringIO()):
+        translator.main(str(source), str(target_instructions), str(target_data))
+
+    return machine.simulation(
+        from_bytes_instructions(target_instructions.read_bytes()),
+        from_bytes_data(target_data.read_bytes()),
+        timetable,
+        data_memory_size=machine.DATA_MEMORY_SIZE,
+        limit=machine.TICK_LIMIT,
+        **options,
+    )
+
+
+@pytest.mark.parametrize("timetable", [{}, {100: 65}])
+@pytest.mark.parametrize("is_fast_mode", [False, True])
+def test_loop_detector_stops_infinite_loop(timetable, is_fast_mode, tmp_path, caplog):
+    result = simulate(tmp_path, INFINITE_LOOP, dict(timetable), is_fast_mode=is_fast_mode)
+    assert result.stop_reason is StopReason.LIMIT
+    assert result.ticks == machine.TICK_LIMIT
+
+    caplog.set_level(logging.WARNING)
+    result = simulate(tmp_path, INFINITE_LOOP, dict(timetable), is_fast_mode=is_fast_mode, is_loop_detecting=True)
+    assert result.stop_reason is StopReason.NON_TERMINATING
+    assert max(timetable, default=0) < result.ticks < machine.TICK_LIMIT
+    assert "Non-terminating program" in caplog.text
+
+
+def test_loop_detector_stops_waiting_without_input(tmp_path, caplog):
+    result = simulate(tmp_path, WAIT_FOR_INTERRUPT, {})
+    assert result.stop_reason is StopReason.LIMIT
+    assert result.idle_ticks > 0
+
+    caplog.set_level(logging.WARNING)
+    result = simulate(tmp_path, WAIT_FOR_INTERRUPT, {}, is_loop_detecting=True)
+    assert result.stop_reason is StopReason.NON_TERMINATING
+    assert result.idle_ticks == 0
+    assert "there are no more input events" in caplog.text
+
+
+@pytest.mark.parametrize("is_fast_mode", [False, True])
+def test_spin_wait_detector_skips_polling_loop(is_fast_mode, tmp_path):
+    reference = simulate(tmp_path, POLLING_READ, {5000: 65}, is_fast_mode=is_fast_mode)
+    result = simulate(tmp_path, POLLING_READ, {5000: 65}, is_fast_mode=is_fast_mode, is_spin_wait_skipping=True)
+
+    assert reference.stop_reason is result.stop_reason is StopReason.HALT
+    assert reference.output_buffer == result.output_buffer == [65]
+    assert reference.ticks == result.ticks
+    assert reference.skipped_ticks == 0
+    assert result.skipped_ticks > 0
+
+
+def test_spin_wait_detector_skips_to_tick_limit(tmp_path):
+    result = simulate(tmp_path, INFINITE_LOOP, {}, is_spin_wait_skipping=True)
+
+    assert result.stop_reason is StopReason.LIMIT
+    assert result.ticks == machine.TICK_LIMIT
+    assert result.skipped_ticks > machine.TICK_LIMIT - 100
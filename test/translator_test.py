@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+import src.translator.batch_translator as batch_translator
+import src.translator.cache.compilation_cache as compilation_cache
+import src.translator.translator as translator
+from src.translator.code_generator.instruction_producers import operation_instructions_producer
+from src.translator.token.token_type import TokenType
+
+EXAMPLES = sorted(str(path) for path in Path("examples").glob("*.fs"))
+"Программы, на которых проверяется транслятор"
+
+
+def translate_to(directory: str, source: str, cache_dir: str | None = None) -> tuple[bytes, bytes]:
+    """Трансляция `source` в каталог `directory`. Возвращает содержимое файлов инструкций и данных"""
+
+    target_instructions = os.path.join(directory, "target_instructions.bin")
+    target_data = os.path.join(directory, "target_data.bin")
+    with contextlib.redirect_stdout(io.StringIO()):
+        translator.main(source, target_instructions, target_data, cache_dir)
+
+    with open(target_instructions, "rb") as file:
+        instructions = file.read()
+    with open(target_data, "rb") as file:
+        data = file.read()
+    return instructions, data
+
+
+def cache_entries(cache_dir: str, kind: str) -> list[Path]:
+    return sorted(Path(cache_dir, kind).glob("*.pickle"))
+
+
+@pytest.mark.parametrize("source", EXAMPLES)
+def test_compilation_cache(source, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    expected = translate_to(str(tmp_path), source)
+
+    assert translate_to(str(tmp_path), source, cache_dir) == expected
+    binaries = cache_entries(cache_dir, "binary")
+    assert len(binaries) == 1
+
+    assert translate_to(str(tmp_path), source, cache_dir) == expected
+    assert cache_entries(cache_dir, "binary") == binaries
+
+    for entry in cache_entries(cache_dir, "header") + binaries:
+        with open(entry, "wb") as file:
+            file.write(b"corrupted")
+    assert translate_to(str(tmp_path), source, cache_dir) == expected
+
+
+@pytest.mark.parametrize(
+    "entry_content",
+    [
+        b"csrc.translator.removed_module\nParsedHeader\n)\x81.",
+        b"csrc.translator.cache.compilation_cache\nRemovedClass\n)\x81.",
+    ],
+)
+def test_compilation_cache_drops_incompatible_entries(entry_content, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    source = "examples/hello.fs"
+    expected = translate_to(str(tmp_path), source, cache_dir)
+
+    entries = cache_entries(cache_dir, "header") + cache_entries(cache_dir, "binary")
+    for entry in entries:
+        entry.write_bytes(entry_content)
+
+    assert translate_to(str(tmp_path), source, cache_dir) == expected
+    assert all(entry.read_bytes() != entry_content for entry in entries)
+
+
+def test_compilation_cache_reuses_parsed_header(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    source = str(tmp_path / "source.fs")
+    shutil.copytree("examples/stdlib", tmp_path / "stdlib")
+
+    for body in ('str s " Hello"\ns print_buffer\n', 'str s " Bye"\ns print_buffer\n'):
+        with open(source, "w", encoding="utf-8") as file:
+            file.write('#include "stdlib/io.fs"\n' + body)
+
+        expected = translate_to(str(tmp_path), source)
+        assert translate_to(str(tmp_path), source, cache_dir) == expected
+        monkeypatch.setattr(translator, "parse_header", lambda _: pytest.fail("header is parsed again"))
+
+    assert len(cache_entries(cache_dir, "header")) == 1
+    assert len(cache_entries(cache_dir, "binary")) == 2
+
+
+def test_compilation_cache_invalidated_by_translator_change(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    source = "examples/hello.fs"
+    expected = translate_to(str(tmp_path), source)
+
+    monkeypatch.setattr(compilation_cache, "translator_fingerprint", lambda: "old translator")
+    with open(source, encoding="utf-8") as file:
+        header_text, body_text = translator.IncludePreprocessor(file.read(), source).preprocess_parts()
+    compilation_cache.CompilationCache(cache_dir).store_binary(header_text + body_text, [], [])
+    assert translate_to(str(tmp_path), source, cache_dir) == (b"", b"")
+
+    monkeypatch.setattr(compilation_cache, "translator_fingerprint", lambda: "new translator")
+    assert translate_to(str(tmp_path), source, cache_dir) == expected
+
+
+def test_batch_translator(tmp_path):
+    output_dir = tmp_path / "batch"
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = batch_translator.main(str(output_dir), ["examples/*.fs"], workers=2)
+
+    assert [program["source"] for program in summary["programs"]] == EXAMPLES
+    assert (output_dir / batch_translator.SUMMARY_FILE_NAME).exists()
+    for source in EXAMPLES:
+        name = Path(source).stem
+        instructions = (output_dir / (name + "_instructions.bin")).read_bytes()
+        data = (output_dir / (name + "_data.bin")).read_bytes()
+        assert (instructions, data) == translate_to(str(tmp_path), source)
+
+
+def test_batch_translator_with_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    binaries = None
+    for run in ("cold", "warm"):
+        output_dir = tmp_path / run
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch_translator.main(str(output_dir), ["examples/*.fs"], workers=2, cache_dir=cache_dir)
+
+        for source in EXAMPLES:
+            name = Path(source).stem
+            instructions = (output_dir / (name + "_instructions.bin")).read_bytes()
+            data = (output_dir / (name + "_data.bin")).read_bytes()
+            assert (instructions, data) == translate_to(str(tmp_path), source)
+
+        assert cache_entries(cache_dir, "header")
+        assert binaries in (None, cache_entries(cache_dir, "binary"))
+        binaries = cache_entries(cache_dir, "binary")
+
+
+@pytest.mark.parametrize(("read_input", "shared"), [("", True), ("first read_string\n", False)])
+def test_literal_sharing_with_io(read_input, shared, tmp_path):
+    shutil.copytree("examples/stdlib", tmp_path / "stdlib")
+    data_sizes = []
+    for literal in (" hello", " world"):
+        source = tmp_path / "source.fs"
+        source.write_text(
+            '#include "stdlib/io.fs"\n'
+            'str first " hello"\n'
+            f'str second "{literal}"\n' + read_input + "first print_buffer second print_buffer\n",
+            encoding="utf-8",
+        )
+        data_sizes.append(len(translate_to(str(tmp_path), str(source))[1]))
+
+    identical, distinct = data_sizes
+    assert (identical < distinct) == shared
+
+
+def test_operation_instructions_are_not_shared():
+    first = operation_instructions_producer(TokenType.PLUS)
+    for address, instr in enumerate(first, 100):
+        instr.address = address
+
+    second = operation_instructions_producer(TokenType.PLUS)
+    assert all(a is not b for a, b in zip(first, second, strict=True))
+    assert [instr.address for instr in second] == [0] * len(second)
+    assert [str(instr) for instr in second] == [str(instr) for instr in first]